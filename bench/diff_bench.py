@@ -0,0 +1,124 @@
+"""Compare difflib and the patience/Myers diff on large generated prompt files.
+
+python bench/diff_bench.py --lines 10000 --edits 1 10 100
+
+The last row diffs two unrelated files drawn from a four-line alphabet, which has no
+unique anchor lines and is the worst case for the Myers fallback.
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import random
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.core.diff_utils import apply_patch, unified_diff  # noqa: E402
+
+_WORDS = ("flight", "booking", "date", "source", "cite", "refuse", "summary", "tool", "NYC")
+
+
+def _prompt_file(lines: int, rng: random.Random) -> list[str]:
+    # Generated prompts repeat a handful of boilerplate lines between unique ones.
+    boilerplate = ["", "    ---", '    "role": "system",', "    Follow the rules above."]
+    content: list[str] = []
+    for index in range(lines):
+        if rng.random() < 0.3:
+            content.append(rng.choice(boilerplate))
+        else:
+            words = " ".join(rng.choice(_WORDS) for _ in range(8))
+            content.append(f'    "rule_{index}": "{words}",')
+    return content
+
+
+def _duplicate_heavy_file(lines: int, rng: random.Random) -> list[str]:
+    alphabet = ["", "    ---", "    Follow the rules above.", "    }"]
+    return [rng.choice(alphabet) for _ in range(lines)]
+
+
+def _edited(lines: list[str], edits: int, rng: random.Random) -> list[str]:
+    edited = list(lines)
+    for _ in range(edits):
+        position = rng.randrange(len(edited))
+        choice = rng.random()
+        if choice < 0.4:
+            edited[position] = edited[position].replace('",', ' (revised)",')
+        elif choice < 0.7:
+            edited.insert(position, f'    "added_{position}": "new constraint",')
+        else:
+            del edited[position]
+    return edited
+
+
+def _difflib_diff(before: str, after: str) -> str:
+    return "\n".join(
+        difflib.unified_diff(
+            before.splitlines(),
+            after.splitlines(),
+            fromfile="a/prompt.txt",
+            tofile="b/prompt.txt",
+            lineterm="",
+        )
+    )
+
+
+def _best_ms(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000.0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=10_000)
+    parser.add_argument("--edits", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    original = _prompt_file(args.lines, rng)
+    before = "\n".join(original) + "\n"
+
+    print(f"{'edits':>10}{'difflib ms':>12}{'patience ms':>13}{'apply ms':>10}{'speedup':>9}")
+    cases = [
+        (str(edits), before, "\n".join(_edited(original, edits, rng)) + "\n")
+        for edits in args.edits
+    ]
+    cases.append(
+        (
+            "unrelated",
+            "\n".join(_duplicate_heavy_file(args.lines, rng)) + "\n",
+            "\n".join(_duplicate_heavy_file(args.lines, rng)) + "\n",
+        )
+    )
+    for label, left, right in cases:
+        diff = unified_diff(left, right, file_path="prompt.txt")
+        if apply_patch(left, diff) != right:
+            raise SystemExit(f"apply_patch round trip failed for {label} edits")
+
+        reference_ms = _best_ms(lambda: _difflib_diff(left, right), args.repeat)
+        patience_ms = _best_ms(
+            lambda: unified_diff(left, right, file_path="prompt.txt"), args.repeat
+        )
+        apply_ms = _best_ms(lambda: apply_patch(left, diff), args.repeat)
+        print(
+            f"{label:>10}{reference_ms:>12.1f}{patience_ms:>13.1f}{apply_ms:>10.1f}"
+            f"{reference_ms / patience_ms:>8.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,281 @@
+"""Benchmark the capture -> store -> analyze -> diagnose -> fix path on synthetic data.
+
+    python bench/pipeline_bench.py --output bench/results/$(git rev-parse --short HEAD).json
+    python bench/pipeline_bench.py --quick --compare bench/results/<baseline>.json
+
+Each case is timed for at least ``--min-time-s`` seconds after a short warm-up.
+Results are written as JSON so two commits can be compared with ``--compare``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Callable, Iterator
+from datetime import datetime, timezone
+from itertools import product
+from pathlib import Path
+from typing import Any
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from bench.synthetic import (  # noqa: E402
+    populate_fix_history,
+    synthetic_failure_event,
+    synthetic_findings,
+    synthetic_scenario,
+    synthetic_trace_record,
+)
+
+Case = tuple[str, dict[str, Any], Callable[[], object]]
+
+FULL_AXES: dict[str, tuple[int, ...]] = {
+    "steps": (1, 10, 100),
+    "tool_calls": (1, 10),
+    "payload_bytes": (256, 16_384),
+    "history_size": (0, 1_000, 10_000),
+    "finding_tool_calls": (100, 1_000, 5_000),
+}
+QUICK_AXES: dict[str, tuple[int, ...]] = {
+    "steps": (1, 10),
+    "tool_calls": (1,),
+    "payload_bytes": (256,),
+    "history_size": (0, 1_000),
+    "finding_tool_calls": (1_000,),
+}
+
+
+def _measure(fn: Callable[[], object], *, min_time_s: float, max_iterations: int) -> dict[str, Any]:
+    for _ in range(3):
+        fn()
+
+    samples_us: list[float] = []
+    deadline = time.perf_counter() + min_time_s
+    while len(samples_us) < max_iterations and (
+        len(samples_us) < 5 or time.perf_counter() < deadline
+    ):
+        started = time.perf_counter()
+        fn()
+        samples_us.append((time.perf_counter() - started) * 1_000_000)
+
+    samples_us.sort()
+    return {
+        "iterations": len(samples_us),
+        "mean_us": round(statistics.fmean(samples_us), 2),
+        "p50_us": round(samples_us[len(samples_us) // 2], 2),
+        "p99_us": round(samples_us[max(0, int(len(samples_us) * 0.99) - 1)], 2),
+    }
+
+
+def _capture_cases(axes: dict[str, tuple[int, ...]]) -> Iterator[Case]:
+    from src.core.failure_detector import run_with_failure_detection
+
+    for payload_bytes in axes["payload_bytes"]:
+        yield (
+            "run_with_failure_detection",
+            {"payload_bytes": payload_bytes},
+            lambda payload_bytes=payload_bytes: run_with_failure_detection(
+                "bench", lambda: synthetic_scenario(payload_bytes), timeout_s=5.0
+            ),
+        )
+
+
+def _store_cases(axes: dict[str, tuple[int, ...]]) -> Iterator[Case]:
+    from src.storage.trace_store import TraceStore
+
+    for steps, payload_bytes in product(axes["steps"], axes["payload_bytes"]):
+        params = {"steps": steps, "payload_bytes": payload_bytes}
+        trace_store = TraceStore(backend="memory")
+        records = [
+            synthetic_trace_record(index, steps=steps, payload_bytes=payload_bytes)
+            for index in range(25)
+        ]
+        events = [synthetic_failure_event(record) for record in records]
+        for event, record in zip(events, records):
+            trace_store.store_trace(event, record)
+        failure_ids = [record["failure_id"] for record in records]
+
+        yield (
+            "trace_store.store_trace",
+            params,
+            lambda store=trace_store, event=events[0], record=records[0]: store.store_trace(
+                event, record
+            ),
+        )
+        yield (
+            "trace_store.get_trace",
+            params,
+            lambda store=trace_store, failure_id=failure_ids[0]: store.get_trace(failure_id),
+        )
+        yield (
+            "trace_store.get_traces[25]",
+            params,
+            lambda store=trace_store, ids=failure_ids: store.get_traces(ids),
+        )
+
+
+def _controller_cases(axes: dict[str, tuple[int, ...]]) -> Iterator[Case]:
+    from src.core.indagine_controller import IndagineController
+
+    controllers = {
+        mode: IndagineController(execution_mode=mode) for mode in ("sequential", "parallel")
+    }
+    for mode, steps, tool_calls, payload_bytes in product(
+        controllers, axes["steps"], axes["tool_calls"], axes["payload_bytes"]
+    ):
+        record = synthetic_trace_record(
+            0, steps=steps, tool_calls=tool_calls, payload_bytes=payload_bytes
+        )
+        yield (
+            "indagine_controller.run_indagine",
+            {
+                "mode": mode,
+                "steps": steps,
+                "tool_calls": tool_calls,
+                "payload_bytes": payload_bytes,
+            },
+            lambda controller=controllers[mode], record=record: controller.run_indagine(record),
+        )
+
+
+def _diagnosis_and_fix_cases(axes: dict[str, tuple[int, ...]]) -> Iterator[Case]:
+    from src.core.diagnosis_engine import DiagnosisEngine
+    from src.core.fix_generator import FixGenerator
+    from src.core.indagine_controller import IndagineController
+    from src.storage.fix_history_memory import InMemoryFixHistory
+
+    fix_generator = FixGenerator()
+    for steps in axes["steps"]:
+        record = synthetic_trace_record(0, steps=steps)
+        findings = IndagineController().run_indagine(record)
+        diagnosis = DiagnosisEngine().diagnose(findings)
+        fixes = fix_generator.generate_fixes(diagnosis, findings)
+
+        yield (
+            "fix_generator.generate_fixes",
+            {"steps": steps},
+            lambda diagnosis=diagnosis, findings=findings: fix_generator.generate_fixes(
+                diagnosis, findings
+            ),
+        )
+
+        for history_size in axes["history_size"]:
+            fix_history = InMemoryFixHistory()
+            populate_fix_history(fix_history, history_size, diagnosis, fixes)
+            engine = DiagnosisEngine(fix_history=fix_history)
+            params = {"steps": steps, "history_size": history_size}
+
+            yield (
+                "diagnosis_engine.diagnose",
+                params,
+                lambda engine=engine, findings=findings: engine.diagnose(findings),
+            )
+            yield (
+                "fix_history.find_similar",
+                params,
+                lambda history=fix_history, diagnosis=diagnosis, findings=findings: (
+                    history.find_similar(diagnosis, findings, limit=5)
+                ),
+            )
+
+
+def _subject_extraction_cases(axes: dict[str, tuple[int, ...]]) -> Iterator[Case]:
+    from src.core.diagnosis_engine import DiagnosisEngine
+
+    # Uncached, so every call re-runs classification and subject extraction.
+    engine = DiagnosisEngine(cache_size=0)
+    for tool_calls in axes["finding_tool_calls"]:
+        findings = synthetic_findings(tool_calls)
+        yield (
+            "diagnosis_engine.diagnose_uncached",
+            {"tool_calls": tool_calls},
+            lambda findings=findings: engine.diagnose(findings),
+        )
+
+
+def _cases(axes: dict[str, tuple[int, ...]]) -> Iterator[Case]:
+    yield from _capture_cases(axes)
+    yield from _store_cases(axes)
+    yield from _controller_cases(axes)
+    yield from _diagnosis_and_fix_cases(axes)
+    yield from _subject_extraction_cases(axes)
+
+
+def _git_commit() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def _result_key(row: dict[str, Any]) -> str:
+    return row["case"] + json.dumps(row["params"], sort_keys=True)
+
+
+def _print_rows(rows: list[dict[str, Any]], baseline: dict[str, dict[str, Any]]) -> None:
+    header = f"{'case':<36}{'params':<58}{'mean_us':>12}{'p99_us':>12}"
+    print(header + (f"{'vs base':>10}" if baseline else ""))
+    for row in rows:
+        params = ",".join(f"{key}={value}" for key, value in row["params"].items())
+        line = f"{row['case']:<36}{params:<58}{row['mean_us']:>12}{row['p99_us']:>12}"
+        previous = baseline.get(_result_key(row))
+        if previous and previous["mean_us"]:
+            line += f"{row['mean_us'] / previous['mean_us'] - 1:>+10.1%}"
+        print(line)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="Use the reduced parameter matrix.")
+    parser.add_argument("--case", action="append", default=[], help="Only run matching cases.")
+    parser.add_argument("--min-time-s", type=float, default=0.2)
+    parser.add_argument("--max-iterations", type=int, default=2000)
+    parser.add_argument("--output", type=Path, help="Write results JSON to this path.")
+    parser.add_argument("--compare", type=Path, help="Baseline results JSON to diff against.")
+    args = parser.parse_args(argv)
+
+    axes = QUICK_AXES if args.quick else FULL_AXES
+    rows: list[dict[str, Any]] = []
+    for case_name, params, fn in _cases(axes):
+        if args.case and not any(selected in case_name for selected in args.case):
+            continue
+        stats = _measure(fn, min_time_s=args.min_time_s, max_iterations=args.max_iterations)
+        rows.append({"case": case_name, "params": params, **stats})
+
+    baseline: dict[str, dict[str, Any]] = {}
+    if args.compare:
+        previous = json.loads(args.compare.read_text(encoding="utf-8"))
+        baseline = {_result_key(row): row for row in previous["results"]}
+    _print_rows(rows, baseline)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        document = {
+            "commit": _git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "axes": {name: list(values) for name, values in axes.items()},
+            "results": rows,
+        }
+        args.output.write_text(json.dumps(document, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
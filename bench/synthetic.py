@@ -0,0 +1,122 @@
+"""Synthetic traces, findings and fix history sized along the benchmark axes.
+
+Every generator is deterministic for a given index so results are comparable
+between commits.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+_TOOL_CALL_TEMPLATES: tuple[tuple[str, dict[str, Any]], ...] = (
+    ("web_search", {"query": "direct flights NYC to LAX"}),
+    ("summarize_sources", {"sources": []}),
+    ("search_flights", {"origin": "NYC", "destination": "LAX", "date": "next friday"}),
+)
+
+
+def _padding(payload_bytes: int, index: int) -> str:
+    seed = f"payload-{index}-"
+    return (seed * (payload_bytes // len(seed) + 1))[:payload_bytes]
+
+
+def synthetic_trace_record(
+    index: int,
+    *,
+    steps: int = 10,
+    tool_calls: int = 1,
+    payload_bytes: int = 256,
+    subject: str = "search",
+) -> dict[str, Any]:
+    """A failed trace with ``steps`` steps, each carrying ``tool_calls`` calls and padding."""
+
+    failure_id = f"{subject}-bench-{index:08d}"
+    trace_steps: list[dict[str, Any]] = []
+    for step_index in range(steps):
+        calls = []
+        for call_index in range(tool_calls):
+            tool, args = _TOOL_CALL_TEMPLATES[(step_index + call_index) % len(_TOOL_CALL_TEMPLATES)]
+            calls.append({"tool": tool, "args": dict(args)})
+        trace_steps.append(
+            {
+                "name": f"agent_step_{step_index}",
+                "kind": "tool_call" if step_index % 2 else "reasoning",
+                "input": {"instruction": _padding(payload_bytes, index)},
+                "output": {"tool_calls": calls},
+                "error": "ambiguous instruction" if step_index == steps - 1 else None,
+            }
+        )
+
+    return {
+        "schema_version": 1,
+        "failure_id": failure_id,
+        "subject": subject,
+        "status": "failed",
+        "started_at": "2026-02-11T02:20:00.000000Z",
+        "ended_at": "2026-02-11T02:20:00.010000Z",
+        "steps": trace_steps,
+    }
+
+
+def synthetic_failure_event(trace_record: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "failure_id": trace_record["failure_id"],
+        "subject": trace_record["subject"],
+        "failure_type": "validation_error",
+        "timestamp": trace_record["ended_at"],
+        "trace_id": None,
+        "error": "ambiguous instruction",
+        "metadata": {},
+    }
+
+
+def synthetic_findings(tool_calls: int, *, subjects: int = 100) -> dict[str, Any]:
+    """Findings for a trace with ``tool_calls`` failing calls spread over ``subjects`` agents."""
+
+    reasoning_chain = [
+        f"step {index}: subject=agent_{index % subjects} called search_flights"
+        for index in range(tool_calls)
+    ]
+    schema_mismatches = [
+        {"step": index, "step_name": f"agent_step_{index}", "path": "date", "message": "booking"}
+        for index in range(tool_calls)
+    ]
+    return {
+        "findings": {
+            "trace_analyzer": [
+                {"total_steps": tool_calls, "failure_step": 0, "reasoning_chain": reasoning_chain}
+            ],
+            "tool_analyzer": [
+                {
+                    "tool": "search_flights",
+                    "issue": "tool_misuse_detected",
+                    "actual": {"schema_mismatches": schema_mismatches},
+                }
+            ],
+        }
+    }
+
+
+def synthetic_scenario(payload_bytes: int = 256) -> dict[str, Any]:
+    return {
+        "status": "failed",
+        "input": {"instruction": _padding(payload_bytes, 0)},
+        "error": {"code": "schema_validation_failed", "message": "sources is empty"},
+    }
+
+
+def populate_fix_history(
+    fix_history: Any, size: int, diagnosis: Any, fixes: list[Any], *, batch_size: int = 500
+) -> None:
+    """Record ``size`` past failures sharing ``diagnosis`` so find_similar has work to do."""
+
+    for start in range(0, size, batch_size):
+        fix_history.record_batch(
+            (
+                {"failure_id": f"history-{index:08d}", "subject": "search"},
+                diagnosis,
+                fixes,
+            )
+            for index in range(start, min(size, start + batch_size))
+        )
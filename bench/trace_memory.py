@@ -0,0 +1,69 @@
+"""Compare retained memory of one large trace across its in-process representations.
+
+python bench/trace_memory.py --steps 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from bench.synthetic import synthetic_trace_record  # noqa: E402
+
+
+def _retained_bytes(build: Callable[[], object]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    kept = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current - baseline
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=10_000)
+    parser.add_argument("--tool-calls", type=int, default=1)
+    parser.add_argument("--payload-bytes", type=int, default=64)
+    args = parser.parse_args(argv)
+
+    from src.models.compact_trace import CompactTrace
+    from src.models.trace import TraceRecord
+
+    wire = json.dumps(
+        synthetic_trace_record(
+            0, steps=args.steps, tool_calls=args.tool_calls, payload_bytes=args.payload_bytes
+        )
+    )
+
+    representations: dict[str, Callable[[], object]] = {
+        "dict (json.loads)": lambda: json.loads(wire),
+        "pydantic TraceRecord": lambda: TraceRecord.model_validate_json(wire),
+        "pydantic + model_dump()": lambda: (lambda record: (record, record.model_dump()))(
+            TraceRecord.model_validate_json(wire)
+        ),
+        "CompactTrace": lambda: CompactTrace.from_wire(json.loads(wire)),
+    }
+
+    print(f"{'representation':<26}{'MiB':>10}{'bytes/step':>12}")
+    for name, build in representations.items():
+        retained = _retained_bytes(build)
+        print(f"{name:<26}{retained / 2**20:>10.2f}{retained / args.steps:>12.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,126 @@
+"""Measure per-call tracing overhead of ``run_with_failure_detection``.
+
+Each configuration runs in a fresh interpreter because the global OpenTelemetry
+tracer provider can only be installed once per process.
+
+    python bench/tracing_overhead.py --iterations 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+CONFIGS: dict[str, dict[str, Any] | None] = {
+    "disabled": None,
+    "simple+console": {"exporter": "console", "span_processor": "simple"},
+    "batch+console": {"exporter": "console", "span_processor": "batch"},
+    "batch+noop": {"exporter": "noop", "span_processor": "batch"},
+    "head(0.1)+batch+noop": {
+        "exporter": "noop",
+        "span_processor": "batch",
+        "sampling": "head",
+        "sample_ratio": 0.1,
+    },
+    "tail(0.1)+batch+noop": {
+        "exporter": "noop",
+        "span_processor": "batch",
+        "sampling": "tail",
+        "sample_ratio": 0.1,
+    },
+}
+
+
+def _passed_scenario() -> dict[str, Any]:
+    return {"subject": "bench", "status": "passed"}
+
+
+def _measure(config_name: str, iterations: int) -> dict[str, Any]:
+    from src.core.failure_detector import run_with_failure_detection
+
+    options = CONFIGS[config_name]
+    if options is not None:
+        from opentelemetry import trace
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        from src.core.tracing import NoOpSpanExporter, TracingOptions, build_tracer_provider
+
+        selected = TracingOptions(**options)
+        exporter = (
+            NoOpSpanExporter()
+            if selected.exporter == "noop"
+            else ConsoleSpanExporter(out=open(os.devnull, "w"))
+        )
+        trace.set_tracer_provider(build_tracer_provider(selected, exporter))
+
+    for _ in range(min(100, iterations)):
+        run_with_failure_detection("bench", _passed_scenario, timeout_s=5.0)
+
+    samples_us: list[float] = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        run_with_failure_detection("bench", _passed_scenario, timeout_s=5.0)
+        samples_us.append((time.perf_counter() - started) * 1_000_000)
+
+    samples_us.sort()
+    return {
+        "config": config_name,
+        "iterations": iterations,
+        "mean_us": round(statistics.fmean(samples_us), 1),
+        "p50_us": round(samples_us[len(samples_us) // 2], 1),
+        "p99_us": round(samples_us[int(len(samples_us) * 0.99) - 1], 1),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--config", choices=sorted(CONFIGS), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.config:
+        json.dump(_measure(args.config, args.iterations), sys.stdout)
+        return 0
+
+    rows = []
+    for config_name in CONFIGS:
+        completed = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--config",
+                config_name,
+                "--iterations",
+                str(args.iterations),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        rows.append(json.loads(completed.stdout))
+
+    baseline = rows[0]["mean_us"]
+    print(f"{'config':<24}{'mean_us':>10}{'p50_us':>10}{'p99_us':>10}{'overhead_us':>13}")
+    for row in rows:
+        overhead = row["mean_us"] - baseline
+        print(
+            f"{row['config']:<24}{row['mean_us']:>10}{row['p50_us']:>10}"
+            f"{row['p99_us']:>10}{overhead:>13.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -67,8 +67,8 @@ def _extract_scenario_input(trace_record: dict[str, Any]) -> dict[str, Any] | No
 
 
 def _run_live(subject: str, store: str, timeout_s: float) -> dict[str, Any]:
-    from src.core import diagnosis_engine, fix_generator, indagine_pipeline
     from src.core.failure_detector import run_with_failure_detection
+    from src.core.investigation_pipeline import InvestigationPipeline
     from src.storage.trace_store import StoreBackend, TraceStore
     from src.subjects.run_subjects import run_subject_scenario
 
@@ -80,15 +80,13 @@ def _run_live(subject: str, store: str, timeout_s: float) -> dict[str, Any]:
 
     trace_store = TraceStore(backend=cast(StoreBackend, store))
     trace_store.store_trace(failure_event, trace_record)
-    stored_trace = trace_store.get_trace(failure_event.failure_id)
 
-    pipeline = indagine_pipeline.IndaginePipeline(trace_store=trace_store)
-    findings_report = pipeline.run(failure_event.failure_id)
-    diagnosis = diagnosis_engine.DiagnosisEngine().diagnose(findings_report)
-    fixes = fix_generator.FixGenerator().generate_fixes(diagnosis, findings_report)
+    pipeline = InvestigationPipeline(trace_store)
+    (result,) = pipeline.run([failure_event.failure_id])
+    if result.diagnosis is None:
+        raise RuntimeError(f"Investigation of '{result.failure_id}' produced no diagnosis.")
 
-    trace_payload = stored_trace["trace_record"]
-    scenario_input = _extract_scenario_input(trace_payload)
+    scenario_input = _extract_scenario_input(result.trace_record)
 
     return {
         "mode": "live",
@@ -96,9 +94,9 @@ def _run_live(subject: str, store: str, timeout_s: float) -> dict[str, Any]:
         "store": trace_store.backend_name,
         "scenario_input": scenario_input,
         "failure_event": failure_event.model_dump(mode="json"),
-        "findings": findings_report.model_dump(mode="json"),
-        "diagnosis": diagnosis.model_dump(mode="json"),
-        "fixes": [proposal.model_dump(mode="json") for proposal in fixes],
+        "findings": result.findings.model_dump(mode="json"),
+        "diagnosis": result.diagnosis.model_dump(mode="json"),
+        "fixes": [proposal.model_dump(mode="json") for proposal in result.fixes],
     }
 
 
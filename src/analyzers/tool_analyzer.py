@@ -1,37 +1,81 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
 from typing import Any
 
+from src.models.compact_trace import CompactTrace
 from src.models.findings import ToolFinding
 from src.models.trace import TraceRecord
-from src.tools.schema_registry import SchemaRegistry
+from src.tools.schema_registry import SchemaRegistry, ToolCallInput
 
 
 class ToolAnalyzer:
+    ANALYZER_VERSION = "1"
+
     def __init__(self, schema_registry: SchemaRegistry | None = None) -> None:
         self._schema_registry = schema_registry or SchemaRegistry()
 
-    def analyze(self, trace_record: TraceRecord | dict[str, Any]) -> ToolFinding:
-        trace_payload = self._as_trace_payload(trace_record)
-        tool_calls = self._extract_tool_calls(trace_payload)
-
-        schema_mismatches: list[dict[str, Any]] = []
-        for tool_call in tool_calls:
-            for mismatch in self._schema_registry.validate(
-                tool_call["tool_name"], tool_call["args"]
-            ):
-                schema_mismatches.append(
-                    {
-                        "step": tool_call["step"],
-                        "step_name": tool_call["step_name"],
-                        "tool": tool_call["tool_name"],
-                        "code": mismatch.get("code"),
-                        "message": mismatch.get("message"),
-                        "path": mismatch.get("path"),
-                        "details": mismatch.get("details"),
-                    }
-                )
+    def version_key(self) -> str:
+        return f"{self.ANALYZER_VERSION}:{self._schema_registry.fingerprint()}"
+
+    def analyze(self, trace_record: TraceRecord | CompactTrace | dict[str, Any]) -> ToolFinding:
+        return self.analyze_many([trace_record])[0]
+
+    def analyze_many(
+        self,
+        trace_records: Iterable[TraceRecord | CompactTrace | dict[str, Any]],
+        *,
+        max_workers: int = 1,
+    ) -> list[ToolFinding]:
+        """Analyze many traces with one deduplicated bulk schema validation pass."""
+
+        trace_payloads: list[dict[str, Any]] = []
+        tool_calls_per_trace: list[list[dict[str, Any]]] = []
+        validation_inputs: list[ToolCallInput] = []
+
+        for trace_record in trace_records:
+            trace_payload = self._as_trace_payload(trace_record)
+            tool_calls = self._extract_tool_calls(trace_payload)
+            captured_at = trace_payload.get("started_at")
+            as_of = captured_at if isinstance(captured_at, str) else None
+
+            trace_payloads.append(trace_payload)
+            tool_calls_per_trace.append(tool_calls)
+            validation_inputs.extend(
+                (tool_call["tool_name"], tool_call["args"], as_of) for tool_call in tool_calls
+            )
+
+        mismatches_per_call = iter(
+            self._schema_registry.validate_many(validation_inputs, max_workers=max_workers)
+        )
 
+        findings: list[ToolFinding] = []
+        for trace_payload, tool_calls in zip(trace_payloads, tool_calls_per_trace):
+            schema_mismatches: list[dict[str, Any]] = []
+            for tool_call in tool_calls:
+                for mismatch in next(mismatches_per_call):
+                    schema_mismatches.append(
+                        {
+                            "step": tool_call["step"],
+                            "step_name": tool_call["step_name"],
+                            "tool": tool_call["tool_name"],
+                            "code": mismatch.get("code"),
+                            "message": mismatch.get("message"),
+                            "path": mismatch.get("path"),
+                            "details": mismatch.get("details"),
+                        }
+                    )
+
+            findings.append(self._build_finding(trace_payload, tool_calls, schema_mismatches))
+
+        return findings
+
+    def _build_finding(
+        self,
+        trace_payload: dict[str, Any],
+        tool_calls: list[dict[str, Any]],
+        schema_mismatches: list[dict[str, Any]],
+    ) -> ToolFinding:
         wrong_tool = self._detect_wrong_tool(trace_payload, tool_calls)
         issue = None
         if schema_mismatches or wrong_tool["flagged"]:
@@ -49,7 +93,11 @@ class ToolAnalyzer:
             },
         )
 
-    def _as_trace_payload(self, trace_record: TraceRecord | dict[str, Any]) -> dict[str, Any]:
+    def _as_trace_payload(
+        self, trace_record: TraceRecord | CompactTrace | dict[str, Any]
+    ) -> dict[str, Any]:
+        if isinstance(trace_record, CompactTrace):
+            return trace_record.to_wire()
         if isinstance(trace_record, TraceRecord):
             return trace_record.model_dump()
         if isinstance(trace_record, dict):
@@ -187,5 +235,5 @@ class ToolAnalyzer:
         return phrases
 
 
-def analyze(trace_record: TraceRecord | dict[str, Any]) -> ToolFinding:
+def analyze(trace_record: TraceRecord | CompactTrace | dict[str, Any]) -> ToolFinding:
     return ToolAnalyzer().analyze(trace_record)
@@ -1,15 +1,29 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Sequence
 from typing import Any
 
+from src.models.compact_trace import CompactStep, CompactToolCall, CompactTrace
 from src.models.findings import TraceFinding
 from src.models.trace import TraceRecord, TraceStep, TraceToolCall
 
+AnyStep = TraceStep | CompactStep
+
 
 class TraceAnalyzer:
-    def analyze(self, trace_record: TraceRecord | dict[str, Any]) -> TraceFinding:
-        trace = TraceRecord.model_validate(trace_record)
+    ANALYZER_VERSION = "1"
+
+    def version_key(self) -> str:
+        return self.ANALYZER_VERSION
+
+    def analyze(self, trace_record: TraceRecord | CompactTrace | dict[str, Any]) -> TraceFinding:
+        # CompactTrace is already structured, so it skips pydantic validation.
+        trace = (
+            trace_record
+            if isinstance(trace_record, CompactTrace)
+            else TraceRecord.model_validate(trace_record)
+        )
         total_steps = len(trace.steps)
         failed_index = self._find_failure_index(trace.steps)
 
@@ -31,7 +45,7 @@ class TraceAnalyzer:
             reasoning_chain=self._extract_reasoning_chain(trace.steps),
         )
 
-    def _find_failure_index(self, steps: list[TraceStep]) -> int | None:
+    def _find_failure_index(self, steps: Sequence[AnyStep]) -> int | None:
         for index, step in enumerate(steps):
             if step.error:
                 return index
@@ -42,7 +56,7 @@ class TraceAnalyzer:
 
         return None
 
-    def _extract_reasoning_chain(self, steps: list[TraceStep]) -> list[str]:
+    def _extract_reasoning_chain(self, steps: Sequence[AnyStep]) -> list[str]:
         explicit_chain: list[str] = []
         for step in steps:
             if step.thought:
@@ -68,7 +82,7 @@ class TraceAnalyzer:
 
         return derived_chain
 
-    def _tool_calls_for_step(self, step: TraceStep) -> list[TraceToolCall]:
+    def _tool_calls_for_step(self, step: AnyStep) -> Sequence[TraceToolCall | CompactToolCall]:
         if step.tool_calls:
             return step.tool_calls
 
@@ -88,5 +102,5 @@ class TraceAnalyzer:
         return tool_calls
 
 
-def analyze(trace_record: TraceRecord | dict[str, Any]) -> TraceFinding:
+def analyze(trace_record: TraceRecord | CompactTrace | dict[str, Any]) -> TraceFinding:
     return TraceAnalyzer().analyze(trace_record)
@@ -1,12 +1,22 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
 from typing import Any, Protocol
 
+from src.core.metrics import metrics
+from src.core.profiling import InvestigationProfiler, profiled
 from src.models.diagnosis import Diagnosis, FailureTaxonomy
 from src.models.findings import FindingsReport, ToolFinding, TraceFinding
 from src.storage.fix_history_memory import InMemoryFixHistory
+from src.storage.serialization import canonical_dumps
+from src.subjects.registry import known_subjects
 
 
 class _FixHistoryLookup(Protocol):
@@ -19,7 +29,124 @@ class _FixHistoryLookup(Protocol):
     ) -> list[str]: ...
 
 
+_Classification = tuple[FailureTaxonomy, str | None, str, float, tuple[str, ...]]
+
+# Keys inside tool finding payloads that change between runs of the same failure.
+# Classification and the cache key both ignore them, so a cached result always matches
+# what classifying the findings again would return.
+_VOLATILE_KEYS = frozenset(
+    {"timestamp", "started_at", "ended_at", "captured_at", "created_at", "duration_ms"}
+)
+
+
+def _stable_payload(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: _stable_payload(item) for key, item in value.items() if key not in _VOLATILE_KEYS
+        }
+    if isinstance(value, list):
+        return [_stable_payload(item) for item in value]
+    return value
+
+
+def findings_fingerprint(
+    trace_findings: list[TraceFinding], tool_findings: list[ToolFinding]
+) -> str:
+    """Hash of the finding fields classification reads, without volatile payload keys."""
+
+    payload = (
+        [
+            (finding.failure_location, finding.error, finding.reasoning_chain)
+            for finding in trace_findings
+        ],
+        [
+            (
+                finding.tool,
+                finding.issue,
+                _stable_payload(finding.expected),
+                _stable_payload(finding.actual),
+            )
+            for finding in tool_findings
+        ],
+    )
+    return hashlib.blake2b(canonical_dumps(payload), digest_size=16).hexdigest()
+
+
+@dataclass
+class DiagnosisCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ClassificationCache:
+    """LRU cache of classification results, optionally expiring entries after ``ttl_s``."""
+
+    def __init__(self, max_size: int = 1024, *, ttl_s: float | None = None) -> None:
+        if max_size < 0 or (ttl_s is not None and ttl_s <= 0):
+            raise ValueError("max_size must not be negative and ttl_s must be positive.")
+
+        self._max_size = max_size
+        self._ttl_s = ttl_s
+        self._entries: OrderedDict[str, tuple[float, _Classification]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = DiagnosisCacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_size > 0
+
+    def get(self, key: str) -> _Classification | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._ttl_s is not None and time.monotonic() > entry[0]:
+                del self._entries[key]
+                self.stats.evictions += 1
+                metrics.increment("diagnosis.cache_evict")
+                entry = None
+            if entry is None:
+                self.stats.misses += 1
+                metrics.increment("diagnosis.cache_miss")
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            metrics.increment("diagnosis.cache_hit")
+            return entry[1]
+
+    def put(self, key: str, value: _Classification) -> None:
+        if not self.enabled:
+            return
+        expires_at = time.monotonic() + self._ttl_s if self._ttl_s is not None else 0.0
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+                metrics.increment("diagnosis.cache_evict")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
 class DiagnosisEngine:
+    """Classify findings into the failure taxonomy and link similar past failures.
+
+    Classification and affected subjects are cached by ``findings_fingerprint`` in a
+    ``ClassificationCache`` (``cache_size=0`` disables it); similar-failure lookups
+    always query the fix history.
+    """
+
     _HALLUCINATION_MARKERS = (
         "hallucinated=true",
         "hallucinated: true",
@@ -38,6 +165,8 @@ class DiagnosisEngine:
         "token limit",
         "context length",
     )
+    # Applied to lowercased text.
+    _SUBJECT_PATTERN = re.compile(r"subject\s*[:=]\s*([a-z0-9_-]+)")
     _COORDINATION_MARKERS = (
         "coordination_failure",
         "handoff",
@@ -45,30 +174,100 @@ class DiagnosisEngine:
         "agent a",
         "agent b",
     )
-    _SUBJECT_PATTERN = re.compile(r"subject\s*[:=]\s*([a-z0-9_-]+)", re.IGNORECASE)
 
-    def __init__(self, fix_history: _FixHistoryLookup | None = None) -> None:
+    def __init__(
+        self,
+        fix_history: _FixHistoryLookup | None = None,
+        *,
+        profiler: InvestigationProfiler | None = None,
+        cache_size: int = 1024,
+        cache_ttl_s: float | None = None,
+        subjects: Iterable[str] | None = None,
+    ) -> None:
         self._fix_history: _FixHistoryLookup = fix_history or InMemoryFixHistory()
+        self._profiler = profiler or InvestigationProfiler.from_env()
+        self._cache = ClassificationCache(cache_size, ttl_s=cache_ttl_s)
+        self._subjects = tuple(
+            dict.fromkeys(
+                name.lower() for name in (known_subjects() if subjects is None else subjects)
+            )
+        )
+        # Longest names first so a name is never cut short by one of its prefixes.
+        self._known_subject_pattern = re.compile(
+            "|".join(re.escape(name) for name in sorted(self._subjects, key=len, reverse=True))
+            or "(?!)"
+        )
+
+    @property
+    def cache_stats(self) -> DiagnosisCacheStats:
+        return self._cache.stats
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    def diagnose(
+        self,
+        findings_report: FindingsReport | dict[str, Any],
+        *,
+        failure_id: str | None = None,
+    ) -> Diagnosis:
+        with profiled(self._profiler, "diagnose", failure_id), metrics.timer("diagnosis.total"):
+            with metrics.timer("diagnosis.validate"):
+                report = FindingsReport.model_validate(findings_report)
+            trace_findings, tool_findings = self._partition_findings(report)
+            root_cause, sub_type, explanation, confidence, affected_subjects = (
+                self._classify_cached(trace_findings, tool_findings)
+            )
+
+            diagnosis = Diagnosis(
+                root_cause=root_cause,
+                sub_type=sub_type,
+                confidence=confidence,
+                explanation=explanation,
+                affected_subjects=list(affected_subjects),
+                similar_past_failure_ids=[],
+            )
+            return self.link_similar(diagnosis, report)
+
+    def fingerprint(self, findings_report: FindingsReport | dict[str, Any]) -> str:
+        """``findings_fingerprint`` of a report: equal fingerprints classify alike."""
 
-    def diagnose(self, findings_report: FindingsReport | dict[str, Any]) -> Diagnosis:
         report = FindingsReport.model_validate(findings_report)
-        trace_findings, tool_findings = self._partition_findings(report)
-        root_cause, sub_type, explanation, confidence = self._classify(
-            trace_findings, tool_findings
-        )
+        return findings_fingerprint(*self._partition_findings(report))
 
-        diagnosis = Diagnosis(
-            root_cause=root_cause,
-            sub_type=sub_type,
-            confidence=confidence,
-            explanation=explanation,
-            affected_subjects=self._extract_affected_subjects(trace_findings, tool_findings),
-            similar_past_failure_ids=[],
-        )
+    def link_similar(
+        self, diagnosis: Diagnosis, findings_report: FindingsReport | dict[str, Any]
+    ) -> Diagnosis:
+        """Copy of ``diagnosis`` linked to similar past failures in the fix history."""
 
-        similar_failure_ids = self._fix_history.find_similar(diagnosis, report, limit=5)
+        with metrics.timer("diagnosis.find_similar"):
+            similar_failure_ids = self._fix_history.find_similar(
+                diagnosis, findings_report, limit=5
+            )
         return diagnosis.model_copy(update={"similar_past_failure_ids": similar_failure_ids})
 
+    def _classify_cached(
+        self, trace_findings: list[TraceFinding], tool_findings: list[ToolFinding]
+    ) -> _Classification:
+        cache_key = None
+        if self._cache.enabled:
+            cache_key = findings_fingerprint(trace_findings, tool_findings)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        with metrics.timer("diagnosis.classify"):
+            root_cause, sub_type, explanation, confidence = self._classify(
+                trace_findings, tool_findings
+            )
+        with metrics.timer("diagnosis.affected_subjects"):
+            affected_subjects = self._extract_affected_subjects(trace_findings, tool_findings)
+
+        classification = (root_cause, sub_type, explanation, confidence, tuple(affected_subjects))
+        if cache_key is not None:
+            self._cache.put(cache_key, classification)
+        return classification
+
     def _partition_findings(
         self, findings_report: FindingsReport
     ) -> tuple[list[TraceFinding], list[ToolFinding]]:
@@ -171,9 +370,9 @@ class DiagnosisEngine:
             if finding.issue:
                 blobs.append(finding.issue)
             if finding.expected is not None:
-                blobs.append(json.dumps(finding.expected, sort_keys=True))
+                blobs.append(json.dumps(_stable_payload(finding.expected), sort_keys=True))
             if finding.actual is not None:
-                blobs.append(json.dumps(finding.actual, sort_keys=True))
+                blobs.append(json.dumps(_stable_payload(finding.actual), sort_keys=True))
 
         return blobs
 
@@ -203,24 +402,14 @@ class DiagnosisEngine:
     def _extract_affected_subjects(
         self, trace_findings: list[TraceFinding], tool_findings: list[ToolFinding]
     ) -> list[str]:
-        subjects: list[str] = []
-        blobs = self._raw_text_blobs(trace_findings, tool_findings)
-
-        for blob in blobs:
-            for match in self._SUBJECT_PATTERN.findall(blob):
-                normalized = match.lower()
-                if normalized not in subjects:
-                    subjects.append(normalized)
-
-        if subjects:
-            return subjects
-
-        combined = " ".join(blobs).lower()
-        for known_subject in ("booking", "search", "summary"):
-            if known_subject in combined and known_subject not in subjects:
-                subjects.append(known_subject)
-
-        return subjects
+        # One scan over all blobs; NUL never matches the pattern, so no match spans blobs.
+        text = "\0".join(self._raw_text_blobs(trace_findings, tool_findings)).lower()
+        declared = dict.fromkeys(self._SUBJECT_PATTERN.findall(text))
+        if declared:
+            return list(declared)
+
+        mentioned = set(self._known_subject_pattern.findall(text))
+        return [subject for subject in self._subjects if subject in mentioned]
 
 
 def diagnose(findings_report: FindingsReport | dict[str, Any]) -> Diagnosis:
@@ -1,20 +1,419 @@
 from __future__ import annotations
 
-import difflib
+import re
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterator, Sequence
 
+Opcode = tuple[str, int, int, int, int]
 
-def unified_diff(before: str, after: str, *, file_path: str) -> str:
+# Regions without unique anchor lines fall back to Myers, which costs about
+# edits x region lines. The edit budget shrinks with the region so that product stays
+# under MYERS_COST_LIMIT; a region that needs more is emitted as one replace block.
+MYERS_COST_LIMIT = 2_000_000
+_MIN_MYERS_EDITS = 32
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+class PatchApplyError(ValueError):
+    """A unified diff does not apply cleanly to the given source."""
+
+
+def _unique_anchors(
+    a: Sequence[str], alo: int, ahi: int, b: Sequence[str], blo: int, bhi: int
+) -> list[tuple[int, int]]:
+    """Longest increasing run of lines that occur exactly once on both sides (patience)."""
+
+    a_slice, b_slice = a[alo:ahi], b[blo:bhi]
+    a_counts, b_counts = Counter(a_slice), Counter(b_slice)
+    b_positions = {line: index for index, line in enumerate(b_slice, blo)}
+    candidates = [
+        (index, b_positions[line])
+        for index, line in enumerate(a_slice, alo)
+        if a_counts[line] == 1 and b_counts.get(line) == 1
+    ]
+    if not candidates:
+        return []
+    # Typical edits keep unique lines in order, which makes the whole list the answer.
+    if all(first[1] < second[1] for first, second in zip(candidates, candidates[1:])):
+        return candidates
+
+    tails: list[int] = []
+    tail_indexes: list[int] = []
+    previous: list[int] = [-1] * len(candidates)
+    for position, (_, b_index) in enumerate(candidates):
+        slot = bisect_left(tails, b_index)
+        if slot == len(tails):
+            tails.append(b_index)
+            tail_indexes.append(position)
+        else:
+            tails[slot] = b_index
+            tail_indexes[slot] = position
+        previous[position] = tail_indexes[slot - 1] if slot else -1
+
+    anchors: list[tuple[int, int]] = []
+    position = tail_indexes[-1]
+    while position != -1:
+        anchors.append(candidates[position])
+        position = previous[position]
+    anchors.reverse()
+    return anchors
+
+
+def _trim_common(
+    a: Sequence[str],
+    alo: int,
+    ahi: int,
+    b: Sequence[str],
+    blo: int,
+    bhi: int,
+    blocks: list[tuple[int, int, int]],
+) -> tuple[int, int, int, int]:
+    """Record the region's common prefix and suffix in ``blocks`` and return what is left."""
+
+    start = alo
+    while alo < ahi and blo < bhi and a[alo] == b[blo]:
+        alo += 1
+        blo += 1
+    if alo > start:
+        blocks.append((start, blo - (alo - start), alo - start))
+    end = ahi
+    while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+        ahi -= 1
+        bhi -= 1
+    if end > ahi:
+        blocks.append((ahi, bhi, end - ahi))
+    return alo, ahi, blo, bhi
+
+
+def _myers_split(
+    a: Sequence[str], alo: int, ahi: int, b: Sequence[str], blo: int, bhi: int
+) -> tuple[int, int] | None:
+    """Point on a shortest edit path through the region, from a bidirectional Myers search.
+
+    Only two frontiers are kept, so memory is linear in the region. The search gives up
+    (returning ``None``) after ``MYERS_COST_LIMIT // region size`` edits from each end.
+    """
+
+    n, m = ahi - alo, bhi - blo
+    max_edits = min((n + m + 1) // 2, max(_MIN_MYERS_EDITS, MYERS_COST_LIMIT // (n + m)))
+    offset = max_edits + 1
+    forward = [-1] * (2 * offset + 2)
+    backward = forward[:]
+    forward[offset + 1] = backward[offset + 1] = 0
+    delta = n - m
+    check_forward = delta % 2 != 0
+    # Diagonals that have left the edit graph are skipped from then on.
+    forward_start = forward_end = backward_start = backward_end = 0
+
+    for edits in range(max_edits):
+        for diagonal in range(-edits + forward_start, edits + 1 - forward_end, 2):
+            index = offset + diagonal
+            if diagonal == -edits or (
+                diagonal != edits and forward[index - 1] < forward[index + 1]
+            ):
+                x = forward[index + 1]
+            else:
+                x = forward[index - 1] + 1
+            y = x - diagonal
+            while x < n and y < m and a[alo + x] == b[blo + y]:
+                x += 1
+                y += 1
+            forward[index] = x
+            if x > n:
+                forward_end += 2
+            elif y > m:
+                forward_start += 2
+            elif check_forward:
+                reverse_index = offset + delta - diagonal
+                if 0 <= reverse_index < len(backward) and backward[reverse_index] != -1:
+                    if x >= n - backward[reverse_index]:
+                        return alo + x, blo + y
+
+        for diagonal in range(-edits + backward_start, edits + 1 - backward_end, 2):
+            index = offset + diagonal
+            if diagonal == -edits or (
+                diagonal != edits and backward[index - 1] < backward[index + 1]
+            ):
+                x = backward[index + 1]
+            else:
+                x = backward[index - 1] + 1
+            y = x - diagonal
+            while x < n and y < m and a[ahi - 1 - x] == b[bhi - 1 - y]:
+                x += 1
+                y += 1
+            backward[index] = x
+            if x > n:
+                backward_end += 2
+            elif y > m:
+                backward_start += 2
+            elif not check_forward:
+                forward_index = offset + delta - diagonal
+                if 0 <= forward_index < len(forward) and forward[forward_index] != -1:
+                    forward_x = forward[forward_index]
+                    if forward_x >= n - x:
+                        forward_y = forward_x - (forward_index - offset)
+                        return alo + forward_x, blo + forward_y
+    return None
+
+
+def _myers_blocks(
+    a: Sequence[str], alo: int, ahi: int, b: Sequence[str], blo: int, bhi: int
+) -> list[tuple[int, int, int]]:
+    """Matching blocks of a shortest edit script, found with linear-space Myers.
+
+    Regions whose search exceeds the edit budget of ``_myers_split`` are left without
+    matching blocks, so they become one replace block.
+    """
+
+    blocks: list[tuple[int, int, int]] = []
+    regions = [(alo, ahi, blo, bhi)]
+    while regions:
+        alo, ahi, blo, bhi = regions.pop()
+        alo, ahi, blo, bhi = _trim_common(a, alo, ahi, b, blo, bhi, blocks)
+        if alo == ahi or blo == bhi:
+            continue
+        split = _myers_split(a, alo, ahi, b, blo, bhi)
+        if split is None:
+            continue
+        a_split, b_split = split
+        regions.append((a_split, ahi, b_split, bhi))
+        regions.append((alo, a_split, blo, b_split))
+    return blocks
+
+
+def _matching_blocks(a: Sequence[str], b: Sequence[str]) -> list[tuple[int, int, int]]:
+    """``(i, j, length)`` runs of equal lines, in order and without adjacent runs merged."""
+
+    blocks: list[tuple[int, int, int]] = []
+    regions = [(0, len(a), 0, len(b))]
+    while regions:
+        alo, ahi, blo, bhi = regions.pop()
+        alo, ahi, blo, bhi = _trim_common(a, alo, ahi, b, blo, bhi, blocks)
+        if alo == ahi or blo == bhi:
+            continue
+
+        anchors = _unique_anchors(a, alo, ahi, b, blo, bhi)
+        alo_start, blo_start = alo, blo
+        if not anchors:
+            blocks.extend(_myers_blocks(a, alo, ahi, b, blo, bhi))
+            continue
+        run_a, run_b, run_size = anchors[0][0], anchors[0][1], 0
+        for a_index, b_index in anchors:
+            if a_index == run_a + run_size and b_index == run_b + run_size:
+                run_size += 1
+                continue
+            blocks.append((run_a, run_b, run_size))
+            alo, blo = run_a + run_size, run_b + run_size
+            if alo < a_index or blo < b_index:
+                regions.append((alo, a_index, blo, b_index))
+            run_a, run_b, run_size = a_index, b_index, 1
+        blocks.append((run_a, run_b, run_size))
+        if anchors[0][0] > alo_start or anchors[0][1] > blo_start:
+            regions.append((alo_start, anchors[0][0], blo_start, anchors[0][1]))
+        alo, blo = run_a + run_size, run_b + run_size
+        if alo < ahi or blo < bhi:
+            regions.append((alo, ahi, blo, bhi))
+
+    blocks.sort()
+    return blocks
+
+
+def diff_opcodes(a: Sequence[str], b: Sequence[str]) -> list[Opcode]:
+    """``difflib.SequenceMatcher.get_opcodes``-style edit script from a patience diff.
+
+    Unique lines anchor the alignment and the gaps between anchors are diffed with
+    Myers, so typical edits to large files cost close to linear time.
+    """
+
+    opcodes: list[Opcode] = []
+    i = j = 0
+    for a_index, b_index, size in [*_matching_blocks(a, b), (len(a), len(b), 0)]:
+        if i < a_index and j < b_index:
+            opcodes.append(("replace", i, a_index, j, b_index))
+        elif i < a_index:
+            opcodes.append(("delete", i, a_index, j, j))
+        elif j < b_index:
+            opcodes.append(("insert", i, i, j, b_index))
+        if size:
+            if opcodes and opcodes[-1][0] == "equal":
+                tag, i1, _, j1, _ = opcodes[-1]
+                opcodes[-1] = (tag, i1, a_index + size, j1, b_index + size)
+            else:
+                opcodes.append(("equal", a_index, a_index + size, b_index, b_index + size))
+        i, j = a_index + size, b_index + size
+
+    return opcodes or [("equal", 0, 0, 0, 0)]
+
+
+def _grouped_opcodes(opcodes: list[Opcode], context: int) -> Iterator[list[Opcode]]:
+    """Split an edit script into hunks with ``context`` lines, as difflib does."""
+
+    codes = list(opcodes)
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)
+
+    span = context + context
+    group: list[Opcode] = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > span:
+            group.append((tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
+
+
+def _format_range(start: int, stop: int) -> str:
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return str(beginning)
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def unified_diff(before: str, after: str, *, file_path: str, context: int = 3) -> str:
     if before == after:
         raise ValueError("before and after content must differ to produce a unified diff")
 
-    diff_lines = difflib.unified_diff(
-        before.splitlines(),
-        after.splitlines(),
-        fromfile=f"a/{file_path}",
-        tofile=f"b/{file_path}",
-        lineterm="",
-    )
-    diff_text = "\n".join(diff_lines)
-    if not diff_text:
+    a = before.splitlines()
+    b = after.splitlines()
+    lines = [f"--- a/{file_path}", f"+++ b/{file_path}"]
+    for group in _grouped_opcodes(diff_opcodes(a, b), context):
+        first, last = group[0], group[-1]
+        lines.append(
+            f"@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@"
+        )
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                lines.extend(f" {line}" for line in a[i1:i2])
+                continue
+            if tag in ("replace", "delete"):
+                lines.extend(f"-{line}" for line in a[i1:i2])
+            if tag in ("replace", "insert"):
+                lines.extend(f"+{line}" for line in b[j1:j2])
+
+    if len(lines) == 2:
         raise ValueError("unable to generate unified diff")
-    return f"{diff_text}\n"
+    return "\n".join(lines) + "\n"
+
+
+def _parse_hunks(diff: str) -> list[tuple[int, list[str], list[str]]]:
+    # Each hunk body is read by the old/new line counts of its header, so content lines
+    # that look like ``---``/``+++`` file headers are never mistaken for them.
+    hunks: list[tuple[int, list[str], list[str]]] = []
+    old_lines: list[str] = []
+    new_lines: list[str] = []
+    old_remaining = new_remaining = 0
+    for line in diff.splitlines():
+        if not old_remaining and not new_remaining:
+            header = _HUNK_HEADER.match(line)
+            if header:
+                old_start = int(header.group(1))
+                old_remaining = 1 if header.group(2) is None else int(header.group(2))
+                new_remaining = 1 if header.group(4) is None else int(header.group(4))
+                # Zero-length ranges name the line *before* the insertion point.
+                old_lines, new_lines = [], []
+                hunks.append((old_start - 1 if old_remaining else old_start, old_lines, new_lines))
+            # File headers, "\ No newline" markers and other text between hunks.
+            continue
+        if line.startswith("\\"):
+            continue
+
+        marker, text = line[:1], line[1:]
+        if marker in (" ", "") and old_remaining and new_remaining:
+            old_lines.append(text)
+            new_lines.append(text)
+            old_remaining -= 1
+            new_remaining -= 1
+        elif marker == "-" and old_remaining:
+            old_lines.append(text)
+            old_remaining -= 1
+        elif marker == "+" and new_remaining:
+            new_lines.append(text)
+            new_remaining -= 1
+        else:
+            raise PatchApplyError(f"Malformed diff line: {line!r}")
+
+    if not hunks:
+        raise PatchApplyError("Diff contains no hunks.")
+    if old_remaining or new_remaining:
+        raise PatchApplyError("Diff ends inside a hunk.")
+    return hunks
+
+
+def apply_patch(source: str, diff: str, *, line_offset: int = 0) -> str:
+    """Apply a unified diff to ``source``, raising ``PatchApplyError`` if it does not fit.
+
+    Hunk line numbers are shifted by ``line_offset``. Each hunk must match exactly; when
+    it is not at its stated line the nearest exact match after the previous hunk is
+    used, found through a line index rather than a scan per hunk.
+    """
+
+    newline = "\r\n" if "\r\n" in source else "\n"
+    lines = source.splitlines()
+    line_index: dict[str, list[int]] = {}
+    for index, line in enumerate(lines):
+        line_index.setdefault(line, []).append(index)
+
+    output: list[str] = []
+    cursor = 0
+    for expected, old_lines, new_lines in _parse_hunks(diff):
+        expected += line_offset
+        start = _locate_hunk(lines, line_index, old_lines, expected, cursor)
+        if start is None:
+            raise PatchApplyError(f"Hunk at line {expected + 1} does not apply.")
+        output.extend(lines[cursor:start])
+        output.extend(new_lines)
+        cursor = start + len(old_lines)
+    output.extend(lines[cursor:])
+
+    patched = newline.join(output)
+    if source.endswith(("\n", "\r")) and output:
+        patched += newline
+    return patched
+
+
+def _locate_hunk(
+    lines: list[str],
+    line_index: dict[str, list[int]],
+    old_lines: list[str],
+    expected: int,
+    cursor: int,
+) -> int | None:
+    def matches_at(start: int) -> bool:
+        return start >= cursor and lines[start : start + len(old_lines)] == old_lines
+
+    if not old_lines:
+        return min(max(expected, cursor), len(lines))
+    if 0 <= expected < len(lines) and matches_at(expected):
+        return expected
+
+    candidates = line_index.get(old_lines[0], [])
+    best: int | None = None
+    for start in candidates[bisect_left(candidates, cursor) :]:
+        if matches_at(start) and (best is None or abs(start - expected) < abs(best - expected)):
+            best = start
+        elif best is not None and start > expected:
+            break
+    return best
+
+
+def apply_fix_change(source: str, before: str, diff: str) -> str:
+    """Apply a fix diff, which is relative to its ``before`` snippet, to a whole file.
+
+    The snippet's first occurrence in ``source`` anchors the hunks, so repeated context
+    elsewhere in the file cannot capture them.
+    """
+
+    position = source.find(before) if before else -1
+    line_offset = source.count("\n", 0, position) if position >= 0 else 0
+    return apply_patch(source, diff, line_offset=line_offset)
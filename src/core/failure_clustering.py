@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+from src.core.metrics import metrics
+from src.models.diagnosis import Diagnosis
+from src.models.fixes import FixProposal
+
+_QUOTED = re.compile(r"'[^']*'|\"[^\"]*\"")
+_UUID = re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b")
+_HEX = re.compile(r"\b(?:0x)?[0-9a-f]{12,}\b")
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_error(message: str | None) -> str:
+    """Error text with literal values replaced, so failures differing only in data match."""
+
+    if not message:
+        return ""
+    text = message.lower()
+    text = _QUOTED.sub("<str>", text)
+    text = _UUID.sub("<id>", text)
+    text = _HEX.sub("<id>", text)
+    text = _NUMBER.sub("<num>", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+@dataclass(frozen=True)
+class FailureSignature:
+    subject: str
+    tool: str | None
+    path: str | None
+    error: str
+
+    @property
+    def fingerprint(self) -> str:
+        parts = (self.subject, self.tool or "", self.path or "", self.error)
+        return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def failure_signature(
+    failure_event: Mapping[str, Any], trace_record: Mapping[str, Any] | None = None
+) -> FailureSignature:
+    """Subject, tool, mismatch path and normalized error of a failure.
+
+    The first failing trace step is preferred; a ``ToolValidationError`` payload in
+    the failure event metadata fills in whatever the trace does not record.
+    """
+
+    steps = (trace_record or {}).get("steps") or []
+    failed_step = next(
+        (step for step in steps if isinstance(step, Mapping) and step.get("error")), None
+    )
+    step_input = failed_step.get("input") if failed_step else None
+    step_input = step_input if isinstance(step_input, Mapping) else {}
+
+    metadata = failure_event.get("metadata")
+    metadata = metadata if isinstance(metadata, Mapping) else {}
+    error_payload = metadata.get("error") if isinstance(metadata.get("error"), Mapping) else {}
+
+    tool = step_input.get("tool") or metadata.get("tool") or error_payload.get("tool")
+    path = None
+    for source in (step_input, metadata, error_payload):
+        details = source.get("details")
+        if isinstance(details, Mapping) and details.get("path") is not None:
+            path = str(details["path"])
+            break
+
+    error = failure_event.get("error") or (failed_step.get("error") if failed_step else None)
+    subject = failure_event.get("subject") or (trace_record or {}).get("subject") or ""
+    return FailureSignature(
+        subject=str(subject),
+        tool=str(tool) if tool else None,
+        path=path,
+        error=normalize_error(str(error) if error else None),
+    )
+
+
+@dataclass
+class FailureCluster:
+    """Failures sharing one signature, with the results their members can share.
+
+    Every member is analyzed on its own. The classification is shared between
+    members whose findings have the same ``findings_fingerprint``, and the fixes
+    between members with the same fingerprint and fix catalog version, so a catalog
+    reload recomputes them. Similar-failure links are never cached: each member
+    looks them up against the current fix history.
+    """
+
+    fingerprint: str
+    signature: FailureSignature
+    representative_failure_id: str
+    representative: dict[str, Any]
+    first_seen: str
+    last_seen: str
+    count: int = 0
+    # Each cache is one tuple, replaced whole, because stages run on separate threads.
+    _classification: tuple[str, Diagnosis] | None = field(default=None, repr=False)
+    _fixes: tuple[str, str, tuple[FixProposal, ...]] | None = field(default=None, repr=False)
+
+    @property
+    def diagnosis(self) -> Diagnosis | None:
+        """The shared classification, without similar-failure links."""
+
+        return self._classification[1] if self._classification else None
+
+    @property
+    def fixes(self) -> tuple[FixProposal, ...] | None:
+        return self._fixes[2] if self._fixes else None
+
+    def cached_classification(self, findings_fingerprint: str) -> Diagnosis | None:
+        cached = self._classification
+        return cached[1] if cached is not None and cached[0] == findings_fingerprint else None
+
+    def store_classification(self, findings_fingerprint: str, diagnosis: Diagnosis) -> Diagnosis:
+        classification = diagnosis.model_copy(update={"similar_past_failure_ids": []})
+        self._classification = (findings_fingerprint, classification)
+        return classification
+
+    def cached_fixes(
+        self, findings_fingerprint: str, catalog_version: str
+    ) -> tuple[FixProposal, ...] | None:
+        cached = self._fixes
+        if cached is None or cached[:2] != (findings_fingerprint, catalog_version):
+            return None
+        return cached[2]
+
+    def store_fixes(
+        self, findings_fingerprint: str, catalog_version: str, fixes: tuple[FixProposal, ...]
+    ) -> None:
+        self._fixes = (findings_fingerprint, catalog_version, fixes)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "fingerprint": self.fingerprint,
+            "subject": self.signature.subject,
+            "tool": self.signature.tool,
+            "path": self.signature.path,
+            "error": self.signature.error,
+            "count": self.count,
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen,
+            "representative_failure_id": self.representative_failure_id,
+            "root_cause": self.diagnosis.root_cause.value if self.diagnosis else None,
+        }
+
+
+class FailureClusterIndex:
+    """Assigns failures to clusters by fingerprint with one dict lookup per failure.
+
+    At most ``max_clusters`` clusters are kept; the one least recently assigned a
+    failure is evicted first.
+    """
+
+    def __init__(self, *, max_clusters: int = 4096) -> None:
+        if max_clusters < 1:
+            raise ValueError("max_clusters must be positive.")
+
+        self._max_clusters = max_clusters
+        self._clusters: OrderedDict[str, FailureCluster] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def assign(self, failure_id: str, stored_trace: Mapping[str, Any]) -> FailureCluster:
+        """Add one stored trace (``failure_event`` and ``trace_record``) to its cluster."""
+
+        failure_event = stored_trace.get("failure_event") or {}
+        trace_record = stored_trace.get("trace_record") or {}
+        signature = failure_signature(failure_event, trace_record)
+        fingerprint = signature.fingerprint
+        seen_at = str(
+            failure_event.get("timestamp")
+            or trace_record.get("ended_at")
+            or datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+        )
+
+        with self._lock:
+            cluster = self._clusters.get(fingerprint)
+            if cluster is None:
+                metrics.increment("clustering.new")
+                cluster = FailureCluster(
+                    fingerprint=fingerprint,
+                    signature=signature,
+                    representative_failure_id=failure_id,
+                    representative={
+                        "failure_event": dict(failure_event),
+                        "trace_record": trace_record,
+                    },
+                    first_seen=seen_at,
+                    last_seen=seen_at,
+                )
+                self._clusters[fingerprint] = cluster
+                while len(self._clusters) > self._max_clusters:
+                    self._clusters.popitem(last=False)
+                    metrics.increment("clustering.evict")
+            else:
+                metrics.increment("clustering.duplicate")
+                self._clusters.move_to_end(fingerprint)
+                cluster.first_seen = min(cluster.first_seen, seen_at)
+                cluster.last_seen = max(cluster.last_seen, seen_at)
+            cluster.count += 1
+        return cluster
+
+    def get(self, fingerprint: str) -> FailureCluster | None:
+        return self._clusters.get(fingerprint)
+
+    def clusters(self) -> list[FailureCluster]:
+        """All clusters, largest first."""
+
+        with self._lock:
+            clusters = list(self._clusters.values())
+        return sorted(clusters, key=lambda cluster: (-cluster.count, cluster.first_seen))
+
+    def __len__(self) -> int:
+        return len(self._clusters)
@@ -0,0 +1,377 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from itertools import product
+from pathlib import Path
+from string import Template
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+from src.core.diff_utils import unified_diff
+from src.core.metrics import metrics
+from src.models.diagnosis import Diagnosis, FailureTaxonomy
+from src.models.findings import FindingsReport, ToolFinding
+from src.models.fixes import FixChange, FixProposal, FixType
+
+DEFAULT_TEMPLATES_DIR = Path(__file__).resolve().parent / "fix_templates"
+TEMPLATE_PARAMETERS = ("root_cause", "sub_type", "subject", "tool", "arg_path")
+_TEMPLATE_SUFFIXES = (".yaml", ".yml", ".json")
+
+# (root_cause, sub_type, subject, tool); ``None`` scopes match any value.
+IndexKey = tuple[FailureTaxonomy, str | None, str | None, str | None]
+_DirectorySignature = tuple[tuple[str, int, int], ...]
+
+
+class FixChangeTemplate(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    file: str
+    change_type: str
+    before: str
+    after: str
+
+
+class FixTemplate(BaseModel):
+    """One catalog entry, as written in a ``fix_templates`` YAML or JSON file."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    id: str = Field(min_length=1)
+    root_cause: FailureTaxonomy
+    sub_type: str | None = None
+    subject: str | None = None
+    tool: str | None = None
+    priority: int = 0
+    fix_type: FixType
+    title: str
+    rationale: str
+    defaults: dict[str, str] = Field(default_factory=dict)
+    changes: tuple[FixChangeTemplate, ...] = ()
+
+
+@dataclass(frozen=True)
+class FixParameters:
+    """Values substituted into templates, taken from a diagnosis and its findings."""
+
+    root_cause: FailureTaxonomy
+    sub_type: str | None = None
+    subject: str | None = None
+    tool: str | None = None
+    arg_path: str | None = None
+
+    @classmethod
+    def from_diagnosis(
+        cls,
+        diagnosis: Diagnosis,
+        findings_report: FindingsReport | None = None,
+    ) -> FixParameters:
+        tool, arg_path = _offending_tool(findings_report) if findings_report else (None, None)
+        return cls(
+            root_cause=diagnosis.root_cause,
+            sub_type=diagnosis.sub_type,
+            subject=diagnosis.affected_subjects[0] if diagnosis.affected_subjects else None,
+            tool=tool,
+            arg_path=arg_path,
+        )
+
+    def as_mapping(self) -> dict[str, str]:
+        values = {
+            "root_cause": self.root_cause.value,
+            "sub_type": self.sub_type,
+            "subject": self.subject,
+            "tool": self.tool,
+            "arg_path": self.arg_path,
+        }
+        return {name: value for name, value in values.items() if value is not None}
+
+
+def _offending_tool(findings_report: FindingsReport) -> tuple[str | None, str | None]:
+    fallback_tool: str | None = None
+    for findings in findings_report.findings.values():
+        for finding in findings:
+            if not isinstance(finding, ToolFinding) or not finding.tool:
+                continue
+            mismatches = (finding.actual or {}).get("schema_mismatches") or []
+            for mismatch in mismatches:
+                if isinstance(mismatch, dict) and mismatch.get("path"):
+                    return finding.tool, str(mismatch["path"])
+            if finding.issue and fallback_tool is None:
+                fallback_tool = finding.tool
+    return fallback_tool, None
+
+
+class _CompiledTemplate:
+    """A template with its substitution slots parsed; static templates render once."""
+
+    __slots__ = ("template", "specificity", "parameters", "_static")
+
+    def __init__(self, template: FixTemplate) -> None:
+        self.template = template
+        self.specificity = sum(
+            scope is not None for scope in (template.sub_type, template.subject, template.tool)
+        )
+        texts = [template.title, template.rationale]
+        for change in template.changes:
+            texts.extend((change.file, change.before, change.after))
+
+        parameters: set[str] = set()
+        for text in texts:
+            parameters.update(Template(text).get_identifiers())
+        unknown = parameters.difference(TEMPLATE_PARAMETERS)
+        if unknown:
+            raise ValueError(
+                f"Fix template '{template.id}' uses unknown parameters: {sorted(unknown)}."
+            )
+        self.parameters = frozenset(parameters)
+        self._static: FixProposal | None = None
+
+    def render(self, parameters: FixParameters) -> FixProposal:
+        if not self.parameters:
+            # Static templates render identically for every diagnosis; keep the first one.
+            if self._static is None:
+                self._static = self._render({})
+            return self._static
+        values = {**self.template.defaults, **parameters.as_mapping()}
+        return self._render(values)
+
+    def _render(self, values: dict[str, str]) -> FixProposal:
+        def fill(text: str) -> str:
+            return Template(text).safe_substitute(values)
+
+        changes: list[FixChange] = []
+        for change in self.template.changes:
+            file_path = fill(change.file)
+            before = fill(change.before)
+            after = fill(change.after)
+            with metrics.timer("fix.diff"):
+                diff = unified_diff(before, after, file_path=file_path)
+            changes.append(
+                FixChange(
+                    file=file_path,
+                    change_type=change.change_type,
+                    before=before,
+                    after=after,
+                    diff=diff,
+                )
+            )
+
+        return FixProposal(
+            fix_type=self.template.fix_type,
+            title=fill(self.template.title),
+            rationale=fill(self.template.rationale),
+            changes=tuple(changes),
+        )
+
+
+@dataclass(frozen=True)
+class _CatalogSnapshot:
+    version: str
+    templates: tuple[FixTemplate, ...]
+    index: dict[IndexKey, tuple[_CompiledTemplate, ...]]
+
+
+def _read_template_file(path: Path) -> list[dict[str, Any]]:
+    text = path.read_text(encoding="utf-8")
+    if path.suffix == ".json":
+        data = json.loads(text)
+    else:
+        import yaml
+
+        data = yaml.safe_load(text)
+
+    if isinstance(data, dict):
+        data = data.get("templates")
+    if not isinstance(data, list):
+        raise ValueError("expected a 'templates' list")
+    return data
+
+
+def _compile(templates: list[FixTemplate]) -> _CatalogSnapshot:
+    seen: set[str] = set()
+    buckets: dict[IndexKey, list[_CompiledTemplate]] = {}
+    for template in templates:
+        if template.id in seen:
+            raise ValueError(f"Duplicate fix template id '{template.id}'.")
+        seen.add(template.id)
+        key = (template.root_cause, template.sub_type, template.subject, template.tool)
+        buckets.setdefault(key, []).append(_CompiledTemplate(template))
+
+    index = {
+        key: tuple(sorted(bucket, key=lambda item: (-item.template.priority, item.template.id)))
+        for key, bucket in buckets.items()
+    }
+    canonical = json.dumps(
+        [template.model_dump(mode="json") for template in templates],
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return _CatalogSnapshot(
+        version=hashlib.sha256(canonical.encode("utf-8")).hexdigest(),
+        templates=tuple(templates),
+        index=index,
+    )
+
+
+class FixCatalog:
+    """Declarative fix templates compiled into a lookup table keyed by scope.
+
+    Each file in ``templates_dir`` (``*.yaml``, ``*.yml`` or ``*.json``) holds a
+    ``templates`` list. Lookups probe the eight scope combinations of a diagnosis, so
+    their cost does not grow with the catalog. Reloads compile a new table and swap it
+    in atomically; a file that fails to parse keeps the previous catalog live.
+    """
+
+    def __init__(self, templates_dir: Path | None = None) -> None:
+        self._templates_dir = templates_dir or DEFAULT_TEMPLATES_DIR
+        self._write_lock = threading.Lock()
+        self._snapshot = _compile([])
+        self._signature: _DirectorySignature = ()
+        self._watch_stop: threading.Event | None = None
+        self._watch_thread: threading.Thread | None = None
+
+        self._load(strict=True)
+
+    @classmethod
+    def from_templates(cls, templates: list[FixTemplate | dict[str, Any]]) -> FixCatalog:
+        """Build a catalog from in-memory templates, without a backing directory."""
+
+        catalog = cls.__new__(cls)
+        catalog._templates_dir = None
+        catalog._write_lock = threading.Lock()
+        catalog._signature = ()
+        catalog._watch_stop = None
+        catalog._watch_thread = None
+        catalog._snapshot = _compile([FixTemplate.model_validate(item) for item in templates])
+        return catalog
+
+    @property
+    def version(self) -> str:
+        """Digest of every loaded template; changes whenever the catalog content does."""
+
+        return self._snapshot.version
+
+    def templates(self) -> tuple[FixTemplate, ...]:
+        return self._snapshot.templates
+
+    def _template_paths(self) -> list[Path]:
+        if self._templates_dir is None:
+            return []
+        return sorted(
+            path for path in self._templates_dir.iterdir() if path.suffix in _TEMPLATE_SUFFIXES
+        )
+
+    def _directory_signature(self) -> _DirectorySignature:
+        signature: list[tuple[str, int, int]] = []
+        for path in self._template_paths():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            signature.append((path.name, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def _load(self, *, strict: bool) -> bool:
+        templates: list[FixTemplate] = []
+        try:
+            # A missing or unreadable directory keeps the last good catalog.
+            signature = self._directory_signature()
+            for path in self._template_paths():
+                try:
+                    templates.extend(
+                        FixTemplate.model_validate(item) for item in _read_template_file(path)
+                    )
+                except (OSError, ValueError, ValidationError) as error:
+                    raise ValueError(f"Invalid fix template file {path}: {error}") from error
+            snapshot = _compile(templates)
+        except (OSError, ValueError):
+            if strict:
+                raise
+            return False
+
+        with self._write_lock:
+            changed = snapshot.version != self._snapshot.version
+            self._snapshot = snapshot
+            self._signature = signature
+        return changed
+
+    def reload(self) -> bool:
+        """Re-read the template directory; returns whether the catalog changed."""
+
+        return self._load(strict=False)
+
+    def watch(self, interval_s: float = 1.0) -> None:
+        """Poll the template directory in a daemon thread and reload on change."""
+
+        if interval_s <= 0:
+            raise ValueError("interval_s must be positive.")
+        if self._templates_dir is None:
+            raise ValueError("An in-memory catalog has no directory to watch.")
+        if self._watch_thread is not None and self._watch_thread.is_alive():
+            return
+
+        stop_event = threading.Event()
+
+        def _poll() -> None:
+            while not stop_event.wait(interval_s):
+                try:
+                    changed = self._directory_signature() != self._signature
+                except OSError:
+                    # Keep polling until the directory is back.
+                    continue
+                if changed:
+                    self.reload()
+
+        self._watch_stop = stop_event
+        self._watch_thread = threading.Thread(target=_poll, name="fix-catalog-watch", daemon=True)
+        self._watch_thread.start()
+
+    def stop_watching(self) -> None:
+        if self._watch_stop is not None:
+            self._watch_stop.set()
+        if self._watch_thread is not None:
+            self._watch_thread.join()
+        self._watch_stop = None
+        self._watch_thread = None
+
+    def lookup(self, parameters: FixParameters) -> list[FixTemplate]:
+        """Matching templates, most specific first, then by descending priority."""
+
+        return [compiled.template for compiled in self._ranked(self._snapshot, parameters)]
+
+    def proposals(self, parameters: FixParameters) -> list[FixProposal]:
+        """Ranked proposals with ``parameters`` substituted into each template."""
+
+        return [
+            compiled.render(parameters) for compiled in self._ranked(self._snapshot, parameters)
+        ]
+
+    @staticmethod
+    def _ranked(snapshot: _CatalogSnapshot, parameters: FixParameters) -> list[_CompiledTemplate]:
+        matches: list[_CompiledTemplate] = []
+        for sub_type, subject, tool in product(
+            {parameters.sub_type, None}, {parameters.subject, None}, {parameters.tool, None}
+        ):
+            matches.extend(snapshot.index.get((parameters.root_cause, sub_type, subject, tool), ()))
+        matches.sort(
+            key=lambda item: (-item.specificity, -item.template.priority, item.template.id)
+        )
+        return matches
+
+
+_DEFAULT_CATALOG: FixCatalog | None = None
+_DEFAULT_CATALOG_LOCK = threading.Lock()
+
+
+def default_catalog() -> FixCatalog:
+    """The process-wide catalog loaded from ``src/core/fix_templates``."""
+
+    global _DEFAULT_CATALOG
+    if _DEFAULT_CATALOG is None:
+        with _DEFAULT_CATALOG_LOCK:
+            if _DEFAULT_CATALOG is None:
+                _DEFAULT_CATALOG = FixCatalog()
+    return _DEFAULT_CATALOG
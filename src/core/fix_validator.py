@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import importlib.util
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from types import ModuleType, TracebackType
+from typing import Any
+
+from src.core.diff_utils import PatchApplyError, apply_fix_change
+from src.models.fixes import FixChange, FixProposal, FixValidationResult
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SCENARIO_MODULE = "src.subjects.run_subjects"
+# Imported once by the fork server; every worker forks from that warm interpreter.
+_WORKER_PRELOAD = ["src.core.failure_detector", SCENARIO_MODULE]
+
+ValidationJob = tuple[str, dict[str, Any], str, float]
+
+# In-process validations swap global ``sys.modules`` entries, so they run one at a time.
+_IN_PROCESS_LOCK = threading.Lock()
+
+
+class FixApplyError(ValueError):
+    """A fix change does not apply to the current source tree."""
+
+
+def apply_change(source: str, change: FixChange) -> str:
+    """Apply ``change.diff`` to the current file, checking every hunk against it."""
+
+    try:
+        return apply_fix_change(source, change.before, change.diff)
+    except PatchApplyError as error:
+        raise FixApplyError(
+            f"Change '{change.change_type}' does not apply to {change.file}: {error}"
+        ) from error
+
+
+def _module_name(file_path: str) -> str:
+    path = Path(file_path)
+    if path.is_absolute() or ".." in path.parts or path.suffix != ".py":
+        raise FixApplyError(f"Fix targets '{file_path}', which is not a module in the repository.")
+    return ".".join(path.with_suffix("").parts)
+
+
+def _patched_sources(changes: Iterable[FixChange], root: Path) -> dict[str, str]:
+    sources: dict[str, str] = {}
+    for change in changes:
+        _module_name(change.file)
+        current = sources.get(change.file)
+        if current is None:
+            current = (root / change.file).read_text(encoding="utf-8")
+        sources[change.file] = apply_change(current, change)
+    return sources
+
+
+def _load_module(name: str, path: Path) -> ModuleType:
+    spec = importlib.util.spec_from_file_location(name, path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load module '{name}' from {path}.")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@contextmanager
+def _swapped_modules(patched: dict[str, Path], root: Path) -> Iterator[ModuleType]:
+    """Load patched modules and a fresh scenario module, then restore ``sys.modules``.
+
+    The scenario module is always re-executed so its ``from ... import`` bindings
+    resolve to the patched modules rather than the ones imported at startup.
+    """
+
+    names = set(patched) | {SCENARIO_MODULE}
+    saved = {name: sys.modules.get(name) for name in names}
+    try:
+        for name in names:
+            sys.modules.pop(name, None)
+        for name in sorted(patched):
+            if name != SCENARIO_MODULE:
+                _load_module(name, patched[name])
+        scenario_path = patched.get(SCENARIO_MODULE) or root.joinpath(
+            *SCENARIO_MODULE.split(".")
+        ).with_suffix(".py")
+        yield _load_module(SCENARIO_MODULE, scenario_path)
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+
+def _validate_job(job: ValidationJob) -> dict[str, Any]:
+    """Worker entry point: apply one proposal in a scratch copy and replay its subject."""
+
+    from src.core.failure_detector import run_with_failure_detection
+
+    subject, proposal_payload, root_path, timeout_s = job
+    proposal = FixProposal.model_validate(proposal_payload)
+    root = Path(root_path)
+    started = time.perf_counter()
+    outcome: dict[str, Any] = {"subject": subject, "fix_title": proposal.title}
+
+    def finish(**fields: Any) -> dict[str, Any]:
+        duration_ms = round((time.perf_counter() - started) * 1000.0, 3)
+        return {**outcome, **fields, "duration_ms": duration_ms}
+
+    try:
+        sources = _patched_sources(proposal.changes, root)
+    except (OSError, FixApplyError) as error:
+        return finish(passed=False, applied=False, error=str(error))
+
+    with tempfile.TemporaryDirectory(prefix="indagine-fix-") as scratch:
+        patched: dict[str, Path] = {}
+        for file_path, source in sources.items():
+            target = Path(scratch) / file_path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(source, encoding="utf-8")
+            patched[_module_name(file_path)] = target
+
+        try:
+            with _swapped_modules(patched, root) as scenario:
+                failure_event, trace_record = run_with_failure_detection(
+                    subject,
+                    lambda: scenario.run_subject_scenario(subject),
+                    timeout_s=timeout_s,
+                )
+        except Exception as error:
+            # The patched module itself failed to import.
+            return finish(
+                passed=False,
+                applied=True,
+                status="failed",
+                failure_type="exception",
+                error=f"{type(error).__name__}: {error}",
+            )
+
+    return finish(
+        passed=failure_event.failure_type == "none",
+        applied=True,
+        status=trace_record["status"],
+        failure_type=failure_event.failure_type,
+        error=failure_event.error or None,
+    )
+
+
+def _process_context() -> multiprocessing.context.BaseContext:
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(_WORKER_PRELOAD)
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def _warm_worker() -> None:
+    for module_name in _WORKER_PRELOAD:
+        importlib.import_module(module_name)
+
+
+class FixValidator:
+    """Check each fix proposal by replaying its subject with the fix applied.
+
+    Every proposal's changes are applied to scratch copies of the target modules, which
+    are swapped into ``sys.modules`` while the subject scenario runs under
+    ``run_with_failure_detection``. With ``max_workers > 1`` every validation, even a
+    single one, runs in a persistent pool of worker processes forked from one preloaded
+    interpreter, so patched code never runs in the calling process. Close the validator
+    (or use it as a context manager) to shut the pool down.
+
+    ``max_workers=1`` validates in the calling process, one validation at a time. While
+    it runs, any other thread importing the patched modules sees the patched copies, so
+    it is unsafe inside threaded callers such as ``InvestigationPipeline``.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int | None = None,
+        timeout_s: float = 5.0,
+        root: Path | None = None,
+    ) -> None:
+        # The default always uses the pool, even on a single core.
+        workers = max_workers if max_workers is not None else max(2, os.cpu_count() or 1)
+        if workers < 1 or timeout_s <= 0:
+            raise ValueError("max_workers and timeout_s must be positive.")
+
+        self._max_workers = workers
+        self._timeout_s = timeout_s
+        self._root = root or REPO_ROOT
+        self._pool: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> FixValidator:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def validate(self, subject: str, proposal: FixProposal) -> FixValidationResult:
+        return self.validate_many([(subject, proposal)])[0]
+
+    def validate_many(self, items: Iterable[tuple[str, FixProposal]]) -> list[FixValidationResult]:
+        """Validate ``(subject, proposal)`` pairs, returning results in input order."""
+
+        root = str(self._root)
+        jobs: list[ValidationJob] = [
+            (subject, proposal.model_dump(mode="json"), root, self._timeout_s)
+            for subject, proposal in items
+        ]
+        if not jobs:
+            return []
+        if self._max_workers > 1:
+            chunksize = max(1, len(jobs) // (self._max_workers * 4))
+            outcomes = list(self._worker_pool().map(_validate_job, jobs, chunksize=chunksize))
+        else:
+            with _IN_PROCESS_LOCK:
+                outcomes = [_validate_job(job) for job in jobs]
+
+        return [FixValidationResult.model_validate(outcome) for outcome in outcomes]
+
+    def _worker_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                mp_context=_process_context(),
+                initializer=_warm_worker,
+            )
+        return self._pool
+
+
+def validate_fixes(
+    items: Iterable[tuple[str, FixProposal]],
+    *,
+    max_workers: int | None = None,
+    timeout_s: float = 5.0,
+) -> list[FixValidationResult]:
+    with FixValidator(max_workers=max_workers, timeout_s=timeout_s) as validator:
+        return validator.validate_many(items)
@@ -5,13 +5,15 @@ from typing import Any, Callable, Literal
 
 from src.analyzers.trace_analyzer import TraceAnalyzer
 from src.analyzers.tool_analyzer import ToolAnalyzer
+from src.core.metrics import metrics
+from src.models.compact_trace import CompactTrace
 from src.models.findings import FindingsReport, ToolFinding, TraceFinding
 from src.models.trace import TraceRecord
 
 
 ExecutionMode = Literal["sequential", "parallel"]
 AnalyzerResult = TraceFinding | ToolFinding
-AnalyzerFn = Callable[[TraceRecord | dict[str, Any]], AnalyzerResult]
+AnalyzerFn = Callable[[TraceRecord | CompactTrace | dict[str, Any]], AnalyzerResult]
 
 
 class IndagineController:
@@ -32,12 +34,34 @@ class IndagineController:
             ("tool_analyzer", self._tool_analyzer.analyze),
         )
 
-    def run_indagine(self, trace_record: TraceRecord | dict[str, Any]) -> FindingsReport:
-        findings = self._run_analyzers(trace_record)
-        return FindingsReport(findings=findings)
+    def analysis_fingerprint(self) -> str:
+        """Describe the analyzer and schema versions that shape this controller's findings."""
+
+        return "|".join(
+            (
+                f"trace_analyzer={self._trace_analyzer.version_key()}",
+                f"tool_analyzer={self._tool_analyzer.version_key()}",
+            )
+        )
+
+    def run_indagine(
+        self, trace_record: TraceRecord | CompactTrace | dict[str, Any]
+    ) -> FindingsReport:
+        with metrics.timer("controller.run_indagine"):
+            findings = self._run_analyzers(trace_record)
+            return FindingsReport(findings=findings)
+
+    def _call_analyzer(
+        self,
+        analyzer_name: str,
+        analyze: AnalyzerFn,
+        trace_record: TraceRecord | CompactTrace | dict[str, Any],
+    ) -> AnalyzerResult:
+        with metrics.timer(f"analyzer.{analyzer_name}"):
+            return analyze(trace_record)
 
     def _run_analyzers(
-        self, trace_record: TraceRecord | dict[str, Any]
+        self, trace_record: TraceRecord | CompactTrace | dict[str, Any]
     ) -> dict[str, list[AnalyzerResult]]:
         if self._execution_mode == "parallel":
             return self._run_parallel(trace_record)
@@ -45,21 +69,23 @@ class IndagineController:
         return self._run_sequential(trace_record)
 
     def _run_sequential(
-        self, trace_record: TraceRecord | dict[str, Any]
+        self, trace_record: TraceRecord | CompactTrace | dict[str, Any]
     ) -> dict[str, list[AnalyzerResult]]:
         findings: dict[str, list[AnalyzerResult]] = {}
         for analyzer_name, analyze in self._analyzers:
-            findings[analyzer_name] = [analyze(trace_record)]
+            findings[analyzer_name] = [self._call_analyzer(analyzer_name, analyze, trace_record)]
 
         return findings
 
     def _run_parallel(
-        self, trace_record: TraceRecord | dict[str, Any]
+        self, trace_record: TraceRecord | CompactTrace | dict[str, Any]
     ) -> dict[str, list[AnalyzerResult]]:
         findings: dict[str, list[AnalyzerResult]] = {}
         with ThreadPoolExecutor(max_workers=len(self._analyzers)) as pool:
             futures = {
-                analyzer_name: pool.submit(analyze, trace_record)
+                analyzer_name: pool.submit(
+                    self._call_analyzer, analyzer_name, analyze, trace_record
+                )
                 for analyzer_name, analyze in self._analyzers
             }
             for analyzer_name, _ in self._analyzers:
@@ -69,7 +95,7 @@ class IndagineController:
 
 
 def run_indagine(
-    trace_record: TraceRecord | dict[str, Any],
+    trace_record: TraceRecord | CompactTrace | dict[str, Any],
     execution_mode: ExecutionMode = "sequential",
 ) -> FindingsReport:
     return IndagineController(execution_mode=execution_mode).run_indagine(trace_record)
@@ -1,9 +1,19 @@
 from __future__ import annotations
 
+import hashlib
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
 from typing import Any, Protocol
 
 from src.core.indagine_controller import IndagineController
+from src.core.metrics import metrics
+from src.core.profiling import InvestigationProfiler, profiled
+from src.models.compact_trace import CompactTrace
 from src.models.findings import FindingsReport
+from src.storage.serialization import canonical_dumps
 from src.storage.trace_store import StoreBackend, TraceStore
 
 
@@ -11,24 +21,151 @@ class TraceStoreLike(Protocol):
     def get_trace(self, failure_id: str) -> dict[str, Any]: ...
 
 
+@dataclass
+class FindingsCacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def findings_cache_key(trace_record: dict[str, Any], analysis_fingerprint: str) -> str:
+    """Content hash of a trace record plus the analyzer and schema versions."""
+
+    digest = hashlib.sha256(canonical_dumps(trace_record))
+    digest.update(b"\0")
+    digest.update(analysis_fingerprint.encode("utf-8"))
+    return digest.hexdigest()
+
+
 class IndaginePipeline:
     def __init__(
         self,
         trace_store: TraceStoreLike,
         controller: IndagineController | None = None,
+        *,
+        use_findings_cache: bool = True,
+        read_batch_size: int = 25,
+        read_ahead: int = 8,
+        max_concurrency: int = 4,
+        profiler: InvestigationProfiler | None = None,
     ) -> None:
+        if read_batch_size < 1 or read_ahead < 1 or max_concurrency < 1:
+            raise ValueError("read_batch_size, read_ahead and max_concurrency must be positive.")
+
         self._trace_store = trace_store
         self._controller = controller or IndagineController()
+        self._use_findings_cache = use_findings_cache and callable(
+            getattr(trace_store, "store_findings", None)
+        )
+        self.cache_stats = FindingsCacheStats()
+        self._profiler = profiler or InvestigationProfiler.from_env()
+        self._read_ahead = read_ahead
+        self._max_concurrency = max_concurrency
+        # Stores without a batch read fall back to one concurrent point read per request.
+        self._get_traces = getattr(trace_store, "get_traces", None)
+        self._read_batch_size = read_batch_size if callable(self._get_traces) else 1
 
     def run(self, failure_id: str) -> FindingsReport:
-        stored_trace = self._trace_store.get_trace(failure_id)
+        return self.analyze_stored_trace(failure_id, self._trace_store.get_trace(failure_id))
+
+    def analyze_stored_trace(self, failure_id: str, stored_trace: dict[str, Any]) -> FindingsReport:
+        """Analyze a payload already returned by ``TraceStore.get_trace``."""
+
+        with profiled(self._profiler, "analyze", failure_id):
+            return self._analyze_stored_trace(failure_id, stored_trace)
+
+    def _analyze_stored_trace(
+        self, failure_id: str, stored_trace: dict[str, Any]
+    ) -> FindingsReport:
         trace_record = stored_trace.get("trace_record")
         if not isinstance(trace_record, dict):
             raise ValueError(
                 "TraceStore.get_trace must return a payload with a dictionary 'trace_record'."
             )
 
-        return self._controller.run_indagine(trace_record)
+        if not self._use_findings_cache:
+            return self._run_controller(trace_record)
+
+        with metrics.timer("pipeline.cache_key"):
+            cache_key = findings_cache_key(trace_record, self._controller.analysis_fingerprint())
+        cached = stored_trace.get("findings_cache")
+        # A compacted trace no longer has the step outputs its findings came from.
+        if isinstance(cached, dict) and (
+            cached.get("key") == cache_key or stored_trace.get("compacted")
+        ):
+            self.cache_stats.hits += 1
+            metrics.increment("pipeline.findings_cache.hits")
+            with metrics.timer("pipeline.cache_validate"):
+                return FindingsReport.model_validate(cached.get("findings"))
+
+        self.cache_stats.misses += 1
+        metrics.increment("pipeline.findings_cache.misses")
+        findings_report = self._run_controller(trace_record)
+        with metrics.timer("pipeline.store_findings"):
+            self._trace_store.store_findings(failure_id, cache_key, findings_report)
+        return findings_report
+
+    def _run_controller(self, trace_record: dict[str, Any]) -> FindingsReport:
+        # Stored traces are freshly decoded per read, so the compact form can share
+        # their payload dicts, and the analyzers skip per-analyzer validation.
+        with metrics.timer("pipeline.compact"):
+            compact = CompactTrace.from_wire(trace_record)
+        return self._controller.run_indagine(compact)
+
+    def run_many(self, failure_ids: Iterable[str]) -> dict[str, FindingsReport]:
+        """Analyze a backlog, recomputing only traces whose cached findings are stale."""
+
+        return dict(self.iter_many(failure_ids))
+
+    def iter_many(self, failure_ids: Iterable[str]) -> Iterator[tuple[str, FindingsReport]]:
+        """Yield findings in input order while later traces are still being read."""
+
+        for failure_id, stored_trace in self.prefetch(failure_ids):
+            yield failure_id, self.analyze_stored_trace(failure_id, stored_trace)
+
+    def prefetch(self, failure_ids: Iterable[str]) -> Iterator[tuple[str, dict[str, Any]]]:
+        """Read traces in batches ahead of the consumer, keeping input order.
+
+        At most ``read_ahead`` batches of ``read_batch_size`` ids are in flight on
+        ``max_concurrency`` reader threads, so memory stays bounded on long streams.
+        """
+
+        pending_ids = iter(failure_ids)
+        in_flight: deque[tuple[list[str], Future[dict[str, dict[str, Any]]]]] = deque()
+
+        with ThreadPoolExecutor(
+            max_workers=self._max_concurrency, thread_name_prefix="indagine-prefetch"
+        ) as pool:
+            while True:
+                while len(in_flight) < self._read_ahead:
+                    batch = list(islice(pending_ids, self._read_batch_size))
+                    if not batch:
+                        break
+                    in_flight.append((batch, pool.submit(self._read_batch, batch)))
+
+                if not in_flight:
+                    return
+
+                batch, future = in_flight.popleft()
+                stored_traces = future.result()
+                for failure_id in batch:
+                    if failure_id not in stored_traces:
+                        raise KeyError(f"Trace '{failure_id}' not found.")
+                    yield failure_id, stored_traces[failure_id]
+
+    def _read_batch(self, failure_ids: list[str]) -> dict[str, dict[str, Any]]:
+        metrics.increment("pipeline.traces_fetched", len(failure_ids))
+        with metrics.timer("pipeline.fetch_batch"):
+            if callable(self._get_traces):
+                return self._get_traces(failure_ids)
+
+            return {
+                failure_id: self._trace_store.get_trace(failure_id) for failure_id in failure_ids
+            }
 
 
 def create_trace_store(backend: StoreBackend = "auto") -> TraceStore:
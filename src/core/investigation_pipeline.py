@@ -0,0 +1,367 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field, replace
+from typing import Any, Protocol
+
+from src.core.diagnosis_engine import DiagnosisEngine
+from src.core.failure_clustering import FailureCluster, FailureClusterIndex
+from src.core.fix_generator import FixGenerator
+from src.core.fix_validator import FixValidator
+from src.core.indagine_controller import IndagineController
+from src.core.indagine_pipeline import IndaginePipeline, TraceStoreLike
+from src.core.profiling import InvestigationProfiler
+from src.models.diagnosis import Diagnosis
+from src.models.findings import FindingsReport
+from src.models.fixes import FixProposal, FixValidationResult
+from src.storage.fix_history_memory import FixHistoryEntry, InMemoryFixHistory
+
+
+STAGE_NAMES = ("fetch", "analyze", "diagnose", "fix", "validate", "persist")
+
+
+class _FixHistoryStore(Protocol):
+    def find_similar(
+        self,
+        diagnosis: Diagnosis | dict[str, Any],
+        findings_report: FindingsReport | dict[str, Any],
+        *,
+        limit: int = 5,
+    ) -> list[str]: ...
+
+    def record_batch(self, entries: Iterable[FixHistoryEntry]) -> None: ...
+
+
+@dataclass(frozen=True)
+class InvestigationResult:
+    failure_id: str
+    failure_event: dict[str, Any]
+    trace_record: dict[str, Any]
+    findings: FindingsReport
+    diagnosis: Diagnosis | None = None
+    fixes: tuple[FixProposal, ...] = ()
+    fix_validations: tuple[FixValidationResult, ...] = ()
+    cluster: FailureCluster | None = None
+    findings_fingerprint: str | None = None
+
+
+@dataclass
+class StageMetrics:
+    name: str
+    items: int = 0
+    busy_s: float = 0.0
+    first_started: float | None = None
+    last_finished: float | None = None
+
+    def record(self, started: float, finished: float, items: int = 1) -> None:
+        self.items += items
+        self.busy_s += finished - started
+        if self.first_started is None:
+            self.first_started = started
+        self.last_finished = finished
+
+    @property
+    def wall_s(self) -> float:
+        if self.first_started is None or self.last_finished is None:
+            return 0.0
+        return self.last_finished - self.first_started
+
+    @property
+    def throughput_per_s(self) -> float:
+        return self.items / self.wall_s if self.wall_s > 0 else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "stage": self.name,
+            "items": self.items,
+            "busy_s": round(self.busy_s, 6),
+            "wall_s": round(self.wall_s, 6),
+            "throughput_per_s": round(self.throughput_per_s, 3),
+        }
+
+
+@dataclass
+class _StageFailure:
+    error: BaseException
+
+
+_DONE = object()
+
+
+@dataclass
+class _RunState:
+    stop: threading.Event = field(default_factory=threading.Event)
+    threads: list[threading.Thread] = field(default_factory=list)
+
+
+class InvestigationPipeline:
+    """Stream failure_ids through fetch, analyze, diagnose, fix and persist stages.
+
+    Stages run in their own threads connected by bounded queues, so a slow stage
+    back-pressures the ones before it. Traces are prefetched in concurrent batched
+    reads (see ``IndaginePipeline.prefetch``) and diagnoses and fixes are written to the fix history in batches.
+    With a ``fix_validator``, each persist batch's fixes are first replayed against their
+    subject (see ``FixValidator``) and the outcomes attached as ``fix_validations``; use a
+    validator with ``max_workers > 1`` so patched modules never load in these threads.
+    With ``failure_clusters``, failures are fingerprinted on arrival and analysis,
+    diagnosis and fix generation run once per cluster (see ``FailureClusterIndex``).
+    """
+
+    def __init__(
+        self,
+        trace_store: TraceStoreLike,
+        *,
+        controller: IndagineController | None = None,
+        fix_history: _FixHistoryStore | None = None,
+        diagnosis_engine: DiagnosisEngine | None = None,
+        fix_generator: FixGenerator | None = None,
+        fetch_concurrency: int = 8,
+        queue_size: int = 32,
+        persist_batch_size: int = 25,
+        profiler: InvestigationProfiler | None = None,
+        fix_validator: FixValidator | None = None,
+        failure_clusters: FailureClusterIndex | None = None,
+    ) -> None:
+        if fetch_concurrency < 1 or queue_size < 1 or persist_batch_size < 1:
+            raise ValueError(
+                "fetch_concurrency, queue_size and persist_batch_size must be positive."
+            )
+
+        self._indagine = IndaginePipeline(
+            trace_store=trace_store,
+            controller=controller,
+            read_ahead=max(1, queue_size // 4),
+            max_concurrency=fetch_concurrency,
+            profiler=profiler,
+        )
+        self._fix_history: _FixHistoryStore = fix_history or InMemoryFixHistory()
+        self._diagnosis_engine = diagnosis_engine or DiagnosisEngine(
+            fix_history=self._fix_history, profiler=profiler
+        )
+        self._fix_generator = fix_generator or FixGenerator()
+        self._fix_validator = fix_validator
+        self._failure_clusters = failure_clusters
+        self._queue_size = queue_size
+        self._persist_batch_size = persist_batch_size
+        self.stage_metrics: dict[str, StageMetrics] = {}
+
+    def run(self, failure_ids: Iterable[str]) -> Iterator[InvestigationResult]:
+        """Yield one result per failure_id, in input order, once it has been persisted.
+
+        The first error raised by any stage stops every stage and is re-raised here.
+        """
+
+        self.stage_metrics = {
+            name: StageMetrics(name)
+            for name in STAGE_NAMES
+            if name != "validate" or self._fix_validator is not None
+        }
+        state = _RunState()
+        fetched: queue.Queue[Any] = queue.Queue(maxsize=self._queue_size)
+        analyzed: queue.Queue[Any] = queue.Queue(maxsize=self._queue_size)
+        diagnosed: queue.Queue[Any] = queue.Queue(maxsize=self._queue_size)
+        completed: queue.Queue[Any] = queue.Queue(maxsize=self._queue_size)
+
+        self._start(state, "fetch", self._fetch_stage, iter(failure_ids), fetched)
+        self._start(state, "analyze", self._map_stage, "analyze", self._analyze, fetched, analyzed)
+        self._start(
+            state, "diagnose", self._map_stage, "diagnose", self._diagnose, analyzed, diagnosed
+        )
+        self._start(state, "fix", self._map_stage, "fix", self._fix, diagnosed, completed)
+
+        try:
+            batch: list[InvestigationResult] = []
+            while True:
+                item = self._get(state, completed)
+                if isinstance(item, _StageFailure):
+                    raise item.error
+                if item is _DONE:
+                    break
+
+                batch.append(item)
+                if len(batch) >= self._persist_batch_size:
+                    yield from self._persist(batch)
+                    batch = []
+
+            if batch:
+                yield from self._persist(batch)
+        finally:
+            state.stop.set()
+            for thread in state.threads:
+                thread.join()
+
+    def _start(self, state: _RunState, name: str, target: Callable[..., None], *args: Any) -> None:
+        thread = threading.Thread(
+            target=target, args=(state, *args), name=f"investigation-{name}", daemon=True
+        )
+        state.threads.append(thread)
+        thread.start()
+
+    def _put(self, state: _RunState, outbox: queue.Queue[Any], item: Any) -> bool:
+        while not state.stop.is_set():
+            try:
+                outbox.put(item, timeout=0.05)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, state: _RunState, inbox: queue.Queue[Any]) -> Any:
+        while not state.stop.is_set():
+            try:
+                return inbox.get(timeout=0.05)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _fetch_stage(
+        self, state: _RunState, failure_ids: Iterator[str], outbox: queue.Queue[Any]
+    ) -> None:
+        metrics = self.stage_metrics["fetch"]
+        stored_traces = self._indagine.prefetch(failure_ids)
+        try:
+            while not state.stop.is_set():
+                started = time.perf_counter()
+                item = next(stored_traces, None)
+                if item is None:
+                    break
+                metrics.record(started, time.perf_counter())
+                if not self._put(state, outbox, item):
+                    return
+        except BaseException as exc:
+            self._put(state, outbox, _StageFailure(exc))
+            return
+        finally:
+            stored_traces.close()
+
+        self._put(state, outbox, _DONE)
+
+    def _map_stage(
+        self,
+        state: _RunState,
+        name: str,
+        fn: Callable[[Any], Any],
+        inbox: queue.Queue[Any],
+        outbox: queue.Queue[Any],
+    ) -> None:
+        metrics = self.stage_metrics[name]
+        while True:
+            item = self._get(state, inbox)
+            if item is _DONE or isinstance(item, _StageFailure):
+                self._put(state, outbox, item)
+                return
+
+            started = time.perf_counter()
+            try:
+                result = fn(item)
+            except BaseException as exc:
+                self._put(state, outbox, _StageFailure(exc))
+                return
+            metrics.record(started, time.perf_counter())
+
+            if not self._put(state, outbox, result):
+                return
+
+    # With failure clusters, every member is analyzed on its own, and the diagnose and
+    # fix stages reuse the result cached on the cluster for members whose findings
+    # have the same fingerprint (see ``FailureCluster``). Every stage is a single
+    # thread consuming in order, so the first member of a cluster fills the cache
+    # before the next member reaches that stage.
+    def _analyze(self, item: tuple[str, dict[str, Any]]) -> InvestigationResult:
+        failure_id, stored_trace = item
+        cluster = None
+        if self._failure_clusters is not None:
+            cluster = self._failure_clusters.assign(failure_id, stored_trace)
+
+        findings = self._indagine.analyze_stored_trace(failure_id, stored_trace)
+        return InvestigationResult(
+            failure_id=failure_id,
+            failure_event=dict(stored_trace.get("failure_event") or {}),
+            trace_record=stored_trace["trace_record"],
+            findings=findings,
+            cluster=cluster,
+        )
+
+    def _diagnose(self, result: InvestigationResult) -> InvestigationResult:
+        cluster = result.cluster
+        if cluster is None:
+            diagnosis = self._diagnosis_engine.diagnose(
+                result.findings, failure_id=result.failure_id
+            )
+            return replace(result, diagnosis=diagnosis)
+
+        # Only the classification is shared; similar failures are looked up per member so
+        # the links include failures persisted since the cluster was first diagnosed.
+        fingerprint = self._diagnosis_engine.fingerprint(result.findings)
+        classification = cluster.cached_classification(fingerprint)
+        if classification is not None:
+            diagnosis = self._diagnosis_engine.link_similar(classification, result.findings)
+        else:
+            diagnosis = self._diagnosis_engine.diagnose(
+                result.findings, failure_id=result.failure_id
+            )
+            cluster.store_classification(fingerprint, diagnosis)
+        return replace(result, diagnosis=diagnosis, findings_fingerprint=fingerprint)
+
+    def _fix(self, result: InvestigationResult) -> InvestigationResult:
+        if result.diagnosis is None:
+            raise ValueError(f"Failure '{result.failure_id}' reached the fix stage undiagnosed.")
+
+        cluster = result.cluster
+        fingerprint = result.findings_fingerprint
+        catalog_version = self._fix_generator.catalog.version
+        if cluster is not None and fingerprint is not None:
+            fixes = cluster.cached_fixes(fingerprint, catalog_version)
+            if fixes is not None:
+                return replace(result, fixes=fixes)
+
+        fixes = tuple(self._fix_generator.generate_fixes(result.diagnosis, result.findings))
+        if cluster is not None and fingerprint is not None:
+            cluster.store_fixes(fingerprint, catalog_version, fixes)
+        return replace(result, fixes=fixes)
+
+    def _validate(self, batch: list[InvestigationResult]) -> list[InvestigationResult]:
+        if self._fix_validator is None:
+            return batch
+
+        started = time.perf_counter()
+        validations = iter(
+            self._fix_validator.validate_many(
+                (str(result.failure_event.get("subject", "")), fix)
+                for result in batch
+                for fix in result.fixes
+            )
+        )
+        validated = [
+            replace(result, fix_validations=tuple(next(validations) for _ in result.fixes))
+            for result in batch
+        ]
+        self.stage_metrics["validate"].record(started, time.perf_counter(), items=len(batch))
+        return validated
+
+    def _persist(self, batch: list[InvestigationResult]) -> list[InvestigationResult]:
+        batch = self._validate(batch)
+        started = time.perf_counter()
+        self._fix_history.record_batch(
+            (result.failure_event, result.diagnosis, list(result.fixes))
+            for result in batch
+            if result.diagnosis is not None
+        )
+        self.stage_metrics["persist"].record(started, time.perf_counter(), items=len(batch))
+        return batch
+
+    def metrics_report(self) -> list[dict[str, Any]]:
+        return [
+            self.stage_metrics[name].as_dict() for name in STAGE_NAMES if name in self.stage_metrics
+        ]
+
+
+def run_investigations(
+    failure_ids: Iterable[str],
+    trace_store: TraceStoreLike,
+    **options: Any,
+) -> list[InvestigationResult]:
+    return list(InvestigationPipeline(trace_store, **options).run(failure_ids))
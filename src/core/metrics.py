@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import atexit
+import json
+import math
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+DEFAULT_PERCENTILES = (50.0, 90.0, 99.0)
+
+
+@dataclass
+class Histogram:
+    """Latency histogram with exact count/sum/min/max and a bounded sample reservoir."""
+
+    max_samples: int = 4096
+    count: int = 0
+    total_s: float = 0.0
+    min_s: float = math.inf
+    max_s: float = 0.0
+    samples: list[float] = field(default_factory=list)
+
+    def observe(self, seconds: float, rng: random.Random) -> None:
+        self.count += 1
+        self.total_s += seconds
+        self.min_s = min(self.min_s, seconds)
+        self.max_s = max(self.max_s, seconds)
+        if len(self.samples) < self.max_samples:
+            self.samples.append(seconds)
+            return
+        # Reservoir sampling keeps percentiles representative of long runs.
+        slot = rng.randrange(self.count)
+        if slot < self.max_samples:
+            self.samples[slot] = seconds
+
+    def percentile(self, percentile: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        rank = max(1, math.ceil(percentile / 100.0 * len(ordered)))
+        return ordered[min(rank, len(ordered)) - 1]
+
+
+class _Timer:
+    __slots__ = ("_registry", "_name", "_started")
+
+    def __init__(self, registry: MetricsRegistry, name: str) -> None:
+        self._registry = registry
+        self._name = name
+        self._started = 0.0
+
+    def __enter__(self) -> _Timer:
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._registry.observe(self._name, time.perf_counter() - self._started)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> _NullTimer:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class MetricsRegistry:
+    """In-process latency histograms and counters for the investigation hot path.
+
+    Disabled registries hand out a shared no-op timer, so instrumented code pays one
+    attribute check per stage.
+    """
+
+    def __init__(self, *, enabled: bool = False, max_samples: int = 4096) -> None:
+        self.enabled = enabled
+        self._max_samples = max_samples
+        self._lock = threading.Lock()
+        self._rng = random.Random(0)
+        self._histograms: dict[str, Histogram] = {}
+        self._counters: dict[str, int] = {}
+
+    def timer(self, name: str) -> _Timer | _NullTimer:
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def observe(self, name: str, seconds: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram(max_samples=self._max_samples)
+            histogram.observe(seconds, self._rng)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "histograms": {
+                    name: {
+                        "count": histogram.count,
+                        "total_s": histogram.total_s,
+                        "min_s": histogram.min_s if histogram.count else 0.0,
+                        "max_s": histogram.max_s,
+                        "samples": list(histogram.samples),
+                    }
+                    for name, histogram in sorted(self._histograms.items())
+                },
+                "counters": dict(sorted(self._counters.items())),
+            }
+
+    def dump_json(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(self.snapshot()), encoding="utf-8")
+
+
+def percentile_rows(
+    snapshot: dict[str, Any], percentiles: tuple[float, ...] = DEFAULT_PERCENTILES
+) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    for name, data in snapshot.get("histograms", {}).items():
+        histogram = Histogram(
+            count=data["count"],
+            total_s=data["total_s"],
+            min_s=data["min_s"],
+            max_s=data["max_s"],
+            samples=list(data["samples"]),
+        )
+        row: dict[str, Any] = {
+            "stage": name,
+            "count": histogram.count,
+            "mean_ms": histogram.total_s / histogram.count * 1000 if histogram.count else 0.0,
+        }
+        for percentile in percentiles:
+            row[f"p{percentile:g}_ms"] = histogram.percentile(percentile) * 1000
+        row["max_ms"] = histogram.max_s * 1000
+        rows.append(row)
+    return rows
+
+
+def format_percentile_table(
+    snapshot: dict[str, Any], percentiles: tuple[float, ...] = DEFAULT_PERCENTILES
+) -> str:
+    rows = percentile_rows(snapshot, percentiles)
+    columns = ["count", "mean_ms", *(f"p{p:g}_ms" for p in percentiles), "max_ms"]
+    width = max([len("stage"), *(len(row["stage"]) for row in rows)]) + 2
+
+    lines = ["stage".ljust(width) + "".join(f"{column:>11}" for column in columns)]
+    for row in rows:
+        cells = "".join(
+            f"{row[column]:>11}" if column == "count" else f"{row[column]:>11.3f}"
+            for column in columns
+        )
+        lines.append(row["stage"].ljust(width) + cells)
+
+    counters = snapshot.get("counters", {})
+    if counters:
+        lines.append("")
+        lines.append("counter".ljust(width) + f"{'value':>11}")
+        lines.extend(name.ljust(width) + f"{value:>11}" for name, value in counters.items())
+    return "\n".join(lines)
+
+
+def _enabled_from_env() -> bool:
+    return os.getenv("INDAGINE_METRICS", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+metrics = MetricsRegistry(enabled=_enabled_from_env())
+
+_metrics_file = os.getenv("INDAGINE_METRICS_FILE", "").strip()
+if metrics.enabled and _metrics_file:
+    atexit.register(metrics.dump_json, _metrics_file)
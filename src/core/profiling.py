@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import cProfile
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+
+if TYPE_CHECKING:
+    from opentelemetry.trace import Tracer
+
+
+ProfileMode = Literal["cprofile", "sampling"]
+
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9._-]")
+_NULL_CONTEXT = nullcontext()
+# Shared by every profiler: only one cProfile can be active on a thread.
+_ACTIVE = threading.local()
+# Since Python 3.12 cProfile is process-wide (sys.monitoring) and a second enable()
+# raises, so one stage at a time holds it; concurrent stages fall back to sampling.
+_CPROFILE_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class ProfilingOptions:
+    directory: str
+    threshold_ms: float = 1000.0
+    mode: ProfileMode = "cprofile"
+    sample_interval_ms: float = 5.0
+
+
+def load_profiling_options_from_env() -> ProfilingOptions | None:
+    """Profiling is opt-in: it is enabled only when INDAGINE_PROFILE_DIR is set."""
+
+    directory = os.getenv("INDAGINE_PROFILE_DIR", "").strip()
+    if not directory:
+        return None
+
+    mode = os.getenv("INDAGINE_PROFILE_MODE", "cprofile").strip().lower() or "cprofile"
+    if mode not in ("cprofile", "sampling"):
+        raise ValueError(f"Unsupported INDAGINE_PROFILE_MODE '{mode}'.")
+    raw_threshold = os.getenv("INDAGINE_PROFILE_THRESHOLD_MS", "").strip()
+    raw_interval = os.getenv("INDAGINE_PROFILE_SAMPLE_INTERVAL_MS", "").strip()
+
+    return ProfilingOptions(
+        directory=directory,
+        threshold_ms=float(raw_threshold) if raw_threshold else 1000.0,
+        mode=mode,  # type: ignore[arg-type]
+        sample_interval_ms=float(raw_interval) if raw_interval else 5.0,
+    )
+
+
+class _StackSampler:
+    """Sample one thread's stack on a timer and aggregate folded (flamegraph) stacks."""
+
+    def __init__(self, thread_id: int, interval_s: float) -> None:
+        self._thread_id = thread_id
+        self._interval_s = interval_s
+        self._stop = threading.Event()
+        self._stacks: Counter[str] = Counter()
+        self._thread = threading.Thread(target=self._run, name="indagine-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval_s):
+            frame = sys._current_frames().get(self._thread_id)
+            frames: list[str] = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{Path(code.co_filename).name}:{code.co_name}")
+                frame = frame.f_back
+            if frames:
+                self._stacks[";".join(reversed(frames))] += 1
+
+    def write(self, path: Path) -> None:
+        lines = (f"{stack} {count}\n" for stack, count in self._stacks.most_common())
+        path.write_text("".join(lines), encoding="utf-8")
+
+
+class InvestigationProfiler:
+    """Profile each investigation stage and keep the profile only when it ran slowly.
+
+    ``cprofile`` mode writes a pstats file (``<failure_id>.<stage>.prof``); ``sampling``
+    mode writes folded stacks (``<failure_id>.<stage>.folded``) from a timer thread and
+    costs far less on the profiled thread. Only one stage in the process runs under
+    cProfile at a time; stages profiled concurrently with it are sampled instead. The
+    path is attached to the stage span as ``indagine.profile.path``.
+    """
+
+    def __init__(self, options: ProfilingOptions, *, tracer: Tracer | None = None) -> None:
+        self._options = options
+        self._directory = Path(options.directory)
+        self._tracer = tracer
+
+    @classmethod
+    def from_env(cls) -> InvestigationProfiler | None:
+        options = load_profiling_options_from_env()
+        return cls(options) if options else None
+
+    @contextmanager
+    def profile(self, stage: str, failure_id: str | None = None) -> Iterator[None]:
+        # cProfile allows one active profiler per thread, so nested stages (diagnose
+        # inside an already profiled investigation) are covered by the outer profile.
+        if getattr(_ACTIVE, "depth", 0):
+            _ACTIVE.depth += 1
+            try:
+                yield
+            finally:
+                _ACTIVE.depth -= 1
+            return
+
+        tracer = self._tracer
+        if tracer is None:
+            from opentelemetry import trace
+
+            tracer = trace.get_tracer(__name__)
+        _ACTIVE.depth = 1
+        with tracer.start_as_current_span(f"indagine.{stage}") as span:
+            if failure_id:
+                span.set_attribute("faultatlas.failure_id", failure_id)
+
+            profiler: cProfile.Profile | None = None
+            sampler: _StackSampler | None = None
+            if self._options.mode == "cprofile" and _CPROFILE_LOCK.acquire(blocking=False):
+                profiler = cProfile.Profile()
+                try:
+                    profiler.enable()
+                except ValueError:
+                    # Another profiling tool (a debugger or coverage) already owns it.
+                    _CPROFILE_LOCK.release()
+                    profiler = None
+            if profiler is None:
+                sampler = _StackSampler(
+                    threading.get_ident(), self._options.sample_interval_ms / 1000.0
+                )
+                sampler.start()
+
+            started = time.perf_counter()
+            try:
+                yield
+            finally:
+                elapsed_ms = (time.perf_counter() - started) * 1000.0
+                if profiler is not None:
+                    profiler.disable()
+                    _CPROFILE_LOCK.release()
+                if sampler is not None:
+                    sampler.stop()
+                _ACTIVE.depth = 0
+
+                if elapsed_ms >= self._options.threshold_ms:
+                    path = self._profile_path(stage, failure_id, sampled=sampler is not None)
+                    if profiler is not None:
+                        profiler.dump_stats(str(path))
+                    elif sampler is not None:
+                        sampler.write(path)
+                    span.set_attribute("indagine.profile.path", str(path))
+                    span.set_attribute("indagine.profile.duration_ms", round(elapsed_ms, 3))
+
+    def _profile_path(self, stage: str, failure_id: str | None, *, sampled: bool) -> Path:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        name = _UNSAFE_FILENAME_CHARS.sub("_", failure_id or f"unknown-{time.time_ns()}")
+        suffix = "folded" if sampled else "prof"
+        return self._directory / f"{name}.{stage}.{suffix}"
+
+
+def profiled(
+    profiler: InvestigationProfiler | None, stage: str, failure_id: str | None = None
+) -> AbstractContextManager[None]:
+    if profiler is None:
+        return _NULL_CONTEXT
+    return profiler.profile(stage, failure_id)
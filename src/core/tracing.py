@@ -1,18 +1,391 @@
 from __future__ import annotations
 
+import gzip
+import json
 import os
-from typing import Literal
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal
 
 from opentelemetry import trace
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import ConsoleSpanExporter, SimpleSpanProcessor
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SimpleSpanProcessor,
+    SpanExporter,
+    SpanExportResult,
+)
+from opentelemetry.sdk.trace.sampling import ALWAYS_ON, ParentBased, Sampler, TraceIdRatioBased
+from opentelemetry.trace import StatusCode
 
 
 _configured = False
 _active_exporter: "ExporterType | None" = None
+# Guards _configured and _active_exporter, which the background discovery thread also sets.
+_exporter_lock = threading.Lock()
 
 
-ExporterType = Literal["azure-monitor", "console"]
+ExporterType = Literal["azure-monitor", "console", "noop", "file"]
+ExporterChoice = Literal["auto", "console", "noop", "file"]
+FallbackExporter = Literal["console", "noop"]
+DiscoveryMode = Literal["blocking", "background"]
+SpanProcessorType = Literal["batch", "simple"]
+SamplingMode = Literal["always", "head", "tail"]
+
+_TRACE_ID_LIMIT = (1 << 64) - 1
+_KEEP_STATUSES = frozenset({"failed", "hallucinated"})
+_SEGMENT_GLOB = "spans-*.ndjson.gz"
+
+
+@dataclass(frozen=True)
+class TracingOptions:
+    """Span pipeline settings.
+
+    Batch tunables left as ``None`` fall back to the standard ``OTEL_BSP_*`` variables.
+    """
+
+    exporter: ExporterChoice = "auto"
+    span_processor: SpanProcessorType = "batch"
+    sampling: SamplingMode = "always"
+    sample_ratio: float = 1.0
+    max_queue_size: int | None = None
+    max_export_batch_size: int | None = None
+    schedule_delay_ms: float | None = None
+    export_timeout_ms: float | None = None
+    max_pending_traces: int = 10_000
+    span_directory: str | None = None
+    discovery: DiscoveryMode = "blocking"
+    discovery_timeout_s: float = 5.0
+    discovery_cache_ttl_s: float = 3600.0
+    discovery_cache_path: str | None = None
+    fallback_exporter: FallbackExporter = "console"
+
+
+def _default_discovery_cache_path() -> Path:
+    cache_root = os.getenv("XDG_CACHE_HOME", "").strip() or str(Path.home() / ".cache")
+    return Path(cache_root) / "indagine" / "tracing_discovery.json"
+
+
+def load_tracing_options_from_env() -> TracingOptions:
+    exporter = os.getenv("TRACING_EXPORTER", "auto").strip().lower() or "auto"
+    span_processor = os.getenv("TRACING_SPAN_PROCESSOR", "batch").strip().lower() or "batch"
+    sampling = os.getenv("TRACING_SAMPLER", "always").strip().lower() or "always"
+    raw_ratio = os.getenv("TRACING_SAMPLE_RATIO", "").strip()
+    span_directory = os.getenv("TRACING_SPAN_DIR", "").strip()
+    discovery = os.getenv("TRACING_DISCOVERY", "blocking").strip().lower() or "blocking"
+    fallback_exporter = os.getenv("TRACING_FALLBACK_EXPORTER", "console").strip().lower()
+    raw_timeout = os.getenv("TRACING_DISCOVERY_TIMEOUT_S", "").strip()
+    raw_ttl = os.getenv("TRACING_DISCOVERY_CACHE_TTL_S", "").strip()
+    cache_path = os.getenv("TRACING_DISCOVERY_CACHE", "").strip()
+
+    if exporter not in ("auto", "console", "noop", "file"):
+        raise ValueError(f"Unsupported TRACING_EXPORTER '{exporter}'.")
+    if span_processor not in ("batch", "simple"):
+        raise ValueError(f"Unsupported TRACING_SPAN_PROCESSOR '{span_processor}'.")
+    if sampling not in ("always", "head", "tail"):
+        raise ValueError(f"Unsupported TRACING_SAMPLER '{sampling}'.")
+    if discovery not in ("blocking", "background"):
+        raise ValueError(f"Unsupported TRACING_DISCOVERY '{discovery}'.")
+    if fallback_exporter not in ("console", "noop"):
+        raise ValueError(f"Unsupported TRACING_FALLBACK_EXPORTER '{fallback_exporter}'.")
+
+    return TracingOptions(
+        exporter=exporter,  # type: ignore[arg-type]
+        span_processor=span_processor,  # type: ignore[arg-type]
+        sampling=sampling,  # type: ignore[arg-type]
+        sample_ratio=float(raw_ratio) if raw_ratio else 1.0,
+        span_directory=span_directory or None,
+        discovery=discovery,  # type: ignore[arg-type]
+        discovery_timeout_s=float(raw_timeout) if raw_timeout else 5.0,
+        discovery_cache_ttl_s=float(raw_ttl) if raw_ttl else 3600.0,
+        discovery_cache_path=cache_path or None,
+        fallback_exporter=fallback_exporter,  # type: ignore[arg-type]
+    )
+
+
+class NoOpSpanExporter(SpanExporter):
+    """Exporter that drops every span; isolates SDK overhead in benchmarks."""
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        return None
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
+
+
+def _span_to_dict(span: ReadableSpan) -> dict[str, Any]:
+    span_context = span.context
+    parent = span.parent
+    return {
+        "trace_id": f"{span_context.trace_id:032x}" if span_context else None,
+        "span_id": f"{span_context.span_id:016x}" if span_context else None,
+        "parent_span_id": f"{parent.span_id:016x}" if parent else None,
+        "name": span.name,
+        "kind": span.kind.name,
+        "start_time_ns": span.start_time,
+        "end_time_ns": span.end_time,
+        "status": span.status.status_code.name,
+        "status_description": span.status.description,
+        "attributes": dict(span.attributes or {}),
+        "events": [
+            {
+                "name": event.name,
+                "timestamp_ns": event.timestamp,
+                "attributes": dict(event.attributes or {}),
+            }
+            for event in span.events
+        ],
+    }
+
+
+class FileSpanExporter(SpanExporter):
+    """Persist spans to gzip-compressed, rotating NDJSON segment files.
+
+    Encoded spans wait in a write buffer of at most ``buffer_spans`` entries; each flush
+    appends one gzip member to the current segment, and a flush that fails drops them. Segments rotate once they reach
+    ``max_segment_bytes`` and only the newest ``max_segments`` are kept.
+    """
+
+    def __init__(
+        self,
+        directory: Path | str,
+        *,
+        max_segment_bytes: int = 64 * 1024 * 1024,
+        max_segments: int = 20,
+        buffer_spans: int = 512,
+        compresslevel: int = 6,
+    ) -> None:
+        if max_segment_bytes < 1 or max_segments < 1 or buffer_spans < 1:
+            raise ValueError("max_segment_bytes, max_segments and buffer_spans must be positive.")
+
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_segment_bytes = max_segment_bytes
+        self._max_segments = max_segments
+        self._buffer_spans = buffer_spans
+        self._compresslevel = compresslevel
+        self._lock = threading.Lock()
+        self._buffer: list[bytes] = []
+        self._segment: Path | None = None
+        self._sequence = 0
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        encoded = [
+            json.dumps(_span_to_dict(span), separators=(",", ":"), default=str).encode("utf-8")
+            + b"\n"
+            for span in spans
+        ]
+        try:
+            with self._lock:
+                self._buffer.extend(encoded)
+                if len(self._buffer) >= self._buffer_spans:
+                    self._flush_locked()
+        except OSError:
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        try:
+            with self._lock:
+                self._flush_locked()
+        except OSError:
+            return False
+        return True
+
+    def shutdown(self) -> None:
+        self.force_flush()
+
+    def _flush_locked(self) -> None:
+        if not self._buffer:
+            return
+
+        try:
+            segment = self._current_segment()
+            with segment.open("ab") as handle:
+                handle.write(
+                    gzip.compress(b"".join(self._buffer), compresslevel=self._compresslevel)
+                )
+        finally:
+            # Spans from a failed write are dropped so the buffer stays bounded.
+            self._buffer.clear()
+
+    def _current_segment(self) -> Path:
+        if self._segment is not None and (
+            not self._segment.exists() or self._segment.stat().st_size < self._max_segment_bytes
+        ):
+            return self._segment
+
+        self._sequence += 1
+        self._segment = (
+            self._directory / f"spans-{time.time_ns():020d}-{self._sequence:06d}.ndjson.gz"
+        )
+        segments = sorted(self._directory.glob(_SEGMENT_GLOB))
+        for stale_segment in segments[: max(0, len(segments) - self._max_segments + 1)]:
+            stale_segment.unlink(missing_ok=True)
+        return self._segment
+
+
+def load_spans(directory: Path | str) -> Iterator[dict[str, Any]]:
+    """Stream spans written by ``FileSpanExporter``, oldest segment first."""
+
+    for segment in sorted(Path(directory).glob(_SEGMENT_GLOB)):
+        with gzip.open(segment, "rt", encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def join_spans_to_traces(
+    stored_traces: Iterable[dict[str, Any]], directory: Path | str
+) -> list[dict[str, Any]]:
+    """Attach captured spans to ``TraceStore.get_trace`` payloads by failure-event trace_id."""
+
+    joined = [dict(stored_trace) for stored_trace in stored_traces]
+    by_trace_id: dict[str, list[dict[str, Any]]] = {}
+    for stored_trace in joined:
+        failure_event = stored_trace.get("failure_event") or {}
+        trace_id = failure_event.get("trace_id") if isinstance(failure_event, dict) else None
+        stored_trace["spans"] = by_trace_id.setdefault(str(trace_id), []) if trace_id else []
+
+    for span in load_spans(directory):
+        spans = by_trace_id.get(str(span.get("trace_id")))
+        if spans is not None:
+            spans.append(span)
+
+    return joined
+
+
+class SwitchableSpanExporter(SpanExporter):
+    """Forward spans to a delegate that can be replaced while the provider runs."""
+
+    def __init__(self, delegate: SpanExporter) -> None:
+        self._delegate = delegate
+        self._lock = threading.Lock()
+
+    def switch(self, delegate: SpanExporter) -> None:
+        with self._lock:
+            previous, self._delegate = self._delegate, delegate
+        previous.shutdown()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        return self._delegate.export(spans)
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self._delegate.force_flush(timeout_millis)
+
+    def shutdown(self) -> None:
+        self._delegate.shutdown()
+
+
+def _ratio_keeps(trace_id: int, ratio: float) -> bool:
+    return (trace_id & _TRACE_ID_LIMIT) < round(ratio * (_TRACE_ID_LIMIT + 1))
+
+
+def _is_failed_span(span: ReadableSpan) -> bool:
+    if span.status is not None and span.status.status_code == StatusCode.ERROR:
+        return True
+    attributes = span.attributes or {}
+    return attributes.get("faultatlas.status") in _KEEP_STATUSES
+
+
+class TailSamplingSpanProcessor(SpanProcessor):
+    """Buffer spans per trace and decide once the local root span ends.
+
+    Traces with an errored span or a failed/hallucinated ``faultatlas.status`` are always
+    kept; other traces are kept for ``ratio`` of trace ids. When more than
+    ``max_pending_traces`` traces are open, the oldest one is forwarded undecided.
+    """
+
+    def __init__(
+        self, delegate: SpanProcessor, ratio: float, *, max_pending_traces: int = 10_000
+    ) -> None:
+        if not 0.0 <= ratio <= 1.0:
+            raise ValueError("ratio must be between 0.0 and 1.0.")
+
+        self._delegate = delegate
+        self._ratio = ratio
+        self._max_pending_traces = max_pending_traces
+        self._lock = threading.Lock()
+        self._pending: OrderedDict[int, list[ReadableSpan]] = OrderedDict()
+
+    def on_start(self, span: Span, parent_context: Context | None = None) -> None:
+        self._delegate.on_start(span, parent_context=parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        span_context = span.context
+        if span_context is None:
+            return
+
+        trace_id = span_context.trace_id
+        is_local_root = span.parent is None or span.parent.is_remote
+        evicted: list[ReadableSpan] = []
+        with self._lock:
+            buffered = self._pending.setdefault(trace_id, [])
+            buffered.append(span)
+            if is_local_root:
+                finished = self._pending.pop(trace_id)
+            else:
+                finished = None
+                if len(self._pending) > self._max_pending_traces:
+                    _, evicted = self._pending.popitem(last=False)
+
+        for evicted_span in evicted:
+            self._delegate.on_end(evicted_span)
+
+        if finished is None:
+            return
+        if any(_is_failed_span(item) for item in finished) or _ratio_keeps(trace_id, self._ratio):
+            for finished_span in finished:
+                self._delegate.on_end(finished_span)
+
+    def shutdown(self) -> None:
+        self._delegate.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self._delegate.force_flush(timeout_millis)
+
+
+def build_sampler(options: TracingOptions) -> Sampler:
+    if options.sampling == "head":
+        return ParentBased(TraceIdRatioBased(options.sample_ratio))
+    # Tail sampling needs every span recorded so failed runs can still be kept.
+    return ALWAYS_ON
+
+
+def build_span_processor(options: TracingOptions, exporter: SpanExporter) -> SpanProcessor:
+    processor: SpanProcessor
+    if options.span_processor == "simple":
+        processor = SimpleSpanProcessor(exporter)
+    else:
+        processor = BatchSpanProcessor(
+            exporter,
+            max_queue_size=options.max_queue_size,
+            schedule_delay_millis=options.schedule_delay_ms,
+            max_export_batch_size=options.max_export_batch_size,
+            export_timeout_millis=options.export_timeout_ms,
+        )
+
+    if options.sampling == "tail":
+        return TailSamplingSpanProcessor(
+            processor, options.sample_ratio, max_pending_traces=options.max_pending_traces
+        )
+    return processor
+
+
+def build_tracer_provider(options: TracingOptions, exporter: SpanExporter) -> TracerProvider:
+    provider = TracerProvider(sampler=build_sampler(options))
+    provider.add_span_processor(build_span_processor(options, exporter))
+    return provider
 
 
 def _connection_string_from_env() -> str | None:
@@ -45,34 +418,177 @@ def _connection_string_from_foundry() -> str | None:
         return None
 
 
-def configure_tracing() -> ExporterType:
+def _read_cached_connection_string(
+    cache_path: Path, *, endpoint: str, ttl_s: float
+) -> tuple[bool, str | None]:
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False, None
+
+    if not isinstance(cached, dict) or cached.get("endpoint") != endpoint:
+        return False, None
+    resolved_at = cached.get("resolved_at")
+    if not isinstance(resolved_at, (int, float)) or time.time() - resolved_at > ttl_s:
+        return False, None
+
+    value = cached.get("connection_string")
+    return True, value if isinstance(value, str) and value else None
+
+
+def _write_cached_connection_string(cache_path: Path, *, endpoint: str, value: str | None) -> None:
+    payload = {"endpoint": endpoint, "connection_string": value, "resolved_at": time.time()}
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # mkstemp opens the file with O_EXCL and mode 0o600, so the secret is never
+        # readable by others, not even before the rename.
+        descriptor, temporary = tempfile.mkstemp(
+            dir=cache_path.parent, prefix=f".{cache_path.name}-"
+        )
+    except OSError:
+        return
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as handle:
+            handle.write(json.dumps(payload))
+        os.replace(temporary, cache_path)
+    except OSError:
+        Path(temporary).unlink(missing_ok=True)
+
+
+def _call_with_deadline(timeout_s: float) -> tuple[bool, str | None]:
+    """Run Foundry discovery in a daemon thread; give up (not cancel) after ``timeout_s``."""
+
+    result: list[str | None] = []
+    worker = threading.Thread(
+        target=lambda: result.append(_connection_string_from_foundry()),
+        name="tracing-discovery",
+        daemon=True,
+    )
+    worker.start()
+    worker.join(timeout_s)
+    if worker.is_alive() or not result:
+        return False, None
+    return True, result[0]
+
+
+def discover_connection_string(options: TracingOptions) -> str | None:
+    """Resolve the App Insights connection string: env, then disk cache, then Foundry.
+
+    Foundry discovery runs under a hard deadline and its result, including "none
+    found", is cached on disk for ``discovery_cache_ttl_s`` seconds.
+    """
+
+    from_env = _connection_string_from_env()
+    if from_env:
+        return from_env
+
+    endpoint = os.getenv("FOUNDRY_PROJECT_ENDPOINT", "").strip()
+    cache_path = (
+        Path(options.discovery_cache_path)
+        if options.discovery_cache_path
+        else _default_discovery_cache_path()
+    )
+    hit, cached_value = _read_cached_connection_string(
+        cache_path, endpoint=endpoint, ttl_s=options.discovery_cache_ttl_s
+    )
+    if hit:
+        return cached_value
+
+    completed, value = _call_with_deadline(options.discovery_timeout_s)
+    if completed:
+        _write_cached_connection_string(cache_path, endpoint=endpoint, value=value)
+    return value
+
+
+def _local_exporter(selected: TracingOptions) -> tuple[ExporterType, SpanExporter]:
+    exporter_choice = (
+        selected.fallback_exporter if selected.exporter == "auto" else selected.exporter
+    )
+    if exporter_choice == "noop":
+        return "noop", NoOpSpanExporter()
+    if exporter_choice == "file":
+        if not selected.span_directory:
+            raise ValueError("The file exporter requires TRACING_SPAN_DIR (span_directory).")
+        return "file", FileSpanExporter(selected.span_directory)
+    return "console", ConsoleSpanExporter()
+
+
+def _switch_to_azure_monitor(switchable: SwitchableSpanExporter, options: TracingOptions) -> None:
+    global _active_exporter
+
+    connection_string = discover_connection_string(options)
+    if not connection_string:
+        return
+
+    try:
+        from azure.monitor.opentelemetry.exporter import AzureMonitorTraceExporter
+    except ImportError:
+        return
+
+    with _exporter_lock:
+        switchable.switch(AzureMonitorTraceExporter(connection_string=connection_string))
+        _active_exporter = "azure-monitor"
+    print("Tracing exporter switched: azure-monitor")
+
+
+def configure_tracing(options: TracingOptions | None = None) -> ExporterType:
     """Configure OpenTelemetry tracing.
 
-    Preference order:
+    Preference order (for ``exporter="auto"``):
     1. APPLICATIONINSIGHTS_CONNECTION_STRING env var
-    2. Foundry project telemetry connection string
-    3. Console exporter fallback for local development
+    2. Cached, then live (deadline-bounded) Foundry project telemetry connection string
+    3. Fallback exporter (console by default) for local development
+
+    With ``discovery="background"`` the fallback exporter is installed immediately and
+    swapped for Azure Monitor once discovery finishes.
+
+    Options default to ``load_tracing_options_from_env()``. Azure Monitor honours head
+    sampling through its own ``sampling_ratio``; tail sampling applies to local exporters.
     """
 
+    with _exporter_lock:
+        return _configure_tracing(options)
+
+
+def _configure_tracing(options: TracingOptions | None) -> ExporterType:
     global _active_exporter, _configured
     if _configured and _active_exporter is not None:
         print(f"Tracing exporter active: {_active_exporter}")
         return _active_exporter
 
-    connection_string = _connection_string_from_env() or _connection_string_from_foundry()
+    selected = options or load_tracing_options_from_env()
+
+    if selected.exporter == "auto" and selected.discovery == "background":
+        exporter_type, exporter = _local_exporter(selected)
+        switchable = SwitchableSpanExporter(exporter)
+        trace.set_tracer_provider(build_tracer_provider(selected, switchable))
+        _active_exporter = exporter_type
+        _configured = True
+        threading.Thread(
+            target=_switch_to_azure_monitor,
+            args=(switchable, selected),
+            name="tracing-bootstrap",
+            daemon=True,
+        ).start()
+        print(f"Tracing exporter active: {exporter_type} (discovery in background)")
+        return exporter_type
+
+    connection_string = None
+    if selected.exporter == "auto":
+        connection_string = discover_connection_string(selected)
     if connection_string:
         from azure.monitor.opentelemetry import configure_azure_monitor
 
-        configure_azure_monitor(connection_string=connection_string)
+        sampling_ratio = selected.sample_ratio if selected.sampling == "head" else 1.0
+        configure_azure_monitor(connection_string=connection_string, sampling_ratio=sampling_ratio)
         _active_exporter = "azure-monitor"
         _configured = True
         print("Tracing exporter active: azure-monitor")
         return "azure-monitor"
 
-    provider = TracerProvider()
-    provider.add_span_processor(SimpleSpanProcessor(ConsoleSpanExporter()))
-    trace.set_tracer_provider(provider)
-    _active_exporter = "console"
+    exporter_type, exporter = _local_exporter(selected)
+    trace.set_tracer_provider(build_tracer_provider(selected, exporter))
+    _active_exporter = exporter_type
     _configured = True
-    print("Tracing exporter active: console")
-    return "console"
+    print(f"Tracing exporter active: {exporter_type}")
+    return exporter_type
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from typing import Any
+
+from src.models.trace import TraceRecord
+
+
+_intern = sys.intern
+# Unknown fields are rejected, as TraceRecord does, so the compact path never
+# analyzes a document the validating path would refuse.
+_TRACE_FIELDS = frozenset(
+    ("schema_version", "failure_id", "subject", "status", "started_at", "ended_at", "steps")
+)
+_STEP_FIELDS = frozenset(
+    (
+        "name",
+        "kind",
+        "timestamp",
+        "input",
+        "output",
+        "tool_calls",
+        "thought",
+        "decision",
+        "error",
+    )
+)
+
+
+@dataclass(frozen=True, slots=True)
+class CompactToolCall:
+    tool: str
+    args: dict[str, Any]
+
+
+@dataclass(frozen=True, slots=True)
+class CompactStep:
+    name: str
+    kind: str
+    input: dict[str, Any] | None = None
+    output: dict[str, Any] | None = None
+    error: str | None = None
+    timestamp: str | None = None
+    tool_calls: tuple[CompactToolCall, ...] = ()
+    thought: str | None = None
+    decision: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class CompactTrace:
+    """Slotted trace for in-process hand-offs between store, controller and analyzers.
+
+    Step names, kinds and tool names are interned, so a 10k-step trace built from a
+    handful of step types stores each distinct string once. The dataclasses are
+    frozen, but ``input``/``output`` payloads and tool call ``args`` are the wire
+    document's own dicts, not copies: build it from a document nothing else mutates
+    (such as a freshly read stored trace) and treat the payloads as read-only.
+    ``from_wire`` rejects unknown fields but does not validate values; validate with
+    ``TraceRecord`` first when the source is untrusted.
+    """
+
+    failure_id: str
+    subject: str
+    status: str
+    started_at: str
+    ended_at: str
+    steps: tuple[CompactStep, ...] = ()
+    schema_version: int = 1
+
+    @classmethod
+    def from_wire(cls, payload: dict[str, Any]) -> CompactTrace:
+        if not payload.keys() <= _TRACE_FIELDS:
+            raise ValueError(
+                f"Unknown trace_record fields: {sorted(payload.keys() - _TRACE_FIELDS)}"
+            )
+        try:
+            return cls(
+                failure_id=payload["failure_id"],
+                subject=_intern(payload["subject"]),
+                status=_intern(payload["status"]),
+                started_at=payload["started_at"],
+                ended_at=payload["ended_at"],
+                steps=tuple(_step_from_wire(step) for step in payload.get("steps") or ()),
+                schema_version=payload.get("schema_version", 1),
+            )
+        except (KeyError, TypeError, AttributeError) as exc:
+            raise ValueError(f"Invalid trace_record: {exc!r}") from exc
+
+    @classmethod
+    def from_model(cls, trace_record: TraceRecord) -> CompactTrace:
+        return cls.from_wire(trace_record.model_dump())
+
+    def to_wire(self) -> dict[str, Any]:
+        """Return the ``trace_record`` document shape; payload dicts are shared, not copied."""
+
+        return {
+            "schema_version": self.schema_version,
+            "failure_id": self.failure_id,
+            "subject": self.subject,
+            "status": self.status,
+            "started_at": self.started_at,
+            "ended_at": self.ended_at,
+            "steps": [_step_to_wire(step) for step in self.steps],
+        }
+
+
+def _step_from_wire(step: dict[str, Any]) -> CompactStep:
+    if not step.keys() <= _STEP_FIELDS:
+        raise ValueError(f"Unknown trace step fields: {sorted(step.keys() - _STEP_FIELDS)}")
+    raw_tool_calls = step.get("tool_calls")
+    tool_calls: tuple[CompactToolCall, ...] = ()
+    if raw_tool_calls:
+        tool_calls = tuple(
+            CompactToolCall(tool=_intern(call["tool"]), args=call.get("args") or {})
+            for call in raw_tool_calls
+        )
+
+    return CompactStep(
+        name=_intern(step["name"]),
+        kind=_intern(step["kind"]),
+        input=step.get("input"),
+        output=step.get("output"),
+        error=step.get("error"),
+        timestamp=step.get("timestamp"),
+        tool_calls=tool_calls,
+        thought=step.get("thought"),
+        decision=step.get("decision"),
+    )
+
+
+def _step_to_wire(step: CompactStep) -> dict[str, Any]:
+    document: dict[str, Any] = {
+        "name": step.name,
+        "kind": step.kind,
+        "input": step.input,
+        "output": step.output,
+        "error": step.error,
+    }
+    # Optional fields of the richer trace model are only emitted when set, so the
+    # document stays valid for the detector's stricter TraceRecord as well.
+    if step.timestamp is not None:
+        document["timestamp"] = step.timestamp
+    if step.tool_calls:
+        document["tool_calls"] = [
+            {"tool": call.tool, "args": call.args} for call in step.tool_calls
+        ]
+    if step.thought is not None:
+        document["thought"] = step.thought
+    if step.decision is not None:
+        document["decision"] = step.decision
+    return document
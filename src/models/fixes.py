@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from enum import Enum
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict
 
 
 class FixType(str, Enum):
@@ -12,7 +12,7 @@ class FixType(str, Enum):
 
 
 class FixChange(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     file: str
     change_type: str
@@ -22,9 +22,26 @@ class FixChange(BaseModel):
 
 
 class FixProposal(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    """Immutable, so one proposal instance can be shared by every failure it applies to."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     fix_type: FixType
     title: str
     rationale: str
-    changes: list[FixChange] = Field(default_factory=list)
+    changes: tuple[FixChange, ...] = ()
+
+
+class FixValidationResult(BaseModel):
+    """Outcome of replaying a subject scenario with one fix proposal applied."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    subject: str
+    fix_title: str
+    passed: bool
+    applied: bool
+    status: str | None = None
+    failure_type: str | None = None
+    error: str | None = None
+    duration_ms: float = 0.0
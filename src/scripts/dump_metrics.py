@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+
+def _run_traces(traces_dir: Path, repeat: int) -> dict[str, Any]:
+    from src.core.investigation_pipeline import InvestigationPipeline
+    from src.core.metrics import metrics
+    from src.storage.trace_store import TraceStore
+
+    trace_store = TraceStore(backend="memory")
+    failure_ids: list[str] = []
+    for trace_path in sorted(traces_dir.glob("*.json")):
+        trace_record = json.loads(trace_path.read_text(encoding="utf-8"))
+        for index in range(repeat):
+            failure_id = f"{trace_path.stem}-{index}"
+            trace_store.store_trace(
+                {"failure_id": failure_id, "subject": trace_record.get("subject") or "unknown"},
+                {**trace_record, "failure_id": failure_id},
+            )
+            failure_ids.append(failure_id)
+
+    metrics.enabled = True
+    metrics.reset()
+    for _ in InvestigationPipeline(trace_store).run(failure_ids):
+        pass
+    return metrics.snapshot()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Print per-stage latency percentiles for the investigation pipeline."
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "--file",
+        type=Path,
+        help="Metrics snapshot written via INDAGINE_METRICS=1 INDAGINE_METRICS_FILE=<path>.",
+    )
+    source.add_argument(
+        "--traces",
+        type=Path,
+        help="Directory of trace_record JSON files to investigate with metrics enabled.",
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="Copies of each trace (--traces).")
+    parser.add_argument("--json", action="store_true", help="Print the raw snapshot instead.")
+    args = parser.parse_args(argv)
+
+    from src.core.metrics import format_percentile_table
+
+    if args.file:
+        snapshot = json.loads(args.file.read_text(encoding="utf-8"))
+    else:
+        snapshot = _run_traces(args.traces, max(1, args.repeat))
+
+    if args.json:
+        json.dump(snapshot, sys.stdout)
+        sys.stdout.write("\n")
+    else:
+        print(format_percentile_table(snapshot))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Generate a seeded synthetic trace corpus for load tests."
+    )
+    parser.add_argument("--count", type=int, required=True)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start-index", type=int, default=0, help="First index (for sharding).")
+    parser.add_argument(
+        "--distribution",
+        default="",
+        help="Class weights, e.g. TOOL_MISUSE=3,HALLUCINATION=1 (default: uniform).",
+    )
+    parser.add_argument("--min-steps", type=int, default=1)
+    parser.add_argument("--max-steps", type=int, default=6)
+    parser.add_argument("--min-payload-bytes", type=int, default=0)
+    parser.add_argument("--max-payload-bytes", type=int, default=1024)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--output", type=Path, help="NDJSON file; gzip when it ends in .gz.")
+    target.add_argument("--store", choices=["memory", "cosmos"], help="TraceStore backend.")
+    args = parser.parse_args(argv)
+
+    from src.subjects.corpus import CorpusSpec, load_into_store, parse_distribution, write_ndjson
+
+    options = {}
+    if args.distribution:
+        options["distribution"] = parse_distribution(args.distribution)
+    spec = CorpusSpec(
+        count=args.count,
+        seed=args.seed,
+        min_steps=args.min_steps,
+        max_steps=args.max_steps,
+        min_payload_bytes=args.min_payload_bytes,
+        max_payload_bytes=args.max_payload_bytes,
+        start_index=args.start_index,
+        **options,
+    )
+
+    if args.output:
+        written = write_ndjson(spec, args.output)
+        print(f"Wrote {written} traces to {args.output}", file=sys.stderr)
+        return 0
+
+    from src.storage.trace_store import TraceStore
+
+    stored = load_into_store(spec, TraceStore(backend=args.store))
+    print(f"Stored {stored} traces in the {args.store} trace store", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
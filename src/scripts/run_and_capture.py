@@ -3,25 +3,12 @@ from __future__ import annotations
 import argparse
 import json
 import sys
-from typing import Any, Callable
+from typing import TYPE_CHECKING, Any
 
-from opentelemetry import trace
+from src.subjects.registry import SubjectRunner, subject_runners
 
-from src.core.failure_detector import run_with_failure_detection
-from src.core.tracing import configure_tracing
-from src.storage.trace_store import TraceStore
-from src.subjects.booking_agent import run_booking_scenario
-from src.subjects.search_agent import run_search_scenario
-from src.subjects.summary_agent import run_summary_scenario
-
-
-SubjectRunner = Callable[[], dict[str, Any]]
-
-SUBJECT_RUNNERS: tuple[tuple[str, SubjectRunner], ...] = (
-    ("booking", run_booking_scenario),
-    ("search", run_search_scenario),
-    ("summary", run_summary_scenario),
-)
+if TYPE_CHECKING:
+    from src.storage.trace_store import TraceStore
 
 
 def _capture_subject(
@@ -30,6 +17,8 @@ def _capture_subject(
     runner: SubjectRunner,
     timeout_s: float,
 ) -> dict[str, Any]:
+    from src.core.failure_detector import run_with_failure_detection
+
     failure_event, trace_record = run_with_failure_detection(
         subject_name, runner, timeout_s=timeout_s
     )
@@ -53,11 +42,18 @@ def main(argv: list[str] | None = None) -> int:
     parser.add_argument("--timeout-s", type=float, default=5.0)
     args = parser.parse_args(argv)
 
+    # Heavy imports (OpenTelemetry, subjects, storage) wait until arguments parse, so
+    # --help and usage errors return immediately.
+    from opentelemetry import trace
+
+    from src.core.tracing import configure_tracing
+    from src.storage.trace_store import TraceStore
+
     configure_tracing()
     tracer = trace.get_tracer(__name__)
     trace_store = TraceStore(backend=args.store)
 
-    for subject_name, runner in SUBJECT_RUNNERS:
+    for subject_name, runner in subject_runners():
         with tracer.start_as_current_span(f"run_and_capture:{subject_name}"):
             summary = _capture_subject(trace_store, subject_name, runner, args.timeout_s)
             json.dump(summary, sys.stdout)
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from collections.abc import Collection, Iterator
+from pathlib import Path
+from typing import Protocol
+
+
+class BlobStore(Protocol):
+    def put(self, data: bytes) -> str: ...
+
+    def get(self, digest: str) -> bytes: ...
+
+    def delete(self, digest: str) -> None: ...
+
+    def digests(self, *, written_before: float | None = None) -> Iterator[str]: ...
+
+
+def blob_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def collect_blobs(blob_store: BlobStore, live: Collection[str], *, written_before: float) -> int:
+    """Delete blobs outside ``live`` last written before ``written_before``; return the count.
+
+    ``live`` must be marked before this runs. A trace puts its blobs before its
+    document is written, so blobs written after the cutoff may not be marked yet.
+    """
+
+    deleted = 0
+    for digest in list(blob_store.digests(written_before=written_before)):
+        if digest not in live:
+            blob_store.delete(digest)
+            deleted += 1
+    return deleted
+
+
+class LocalBlobStore:
+    """Content-addressed blobs on the local filesystem, one file per SHA-256 digest.
+
+    Identical payloads share one file, and writes go through a temporary file and
+    ``os.replace`` so concurrent writers of the same blob never expose partial data.
+    Putting a blob that already exists refreshes its modification time, which
+    ``collect_blobs`` reads as the last write.
+    """
+
+    def __init__(self, root: Path | str) -> None:
+        self._root = Path(root)
+        self._root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, digest: str) -> Path:
+        if len(digest) != 64 or not all(char in "0123456789abcdef" for char in digest):
+            raise ValueError(f"'{digest}' is not a SHA-256 digest.")
+        return self._root / digest[:2] / digest
+
+    def put(self, data: bytes) -> str:
+        digest = blob_digest(data)
+        path = self._path(digest)
+        try:
+            os.utime(path)
+            return digest
+        except FileNotFoundError:
+            pass
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=path.parent, prefix=f".{digest[:8]}-")
+        try:
+            with os.fdopen(descriptor, "wb") as handle:
+                handle.write(data)
+            os.replace(temporary, path)
+        except BaseException:
+            Path(temporary).unlink(missing_ok=True)
+            raise
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        try:
+            return self._path(digest).read_bytes()
+        except FileNotFoundError as exc:
+            raise KeyError(f"Blob '{digest}' not found.") from exc
+
+    def delete(self, digest: str) -> None:
+        self._path(digest).unlink(missing_ok=True)
+
+    def digests(self, *, written_before: float | None = None) -> Iterator[str]:
+        for path in self._root.glob("??/*"):
+            if path.name.startswith("."):
+                continue
+            try:
+                if written_before is not None and path.stat().st_mtime >= written_before:
+                    continue
+            except FileNotFoundError:
+                continue
+            yield path.name
+
+    def __contains__(self, digest: object) -> bool:
+        return isinstance(digest, str) and self._path(digest).exists()
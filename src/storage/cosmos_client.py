@@ -1,10 +1,17 @@
 from __future__ import annotations
 
 import os
+import time
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any, TypeVar
 
-from azure.cosmos import CosmosClient, PartitionKey, exceptions
+if TYPE_CHECKING:
+    from azure.cosmos import exceptions
+
+
+_T = TypeVar("_T")
+_THROTTLED_STATUS = 429
 
 
 @dataclass(frozen=True)
@@ -32,14 +39,78 @@ def load_cosmos_settings_from_env() -> CosmosSettings | None:
     )
 
 
+def _throttle_delay_s(
+    error: exceptions.CosmosHttpResponseError, attempt: int, base_delay_s: float
+) -> float:
+    headers = getattr(error, "headers", None) or getattr(
+        getattr(error, "response", None), "headers", None
+    )
+    retry_after_ms = headers.get("x-ms-retry-after-ms") if headers else None
+    try:
+        return float(retry_after_ms) / 1000.0
+    except (TypeError, ValueError):
+        return base_delay_s * (2 ** (attempt - 1))
+
+
+def call_with_throttle_retry(
+    operation: Callable[[], _T],
+    *,
+    max_attempts: int = 5,
+    base_delay_s: float = 0.1,
+) -> _T:
+    """Run a Cosmos call, retrying 429 responses after the server-provided delay."""
+
+    from azure.cosmos import exceptions
+
+    attempt = 1
+    while True:
+        try:
+            return operation()
+        except exceptions.CosmosHttpResponseError as exc:
+            if exc.status_code != _THROTTLED_STATUS or attempt >= max_attempts:
+                raise
+            time.sleep(_throttle_delay_s(exc, attempt, base_delay_s))
+            attempt += 1
+
+
+def create_container_with_ttl(database_client: Any, container_id: str) -> Any:
+    """Create or open a ``/failure_id``-partitioned container with per-document ``ttl`` on.
+
+    ``create_container_if_not_exists`` only applies ``default_ttl`` to containers it
+    creates, and Cosmos ignores document ``ttl`` while a container has no
+    ``defaultTtl``. Existing containers are therefore switched to ``defaultTtl=-1``
+    (documents without a ``ttl`` never expire), keeping their indexing and conflict
+    resolution policies, which a replace would otherwise reset.
+    """
+
+    from azure.cosmos import PartitionKey
+
+    partition_key = PartitionKey(path="/failure_id")
+    container_client = database_client.create_container_if_not_exists(
+        id=container_id, partition_key=partition_key, default_ttl=-1
+    )
+    properties = container_client.read()
+    if properties.get("defaultTtl") is None:
+        container_client = database_client.replace_container(
+            container_client,
+            partition_key=partition_key,
+            indexing_policy=properties.get("indexingPolicy"),
+            default_ttl=-1,
+            conflict_resolution_policy=properties.get("conflictResolutionPolicy"),
+        )
+    return container_client
+
+
 class CosmosTraceClient:
-    def __init__(self, settings: CosmosSettings) -> None:
+    def __init__(self, settings: CosmosSettings, *, max_throttle_retries: int = 5) -> None:
+        from azure.cosmos import CosmosClient
+
         self._settings = settings
+        self._max_attempts = max(1, max_throttle_retries + 1)
         self._client = CosmosClient(url=settings.endpoint, credential=settings.key)
         database_client = self._client.create_database_if_not_exists(id=settings.database)
-        self._container_client = database_client.create_container_if_not_exists(
-            id=settings.container_traces,
-            partition_key=PartitionKey(path="/failure_id"),
+        self._container_client = create_container_with_ttl(
+            database_client, settings.container_traces
         )
 
     @classmethod
@@ -53,11 +124,75 @@ class CosmosTraceClient:
 
         return cls(settings)
 
+    def _call(self, operation: Callable[[], _T]) -> _T:
+        return call_with_throttle_retry(operation, max_attempts=self._max_attempts)
+
     def upsert_trace_document(self, document: dict[str, Any]) -> None:
-        self._container_client.upsert_item(document)
+        self._call(lambda: self._container_client.upsert_item(document))
 
     def get_trace_document(self, failure_id: str) -> dict[str, Any]:
+        from azure.cosmos import exceptions
+
+        try:
+            return self._call(
+                lambda: self._container_client.read_item(item=failure_id, partition_key=failure_id)
+            )
+        except exceptions.CosmosResourceNotFoundError as exc:
+            raise KeyError(f"Trace '{failure_id}' not found.") from exc
+
+    def get_trace_documents(self, failure_ids: Sequence[str]) -> dict[str, dict[str, Any]]:
+        """Point-read many traces in one request; missing failure_ids are omitted."""
+
+        read_items = getattr(self._container_client, "read_items", None)
+        if read_items is None:
+            documents: dict[str, dict[str, Any]] = {}
+            for failure_id in failure_ids:
+                try:
+                    documents[failure_id] = self.get_trace_document(failure_id)
+                except KeyError:
+                    continue
+            return documents
+
+        items = [(failure_id, failure_id) for failure_id in failure_ids]
+        results = self._call(lambda: list(read_items(items=items)))
+        return {str(document["failure_id"]): document for document in results}
+
+    def query_trace_documents(
+        self,
+        query: str,
+        parameters: list[dict[str, Any]],
+        *,
+        max_item_count: int,
+        continuation: str | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """Run one page of a parameterized cross-partition query."""
+
+        def _page() -> tuple[list[dict[str, Any]], str | None]:
+            pager = self._container_client.query_items(
+                query=query,
+                parameters=parameters,
+                enable_cross_partition_query=True,
+                max_item_count=max_item_count,
+            ).by_page(continuation)
+            items = list(next(pager, []))
+            return items, pager.continuation_token
+
+        return self._call(_page)
+
+    def patch_trace_document(self, failure_id: str, fields: dict[str, Any]) -> None:
+        from azure.cosmos import exceptions
+
+        operations = [
+            {"op": "set", "path": f"/{field_name}", "value": value}
+            for field_name, value in fields.items()
+        ]
         try:
-            return self._container_client.read_item(item=failure_id, partition_key=failure_id)
+            self._call(
+                lambda: self._container_client.patch_item(
+                    item=failure_id,
+                    partition_key=failure_id,
+                    patch_operations=operations,
+                )
+            )
         except exceptions.CosmosResourceNotFoundError as exc:
             raise KeyError(f"Trace '{failure_id}' not found.") from exc
@@ -1,16 +1,18 @@
 from __future__ import annotations
 
 import os
+from collections.abc import Iterable
 from dataclasses import dataclass
 from typing import Any, Literal, Protocol
 
-from azure.cosmos import CosmosClient, PartitionKey, exceptions
 from pydantic import BaseModel
 
 from src.models.diagnosis import Diagnosis
 from src.models.findings import FindingsReport
 from src.models.fixes import FixProposal
-from src.storage.fix_history_memory import InMemoryFixHistory
+from src.storage.cosmos_client import create_container_with_ttl
+from src.storage.fix_history_memory import FixHistoryEntry, InMemoryFixHistory
+from src.storage.retention import RetentionPolicy, RetentionReport, retention_status
 
 
 StoreBackend = Literal["auto", "memory", "cosmos"]
@@ -64,6 +66,8 @@ class _FixHistoryBackend(FixHistoryLookup, Protocol):
         fix_proposals: list[FixProposal | dict[str, Any]],
     ) -> None: ...
 
+    def record_batch(self, entries: Iterable[FixHistoryEntry]) -> None: ...
+
 
 def _coerce_payload(value: BaseModel | dict[str, Any]) -> dict[str, Any]:
     if isinstance(value, BaseModel):
@@ -77,28 +81,28 @@ def _coerce_payload(value: BaseModel | dict[str, Any]) -> dict[str, Any]:
 def _coerce_fix_proposals(
     fix_proposals: list[FixProposal | dict[str, Any]],
 ) -> list[dict[str, Any]]:
-    normalized: list[dict[str, Any]] = []
-    for fix_proposal in fix_proposals:
-        if isinstance(fix_proposal, dict):
-            normalized.append(FixProposal.model_validate(fix_proposal).model_dump(mode="json"))
-            continue
-        normalized.append(FixProposal.model_validate(fix_proposal).model_dump(mode="json"))
-
-    return normalized
+    return [
+        FixProposal.model_validate(fix_proposal).model_dump(mode="json")
+        for fix_proposal in fix_proposals
+    ]
 
 
 class _CosmosFixHistoryBackend:
-    def __init__(self, settings: FixHistoryCosmosSettings) -> None:
+    def __init__(
+        self, settings: FixHistoryCosmosSettings, *, retention: RetentionPolicy | None = None
+    ) -> None:
+        from azure.cosmos import CosmosClient
+
         self._settings = settings
+        self._retention = retention
         self._client = CosmosClient(url=settings.endpoint, credential=settings.key)
         database_client = self._client.create_database_if_not_exists(id=settings.database)
-        self._container_client = database_client.create_container_if_not_exists(
-            id=settings.container_fixes,
-            partition_key=PartitionKey(path="/failure_id"),
+        self._container_client = create_container_with_ttl(
+            database_client, settings.container_fixes
         )
 
     @classmethod
-    def from_env(cls) -> _CosmosFixHistoryBackend:
+    def from_env(cls, *, retention: RetentionPolicy | None = None) -> _CosmosFixHistoryBackend:
         settings = load_fix_history_settings_from_env()
         if settings is None:
             raise ValueError(
@@ -106,13 +110,22 @@ class _CosmosFixHistoryBackend:
                 "COSMOS_DATABASE, and COSMOS_CONTAINER_FIXES."
             )
 
-        return cls(settings)
+        return cls(settings, retention=retention)
+
+    def _with_ttl(self, document: dict[str, Any]) -> dict[str, Any]:
+        if self._retention is not None:
+            ttl_s = self._retention.ttl_s(retention_status(document["failure_event"]))
+            if ttl_s is not None:
+                document["ttl"] = ttl_s
+        return document
 
     def record_failure(
         self,
         failure_event: BaseModel | dict[str, Any],
         diagnosis: Diagnosis | dict[str, Any],
     ) -> None:
+        from azure.cosmos import exceptions
+
         failure_event_payload = _coerce_payload(failure_event)
         diagnosis_payload = Diagnosis.model_validate(diagnosis).model_dump(mode="json")
 
@@ -139,13 +152,15 @@ class _CosmosFixHistoryBackend:
             "sub_type": diagnosis_payload.get("sub_type"),
             "fix_proposals": existing_fix_proposals,
         }
-        self._container_client.upsert_item(document)
+        self._container_client.upsert_item(self._with_ttl(document))
 
     def record_fix(
         self,
         failure_id: str,
         fix_proposals: list[FixProposal | dict[str, Any]],
     ) -> None:
+        from azure.cosmos import exceptions
+
         normalized_failure_id = str(failure_id).strip()
         if not normalized_failure_id:
             raise ValueError("failure_id is required.")
@@ -161,6 +176,31 @@ class _CosmosFixHistoryBackend:
         document["fix_proposals"] = _coerce_fix_proposals(fix_proposals)
         self._container_client.upsert_item(document)
 
+    def record_batch(self, entries: Iterable[FixHistoryEntry]) -> None:
+        # Failure, diagnosis and fixes are known together, so each entry is a single
+        # upsert instead of the read-modify-write pairs of record_failure/record_fix.
+        for failure_event, diagnosis, fix_proposals in entries:
+            failure_event_payload = _coerce_payload(failure_event)
+            diagnosis_payload = Diagnosis.model_validate(diagnosis).model_dump(mode="json")
+
+            failure_id = str(failure_event_payload.get("failure_id", "")).strip()
+            if not failure_id:
+                raise ValueError("failure_event is missing 'failure_id'.")
+
+            self._container_client.upsert_item(
+                self._with_ttl(
+                    {
+                        "id": failure_id,
+                        "failure_id": failure_id,
+                        "failure_event": failure_event_payload,
+                        "diagnosis": diagnosis_payload,
+                        "root_cause": diagnosis_payload["root_cause"],
+                        "sub_type": diagnosis_payload.get("sub_type"),
+                        "fix_proposals": _coerce_fix_proposals(fix_proposals),
+                    }
+                )
+            )
+
     def find_similar(
         self,
         diagnosis: Diagnosis | dict[str, Any],
@@ -203,23 +243,40 @@ class _CosmosFixHistoryBackend:
 
 
 class FixHistory(FixHistoryLookup):
-    def __init__(self, backend: StoreBackend = "auto") -> None:
+    """Fix history on Cosmos or in memory, optionally bounded by a ``RetentionPolicy``.
+
+    Cosmos documents carry the ``ttl`` for their run status; the memory backend
+    enforces TTLs and the passed-run cap from a background sweeper.
+    """
+
+    def __init__(
+        self, backend: StoreBackend = "auto", *, retention: RetentionPolicy | None = None
+    ) -> None:
         backend_name = backend
         if backend == "auto":
             backend_name = "cosmos" if load_fix_history_settings_from_env() else "memory"
 
         if backend_name == "memory":
-            self._backend: _FixHistoryBackend = InMemoryFixHistory()
+            self._backend: _FixHistoryBackend = InMemoryFixHistory(retention=retention)
             self.backend_name = "memory"
             return
 
         if backend_name == "cosmos":
-            self._backend = _CosmosFixHistoryBackend.from_env()
+            self._backend = _CosmosFixHistoryBackend.from_env(retention=retention)
             self.backend_name = "cosmos"
             return
 
         raise ValueError(f"Unsupported backend '{backend}'.")
 
+    def apply_retention(self, *, now: float | None = None) -> RetentionReport:
+        if isinstance(self._backend, InMemoryFixHistory):
+            return self._backend.apply_retention(now=now)
+        return RetentionReport()
+
+    def close(self) -> None:
+        if isinstance(self._backend, InMemoryFixHistory):
+            self._backend.close()
+
     def record_failure(
         self,
         failure_event: BaseModel | dict[str, Any],
@@ -234,6 +291,9 @@ class FixHistory(FixHistoryLookup):
     ) -> None:
         self._backend.record_fix(failure_id, fix_proposals)
 
+    def record_batch(self, entries: Iterable[FixHistoryEntry]) -> None:
+        self._backend.record_batch(entries)
+
     def find_similar(
         self,
         diagnosis: Diagnosis | dict[str, Any],
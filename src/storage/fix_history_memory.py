@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import threading
+import time
+from collections.abc import Iterable
 from copy import deepcopy
 from typing import Any
 
@@ -8,6 +11,19 @@ from pydantic import BaseModel
 from src.models.diagnosis import Diagnosis
 from src.models.findings import FindingsReport
 from src.models.fixes import FixProposal
+from src.storage.retention import (
+    RetentionPolicy,
+    RetentionReport,
+    RetentionSweeper,
+    retention_status,
+)
+
+
+FixHistoryEntry = tuple[
+    BaseModel | dict[str, Any],
+    Diagnosis | dict[str, Any],
+    list[FixProposal | dict[str, Any]],
+]
 
 
 def _coerce_payload(value: BaseModel | dict[str, Any]) -> dict[str, Any]:
@@ -22,19 +38,98 @@ def _coerce_payload(value: BaseModel | dict[str, Any]) -> dict[str, Any]:
 def _coerce_fix_proposals(
     fix_proposals: list[FixProposal | dict[str, Any]],
 ) -> list[dict[str, Any]]:
-    normalized: list[dict[str, Any]] = []
-    for fix_proposal in fix_proposals:
-        if isinstance(fix_proposal, dict):
-            normalized.append(FixProposal.model_validate(fix_proposal).model_dump(mode="json"))
-            continue
-        normalized.append(FixProposal.model_validate(fix_proposal).model_dump(mode="json"))
-
-    return normalized
+    return [
+        FixProposal.model_validate(fix_proposal).model_dump(mode="json")
+        for fix_proposal in fix_proposals
+    ]
+
+
+def _history_document(
+    failure_id: str,
+    failure_event_payload: dict[str, Any],
+    diagnosis_payload: dict[str, Any],
+    fix_proposals: list[dict[str, Any]],
+) -> dict[str, Any]:
+    return {
+        "id": failure_id,
+        "failure_id": failure_id,
+        "failure_event": failure_event_payload,
+        "diagnosis": diagnosis_payload,
+        "root_cause": diagnosis_payload["root_cause"],
+        "sub_type": diagnosis_payload.get("sub_type"),
+        "fix_proposals": fix_proposals,
+    }
 
 
 class InMemoryFixHistory:
-    def __init__(self) -> None:
+    """Fix history held in process memory.
+
+    With a ``RetentionPolicy``, documents expire ``ttl_s`` seconds after their last
+    write and only the newest ``max_passed_runs`` passed runs are kept; a background
+    sweeper enforces both until ``close`` is called.
+    """
+
+    def __init__(self, *, retention: RetentionPolicy | None = None) -> None:
         self._documents: dict[str, dict[str, Any]] = {}
+        self._expires_at: dict[str, float] = {}
+        self._retention = retention
+        # Retention sweeps run on a background thread.
+        self._lock = threading.RLock()
+        self._sweeper: RetentionSweeper | None = None
+        if retention is not None and retention.sweep_interval_s is not None:
+            self._sweeper = RetentionSweeper(
+                self.apply_retention, retention.sweep_interval_s, name="fix-history-retention"
+            )
+            self._sweeper.start()
+
+    def close(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.stop()
+            self._sweeper = None
+
+    def _touch(self, failure_id: str) -> None:
+        ttl_s = None
+        if self._retention is not None:
+            failure_event = self._documents[failure_id]["failure_event"]
+            ttl_s = self._retention.ttl_s(retention_status(failure_event))
+        if ttl_s is None:
+            self._expires_at.pop(failure_id, None)
+        else:
+            self._expires_at[failure_id] = time.time() + ttl_s
+
+    def apply_retention(self, *, now: float | None = None) -> RetentionReport:
+        """Drop expired documents and passed runs beyond ``max_passed_runs``."""
+
+        report = RetentionReport()
+        if self._retention is None:
+            return report
+
+        now = time.time() if now is None else now
+        with self._lock:
+            for failure_id in [
+                failure_id
+                for failure_id, expires_at in self._expires_at.items()
+                if expires_at <= now
+            ]:
+                self._delete(failure_id)
+                report.expired += 1
+
+            max_passed_runs = self._retention.max_passed_runs
+            if max_passed_runs is not None:
+                # Documents are kept in the order they were first recorded.
+                passed = [
+                    failure_id
+                    for failure_id, document in self._documents.items()
+                    if retention_status(document["failure_event"]) == "passed"
+                ]
+                for failure_id in passed[: max(0, len(passed) - max_passed_runs)]:
+                    self._delete(failure_id)
+                    report.capped += 1
+        return report
+
+    def _delete(self, failure_id: str) -> None:
+        self._documents.pop(failure_id, None)
+        self._expires_at.pop(failure_id, None)
 
     def record_failure(
         self,
@@ -48,16 +143,15 @@ class InMemoryFixHistory:
         if not failure_id:
             raise ValueError("failure_event is missing 'failure_id'.")
 
-        existing = self._documents.get(failure_id, {})
-        self._documents[failure_id] = {
-            "id": failure_id,
-            "failure_id": failure_id,
-            "failure_event": failure_event_payload,
-            "diagnosis": diagnosis_payload,
-            "root_cause": diagnosis_payload["root_cause"],
-            "sub_type": diagnosis_payload.get("sub_type"),
-            "fix_proposals": deepcopy(existing.get("fix_proposals", [])),
-        }
+        with self._lock:
+            existing = self._documents.get(failure_id, {})
+            self._documents[failure_id] = _history_document(
+                failure_id,
+                failure_event_payload,
+                diagnosis_payload,
+                deepcopy(existing.get("fix_proposals", [])),
+            )
+            self._touch(failure_id)
 
     def record_fix(
         self,
@@ -67,12 +161,34 @@ class InMemoryFixHistory:
         normalized_failure_id = str(failure_id).strip()
         if not normalized_failure_id:
             raise ValueError("failure_id is required.")
-        if normalized_failure_id not in self._documents:
-            raise KeyError(f"Fix history '{normalized_failure_id}' not found.")
-
-        self._documents[normalized_failure_id]["fix_proposals"] = _coerce_fix_proposals(
-            fix_proposals
-        )
+        proposals = _coerce_fix_proposals(fix_proposals)
+        with self._lock:
+            if normalized_failure_id not in self._documents:
+                raise KeyError(f"Fix history '{normalized_failure_id}' not found.")
+
+            self._documents[normalized_failure_id]["fix_proposals"] = proposals
+            self._touch(normalized_failure_id)
+
+    def record_batch(self, entries: Iterable[FixHistoryEntry]) -> None:
+        """Record failures together with their diagnoses and fix proposals."""
+
+        for failure_event, diagnosis, fix_proposals in entries:
+            failure_event_payload = _coerce_payload(failure_event)
+            diagnosis_payload = Diagnosis.model_validate(diagnosis).model_dump(mode="json")
+
+            failure_id = str(failure_event_payload.get("failure_id", "")).strip()
+            if not failure_id:
+                raise ValueError("failure_event is missing 'failure_id'.")
+
+            document = _history_document(
+                failure_id,
+                failure_event_payload,
+                diagnosis_payload,
+                _coerce_fix_proposals(fix_proposals),
+            )
+            with self._lock:
+                self._documents[failure_id] = document
+                self._touch(failure_id)
 
     def find_similar(
         self,
@@ -91,14 +207,15 @@ class InMemoryFixHistory:
         target_sub_type = diagnosis_payload.get("sub_type")
 
         similar_failure_ids: list[str] = []
-        for failure_id, document in self._documents.items():
-            if document.get("root_cause") != target_root_cause:
-                continue
-            if document.get("sub_type") != target_sub_type:
-                continue
-
-            similar_failure_ids.append(failure_id)
-            if len(similar_failure_ids) >= limit:
-                break
+        with self._lock:
+            for failure_id, document in self._documents.items():
+                if document.get("root_cause") != target_root_cause:
+                    continue
+                if document.get("sub_type") != target_sub_type:
+                    continue
+
+                similar_failure_ids.append(failure_id)
+                if len(similar_failure_ids) >= limit:
+                    break
 
         return similar_failure_ids
@@ -0,0 +1,165 @@
+"""Compression and blob offloading for large step ``input``/``output`` payloads.
+
+An encoded payload is replaced in the stored trace by a marker::
+
+    {"$payload": {"codec": "gzip", "size": 81234, "data": "<base64>"}}
+    {"$payload": {"codec": "gzip", "size": 912345, "blob": "<sha256>"}}
+
+``data`` holds the compressed JSON inline; ``blob`` names a compressed blob in a
+``BlobStore``, so identical payloads are stored once. zstd needs the optional
+``zstandard`` package (the ``zstd`` extra).
+"""
+
+from __future__ import annotations
+
+import base64
+import gzip
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.storage.blob_store import BlobStore
+from src.storage.serialization import dumps, loads
+
+
+PAYLOAD_MARKER = "$payload"
+_STEP_PAYLOAD_KEYS = ("input", "output")
+
+
+def default_codec() -> str:
+    try:
+        import zstandard  # noqa: F401
+    except ModuleNotFoundError:
+        return "gzip"
+    return "zstd"
+
+
+def _zstandard() -> Any:
+    try:
+        import zstandard
+    except ModuleNotFoundError as exc:
+        raise RuntimeError(
+            "zstd payloads require the 'zstandard' package. Install the 'zstd' extra."
+        ) from exc
+    return zstandard
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return _zstandard().ZstdCompressor().compress(data)
+    if codec == "gzip":
+        # A fixed mtime keeps the output, and so the blob digest, deterministic.
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    raise ValueError(f"Unsupported payload codec '{codec}'.")
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return _zstandard().ZstdDecompressor().decompress(data)
+    if codec == "gzip":
+        return gzip.decompress(data)
+    raise ValueError(f"Unsupported payload codec '{codec}'.")
+
+
+@dataclass(frozen=True)
+class PayloadPolicy:
+    """Size thresholds for encoding step payloads.
+
+    Payloads of at least ``compress_threshold_bytes`` of JSON are compressed, and
+    compressed payloads of at least ``offload_threshold_bytes`` go to the blob store.
+    """
+
+    compress_threshold_bytes: int = 16 * 1024
+    offload_threshold_bytes: int = 256 * 1024
+    codec: str = field(default_factory=default_codec)
+
+    def __post_init__(self) -> None:
+        if self.compress_threshold_bytes < 1 or self.offload_threshold_bytes < 1:
+            raise ValueError("Payload thresholds must be positive.")
+        if self.codec not in ("gzip", "zstd"):
+            raise ValueError(f"Unsupported payload codec '{self.codec}'.")
+
+
+def is_payload_marker(value: Any) -> bool:
+    return isinstance(value, dict) and len(value) == 1 and PAYLOAD_MARKER in value
+
+
+def encode_payload(
+    value: dict[str, Any], policy: PayloadPolicy, blob_store: BlobStore | None
+) -> dict[str, Any]:
+    """``value`` itself when small, otherwise a marker for its compressed form."""
+
+    raw = dumps(value)
+    if len(raw) < policy.compress_threshold_bytes:
+        return value
+
+    compressed = compress(raw, policy.codec)
+    marker: dict[str, Any] = {"codec": policy.codec, "size": len(raw)}
+    if blob_store is not None and len(compressed) >= policy.offload_threshold_bytes:
+        marker["blob"] = blob_store.put(compressed)
+    else:
+        marker["data"] = base64.b64encode(compressed).decode("ascii")
+    return {PAYLOAD_MARKER: marker}
+
+
+def decode_payload(marker: Mapping[str, Any], blob_store: BlobStore | None) -> dict[str, Any]:
+    spec = marker[PAYLOAD_MARKER]
+    if "blob" in spec:
+        if blob_store is None:
+            raise ValueError(
+                f"Payload is stored in blob '{spec['blob']}' but no blob store is set."
+            )
+        compressed = blob_store.get(str(spec["blob"]))
+    else:
+        compressed = base64.b64decode(spec["data"])
+    return loads(decompress(compressed, str(spec["codec"])))
+
+
+def encode_trace_payloads(
+    trace_record: dict[str, Any], policy: PayloadPolicy, blob_store: BlobStore | None
+) -> tuple[dict[str, Any], bool]:
+    """Trace record with large step payloads encoded, and whether any was."""
+
+    steps = trace_record.get("steps")
+    if not isinstance(steps, list):
+        return trace_record, False
+
+    encoded_any = False
+    encoded_steps: list[Any] = []
+    for step in steps:
+        if isinstance(step, dict):
+            for key in _STEP_PAYLOAD_KEYS:
+                value = step.get(key)
+                if isinstance(value, dict):
+                    encoded = encode_payload(value, policy, blob_store)
+                    if encoded is not value:
+                        step = {**step, key: encoded}
+                        encoded_any = True
+        encoded_steps.append(step)
+    return {**trace_record, "steps": encoded_steps}, encoded_any
+
+
+def resolve_trace_payloads(
+    trace_record: dict[str, Any], blob_store: BlobStore | None
+) -> dict[str, Any]:
+    """Replace payload markers in ``trace_record`` with their decoded payloads, in place."""
+
+    for step in trace_record.get("steps") or ():
+        if isinstance(step, dict):
+            for key in _STEP_PAYLOAD_KEYS:
+                if is_payload_marker(step.get(key)):
+                    step[key] = decode_payload(step[key], blob_store)
+    return trace_record
+
+
+def trace_blob_digests(trace_record: Mapping[str, Any]) -> set[str]:
+    """Digests of the blobs that payload markers in ``trace_record`` reference."""
+
+    digests: set[str] = set()
+    for step in trace_record.get("steps") or ():
+        if isinstance(step, dict):
+            for key in _STEP_PAYLOAD_KEYS:
+                value = step.get(key)
+                if is_payload_marker(value) and "blob" in value[PAYLOAD_MARKER]:
+                    digests.add(str(value[PAYLOAD_MARKER]["blob"]))
+    return digests
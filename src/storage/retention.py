@@ -0,0 +1,117 @@
+"""Retention policies shared by the trace store and fix history backends.
+
+Cosmos containers enforce ``ttl`` themselves, so documents only carry the
+seconds to live. The in-memory backends mirror that by sweeping expired
+documents, capping passed runs and compacting old traces on a background
+thread (see ``RetentionSweeper``).
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """How long stored documents live, keyed by run status (``passed``, ``failed``, ...).
+
+    TTLs count from the last write, as Cosmos does. ``compact_after_s`` drops step
+    outputs from traces that old which already have cached findings; the failure
+    event and the findings are kept. Payload blobs no stored trace references are
+    deleted once they are ``orphan_blob_grace_s`` old.
+    """
+
+    ttl_s_by_status: Mapping[str, int] = field(default_factory=dict)
+    default_ttl_s: int | None = None
+    max_passed_runs: int | None = None
+    compact_after_s: int | None = None
+    sweep_interval_s: float | None = 60.0
+    orphan_blob_grace_s: float = 3600.0
+
+    def __post_init__(self) -> None:
+        limits = (
+            *self.ttl_s_by_status.values(),
+            self.default_ttl_s,
+            self.compact_after_s,
+            self.sweep_interval_s,
+            self.orphan_blob_grace_s,
+        )
+        if any(limit is not None and limit <= 0 for limit in limits):
+            raise ValueError("Retention TTLs and intervals must be positive.")
+        if self.max_passed_runs is not None and self.max_passed_runs < 0:
+            raise ValueError("max_passed_runs must not be negative.")
+
+    def ttl_s(self, status: str | None) -> int | None:
+        if status is not None and status in self.ttl_s_by_status:
+            return int(self.ttl_s_by_status[status])
+        return int(self.default_ttl_s) if self.default_ttl_s is not None else None
+
+
+@dataclass
+class RetentionReport:
+    expired: int = 0
+    capped: int = 0
+    compacted: int = 0
+    blobs_deleted: int = 0
+
+
+def retention_status(failure_event: Mapping[str, Any]) -> str:
+    """Run status of a failure event, for documents that do not store a trace status."""
+
+    failure_type = failure_event.get("failure_type")
+    if failure_type == "none":
+        return "passed"
+    if failure_type == "hallucination_flag":
+        return "hallucinated"
+    return "failed"
+
+
+def compact_trace_record(trace_record: Mapping[str, Any]) -> dict[str, Any]:
+    """Copy of ``trace_record`` without step outputs; names, inputs and errors are kept."""
+
+    steps = trace_record.get("steps")
+    compacted = dict(trace_record)
+    if isinstance(steps, list):
+        compacted["steps"] = [
+            {**step, "output": None} if isinstance(step, dict) else step for step in steps
+        ]
+    return compacted
+
+
+class RetentionSweeper:
+    """Call ``sweep`` every ``interval_s`` seconds on a daemon thread until stopped."""
+
+    def __init__(self, sweep: Callable[[], object], interval_s: float, *, name: str) -> None:
+        if interval_s <= 0:
+            raise ValueError("interval_s must be positive.")
+
+        self._sweep = sweep
+        self._interval_s = interval_s
+        self._name = name
+        self._stop: threading.Event | None = None
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        stop_event = threading.Event()
+
+        def _run() -> None:
+            while not stop_event.wait(self._interval_s):
+                self._sweep()
+
+        self._stop = stop_event
+        self._thread = threading.Thread(target=_run, name=self._name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._stop is not None:
+            self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._stop = None
+        self._thread = None
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+    orjson = None  # type: ignore[assignment]
+
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def dumps(value: Any, *, sort_keys: bool = False) -> bytes:
+    """Encode compact UTF-8 JSON; orjson when installed, the stdlib otherwise.
+
+    The two paths can differ in their bytes (orjson writes ``1e16`` where the stdlib
+    writes ``1e+16``, and formats datetimes natively), though both decode to the same
+    data. Use ``canonical_dumps`` for anything that is hashed.
+    """
+
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(value, default=str, option=option)
+
+    return _stdlib_dumps(value, sort_keys=sort_keys)
+
+
+def canonical_dumps(value: Any) -> bytes:
+    """Sorted, compact UTF-8 JSON that is byte-identical whether or not orjson is installed.
+
+    Digests over this output (cache keys, fingerprints) agree across workers.
+    """
+
+    return _stdlib_dumps(value, sort_keys=True)
+
+
+def _stdlib_dumps(value: Any, *, sort_keys: bool) -> bytes:
+    return json.dumps(
+        value,
+        sort_keys=sort_keys,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    ).encode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def to_json_payload(value: BaseModel | dict[str, Any]) -> dict[str, Any]:
+    """JSON-mode dict for a model or dict, without copying dicts that are already plain."""
+
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, dict):
+        return value
+
+    raise TypeError("Payloads must be dicts or pydantic models.")
+
+
+class EncodedDocument:
+    """An immutable stored document that is serialized at most once.
+
+    ``payload`` must not be mutated after construction; ``encoded`` is computed on
+    first use and reused by every backend write and digest.
+    """
+
+    __slots__ = ("payload", "_encoded")
+
+    def __init__(self, payload: dict[str, Any], *, encoded: bytes | None = None) -> None:
+        self.payload = payload
+        self._encoded = encoded
+
+    @classmethod
+    def from_bytes(cls, encoded: bytes) -> EncodedDocument:
+        return cls(loads(encoded), encoded=encoded)
+
+    @property
+    def encoded(self) -> bytes:
+        if self._encoded is None:
+            self._encoded = dumps(self.payload)
+        return self._encoded
+
+    def decode(self) -> dict[str, Any]:
+        """A fresh, caller-owned copy of the document."""
+
+        return loads(self.encoded)
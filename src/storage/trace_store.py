@@ -1,50 +1,409 @@
 from __future__ import annotations
 
-from copy import deepcopy
+import bisect
+import math
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from typing import Any, Literal, Protocol
 
 from pydantic import BaseModel
 
+from src.models.compact_trace import CompactTrace
+from src.storage.blob_store import BlobStore, collect_blobs
+from src.storage.payloads import (
+    PayloadPolicy,
+    encode_trace_payloads,
+    resolve_trace_payloads,
+    trace_blob_digests,
+)
+from src.storage.retention import (
+    RetentionPolicy,
+    RetentionReport,
+    RetentionSweeper,
+    compact_trace_record,
+)
+from src.storage.serialization import EncodedDocument, dumps, loads, to_json_payload
+
 StoreBackend = Literal["auto", "memory", "cosmos"]
 
+# Top-level document fields that list_traces can filter on.
+_INDEXED_FIELDS = ("subject", "status", "failure_type")
+
+
+def canonical_timestamp(value: datetime | str) -> str:
+    """UTC RFC 3339 with microseconds, so stored timestamps sort as plain strings."""
+
+    moment = value if isinstance(value, datetime) else datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _document_timestamp(*candidates: Any) -> str | None:
+    for candidate in candidates:
+        if isinstance(candidate, str) and candidate:
+            try:
+                return canonical_timestamp(candidate)
+            except ValueError:
+                continue
+    return None
+
+
+@dataclass(frozen=True)
+class TraceQuery:
+    """Filters for ``TraceStore.list_traces``; ``since`` is inclusive, ``until`` exclusive."""
+
+    subject: str | None = None
+    status: str | None = None
+    failure_type: str | None = None
+    since: str | None = None
+    until: str | None = None
+
+    def equality_filters(self) -> dict[str, str]:
+        return {
+            name: value for name in _INDEXED_FIELDS if (value := getattr(self, name)) is not None
+        }
+
+
+@dataclass
+class TracePage:
+    """One page of stored traces, oldest first; pass ``continuation`` back for the next."""
+
+    items: list[dict[str, Any]] = field(default_factory=list)
+    continuation: str | None = None
+
 
 class _TraceBackend(Protocol):
-    def store(self, document: dict[str, Any]) -> None: ...
+    def store(self, document: EncodedDocument) -> None: ...
 
     def get(self, failure_id: str) -> dict[str, Any]: ...
 
+    def get_many(self, failure_ids: Sequence[str]) -> dict[str, dict[str, Any]]: ...
+
+    def update(self, failure_id: str, fields: dict[str, Any]) -> None: ...
+
+    def query(
+        self, query: TraceQuery, *, limit: int, continuation: str | None
+    ) -> tuple[list[dict[str, Any]], str | None]: ...
+
+    def blob_refs(self) -> set[str]: ...
+
 
 class _InMemoryTraceBackend:
-    def __init__(self) -> None:
-        self._documents: dict[str, dict[str, Any]] = {}
+    """Keeps each document as encoded JSON bytes; every read decodes a fresh copy.
 
-    def store(self, document: dict[str, Any]) -> None:
-        failure_id = str(document["failure_id"])
-        self._documents[failure_id] = deepcopy(document)
+    Queries are served from in-memory indexes: one ``failure_id`` set per value of
+    each indexed field, and a ``(timestamp, failure_id)`` timeline kept sorted.
+    A document's ``ttl`` counts from its last write, as in Cosmos, and is enforced
+    by ``apply_retention``.
+    """
+
+    def __init__(self) -> None:
+        self._documents: dict[str, bytes] = {}
+        self._index_entries: dict[str, tuple[tuple[str, str], dict[str, str]]] = {}
+        self._field_index: dict[str, dict[str, set[str]]] = {name: {} for name in _INDEXED_FIELDS}
+        self._timeline: list[tuple[str, str]] = []
+        self._written_at: dict[str, float] = {}
+        self._expires_at: dict[str, float] = {}
+        self._compacted: set[str] = set()
+        # Only traces whose findings are cached can be compacted.
+        self._with_findings: set[str] = set()
+        self._blob_refs: dict[str, set[str]] = {}
+        # Retention sweeps run on a background thread.
+        self._lock = threading.RLock()
+
+    def store(self, document: EncodedDocument) -> None:
+        failure_id = str(document.payload["failure_id"])
+        with self._lock:
+            self._documents[failure_id] = document.encoded
+            self._reindex(failure_id, document.payload)
+            self._compacted.discard(failure_id)
+            self._touch(failure_id, document.payload)
+
+    def _touch(self, failure_id: str, document: dict[str, Any]) -> None:
+        now = time.time()
+        self._written_at[failure_id] = now
+        ttl_s = document.get("ttl")
+        if isinstance(ttl_s, (int, float)) and ttl_s > 0:
+            self._expires_at[failure_id] = now + ttl_s
+        else:
+            self._expires_at.pop(failure_id, None)
+        if isinstance(document.get("findings_cache"), dict):
+            self._with_findings.add(failure_id)
+        else:
+            self._with_findings.discard(failure_id)
+        self._track_blobs(failure_id, document)
+
+    def _track_blobs(self, failure_id: str, document: dict[str, Any]) -> None:
+        digests = (
+            trace_blob_digests(document["trace_record"])
+            if document.get("encoded_payloads")
+            else set()
+        )
+        if digests:
+            self._blob_refs[failure_id] = digests
+        else:
+            self._blob_refs.pop(failure_id, None)
+
+    def _reindex(self, failure_id: str, document: dict[str, Any]) -> None:
+        previous = self._index_entries.pop(failure_id, None)
+        if previous is not None:
+            position, values = previous
+            del self._timeline[bisect.bisect_left(self._timeline, position)]
+            for name, value in values.items():
+                self._field_index[name][value].discard(failure_id)
+
+        # Documents without a timestamp sort first and never match a time range.
+        position = (str(document.get("timestamp") or ""), failure_id)
+        values = {
+            name: str(document[name]) for name in _INDEXED_FIELDS if document.get(name) is not None
+        }
+        bisect.insort(self._timeline, position)
+        for name, value in values.items():
+            self._field_index[name].setdefault(value, set()).add(failure_id)
+        self._index_entries[failure_id] = (position, values)
 
     def get(self, failure_id: str) -> dict[str, Any]:
-        if failure_id not in self._documents:
+        encoded = self._documents.get(failure_id)
+        if encoded is None:
             raise KeyError(f"Trace '{failure_id}' not found.")
 
-        return deepcopy(self._documents[failure_id])
+        return loads(encoded)
+
+    def get_many(self, failure_ids: Sequence[str]) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            encoded = {
+                failure_id: self._documents[failure_id]
+                for failure_id in failure_ids
+                if failure_id in self._documents
+            }
+        return {failure_id: loads(document) for failure_id, document in encoded.items()}
+
+    def update(self, failure_id: str, fields: dict[str, Any]) -> None:
+        with self._lock:
+            if failure_id not in self._documents:
+                raise KeyError(f"Trace '{failure_id}' not found.")
+
+            document = loads(self._documents[failure_id])
+            document.update(fields)
+            self._documents[failure_id] = dumps(document)
+            if "timestamp" in fields or any(name in fields for name in _INDEXED_FIELDS):
+                self._reindex(failure_id, document)
+            self._touch(failure_id, document)
+
+    def delete(self, failure_id: str) -> None:
+        with self._lock:
+            self._documents.pop(failure_id, None)
+            self._written_at.pop(failure_id, None)
+            self._expires_at.pop(failure_id, None)
+            self._compacted.discard(failure_id)
+            self._with_findings.discard(failure_id)
+            self._blob_refs.pop(failure_id, None)
+            entry = self._index_entries.pop(failure_id, None)
+            if entry is not None:
+                position, values = entry
+                del self._timeline[bisect.bisect_left(self._timeline, position)]
+                for name, value in values.items():
+                    self._field_index[name][value].discard(failure_id)
+
+    def apply_retention(
+        self, policy: RetentionPolicy, *, now: float | None = None
+    ) -> RetentionReport:
+        """Drop expired traces, cap passed runs and compact traces past ``compact_after_s``.
+
+        Only traces with cached findings are compacted.
+        """
+
+        now = time.time() if now is None else now
+        report = RetentionReport()
+        with self._lock:
+            for failure_id in [
+                failure_id
+                for failure_id, expires_at in self._expires_at.items()
+                if expires_at <= now
+            ]:
+                self.delete(failure_id)
+                report.expired += 1
+
+            passed = self._field_index["status"].get("passed", set())
+            if policy.max_passed_runs is not None and len(passed) > policy.max_passed_runs:
+                oldest = sorted(self._index_entries[failure_id][0] for failure_id in passed)
+                for _, failure_id in oldest[: len(passed) - policy.max_passed_runs]:
+                    self.delete(failure_id)
+                    report.capped += 1
+
+            if policy.compact_after_s is not None:
+                cutoff = now - policy.compact_after_s
+                # Traces without cached findings keep their outputs until findings are
+                # stored; re-analyzing stripped steps would produce different findings.
+                for failure_id, written_at in list(self._written_at.items()):
+                    if (
+                        written_at > cutoff
+                        or failure_id in self._compacted
+                        or failure_id not in self._with_findings
+                    ):
+                        continue
+                    document = loads(self._documents[failure_id])
+                    document["trace_record"] = compact_trace_record(document["trace_record"])
+                    document["compacted"] = True
+                    self._documents[failure_id] = dumps(document)
+                    self._track_blobs(failure_id, document)
+                    self._compacted.add(failure_id)
+                    report.compacted += 1
+        return report
+
+    def query(
+        self, query: TraceQuery, *, limit: int, continuation: str | None
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        with self._lock:
+            page = self._query_page(query, limit=limit, continuation=continuation)
+            encoded = [self._documents[failure_id] for _, failure_id in page[:limit]]
+
+        next_token = None
+        if len(page) > limit:
+            timestamp, failure_id = page[limit - 1]
+            next_token = f"{timestamp}|{failure_id}"
+        return [loads(document) for document in encoded], next_token
+
+    def blob_refs(self) -> set[str]:
+        with self._lock:
+            return set().union(*self._blob_refs.values())
+
+    def _query_page(
+        self, query: TraceQuery, *, limit: int, continuation: str | None
+    ) -> list[tuple[str, str]]:
+        start = 0
+        if query.since is not None:
+            start = bisect.bisect_left(self._timeline, (query.since, ""))
+        elif query.until is not None:
+            # Skip the documents without a timestamp, which sort first, as Cosmos does.
+            start = bisect.bisect_left(self._timeline, ("\0", ""))
+        if continuation is not None:
+            timestamp, _, failure_id = continuation.partition("|")
+            start = max(start, bisect.bisect_right(self._timeline, (timestamp, failure_id)))
+        end = len(self._timeline)
+        if query.until is not None:
+            end = bisect.bisect_left(self._timeline, (query.until, ""))
+
+        # One extra match tells whether another page follows.
+        return self._matching_positions(query, start, end, limit + 1)
+
+    def _matching_positions(
+        self, query: TraceQuery, start: int, end: int, count: int
+    ) -> list[tuple[str, str]]:
+        if start >= end:
+            return []
+        id_sets = sorted(
+            (
+                self._field_index[name].get(value, set())
+                for name, value in query.equality_filters().items()
+            ),
+            key=len,
+        )
+        if not id_sets:
+            return self._timeline[start : min(end, start + count)]
+
+        smallest, others = id_sets[0], id_sets[1:]
+        window = end - start
+        # Scanning the timeline visits about count * window / len(smallest) positions;
+        # sorting the candidates instead costs len(smallest) * log(len(smallest)).
+        expected_scan = min(window, count * window / max(1, len(smallest)))
+        if len(smallest) * math.log2(len(smallest) + 1) < expected_scan:
+            low = self._timeline[start]
+            high = self._timeline[end] if end < len(self._timeline) else None
+            positions = (
+                self._index_entries[failure_id][0]
+                for failure_id in smallest
+                if all(failure_id in ids for ids in others)
+            )
+            candidates = sorted(
+                position
+                for position in positions
+                if position >= low and (high is None or position < high)
+            )
+            return candidates[:count]
+
+        matches: list[tuple[str, str]] = []
+        for index in range(start, end):
+            position = self._timeline[index]
+            if all(position[1] in ids for ids in id_sets):
+                matches.append(position)
+                if len(matches) == count:
+                    break
+        return matches
 
 
 class _CosmosTraceBackend:
     def __init__(self, client: Any) -> None:
         self._client = client
 
-    def store(self, document: dict[str, Any]) -> None:
-        self._client.upsert_trace_document(document)
+    def store(self, document: EncodedDocument) -> None:
+        # The Cosmos SDK serializes request bodies itself and does not accept bytes.
+        self._client.upsert_trace_document(document.payload)
 
     def get(self, failure_id: str) -> dict[str, Any]:
         return self._client.get_trace_document(failure_id)
 
-
-def _coerce_payload(value: BaseModel | dict[str, Any]) -> dict[str, Any]:
-    if isinstance(value, BaseModel):
-        return value.model_dump()
-    if isinstance(value, dict):
-        return deepcopy(value)
+    def get_many(self, failure_ids: Sequence[str]) -> dict[str, dict[str, Any]]:
+        return self._client.get_trace_documents(failure_ids)
+
+    def update(self, failure_id: str, fields: dict[str, Any]) -> None:
+        self._client.patch_trace_document(failure_id, fields)
+
+    def query(
+        self, query: TraceQuery, *, limit: int, continuation: str | None
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        conditions: list[str] = []
+        parameters: list[dict[str, Any]] = []
+        for name, value in query.equality_filters().items():
+            conditions.append(f"c.{name} = @{name}")
+            parameters.append({"name": f"@{name}", "value": value})
+        if query.since is not None:
+            conditions.append("c.timestamp >= @since")
+            parameters.append({"name": "@since", "value": query.since})
+        if query.until is not None:
+            conditions.append("c.timestamp < @until")
+            parameters.append({"name": "@until", "value": query.until})
+
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self._client.query_trace_documents(
+            f"SELECT * FROM c{where} ORDER BY c.timestamp",
+            parameters,
+            max_item_count=limit,
+            continuation=continuation,
+        )
+
+    def blob_refs(self) -> set[str]:
+        # Undefined properties are left out of each row, so a row lists only the
+        # blobs its step actually references.
+        query = (
+            'SELECT s.input["$payload"].blob AS input_blob, '
+            's.output["$payload"].blob AS output_blob '
+            "FROM c JOIN s IN c.trace_record.steps WHERE c.encoded_payloads = true"
+        )
+        digests: set[str] = set()
+        continuation: str | None = None
+        while True:
+            rows, continuation = self._client.query_trace_documents(
+                query, [], max_item_count=1000, continuation=continuation
+            )
+            for row in rows:
+                digests.update(
+                    str(row[key]) for key in ("input_blob", "output_blob") if row.get(key)
+                )
+            if continuation is None:
+                return digests
+
+
+def _coerce_payload(value: BaseModel | CompactTrace | dict[str, Any]) -> dict[str, Any]:
+    # Backends encode on write and decode on read, so caller dicts are never aliased.
+    if isinstance(value, CompactTrace):
+        value = value.to_wire()
+    if isinstance(value, (BaseModel, dict)):
+        return to_json_payload(value)
 
     raise TypeError("TraceStore payloads must be dicts or pydantic models.")
 
@@ -70,7 +429,31 @@ def _create_cosmos_backend() -> _TraceBackend:
 
 
 class TraceStore:
-    def __init__(self, backend: StoreBackend = "auto") -> None:
+    """Stored failure traces, optionally bounded by a ``RetentionPolicy``.
+
+    Every document carries the ``ttl`` for its run status, which Cosmos enforces
+    natively. The memory backend enforces it, along with the passed-run cap and
+    compaction, from a background sweeper; call ``close`` to stop it.
+
+    With a ``PayloadPolicy``, large step payloads are compressed and the largest are
+    offloaded to ``blob_store`` (see ``src.storage.payloads``). Reads decode them
+    unless ``resolve_payloads=False``, in which case ``resolve_payloads()`` fetches
+    them later. Blobs no stored trace references are deleted by ``collect_blobs``,
+    which the retention sweep runs.
+    """
+
+    def __init__(
+        self,
+        backend: StoreBackend = "auto",
+        *,
+        retention: RetentionPolicy | None = None,
+        payloads: PayloadPolicy | None = None,
+        blob_store: BlobStore | None = None,
+    ) -> None:
+        self._retention = retention
+        self._payloads = payloads
+        self._blob_store = blob_store
+        self._sweeper: RetentionSweeper | None = None
         backend_name = backend
         if backend == "auto":
             backend_name = "cosmos" if _cosmos_settings_available() else "memory"
@@ -78,19 +461,68 @@ class TraceStore:
         if backend_name == "memory":
             self._backend: _TraceBackend = _InMemoryTraceBackend()
             self.backend_name = "memory"
-            return
-
-        if backend_name == "cosmos":
+        elif backend_name == "cosmos":
             self._backend = _create_cosmos_backend()
             self.backend_name = "cosmos"
-            return
-
-        raise ValueError(f"Unsupported backend '{backend}'.")
+        else:
+            raise ValueError(f"Unsupported backend '{backend}'.")
+
+        # Cosmos needs no sweeper for documents, only for collecting their blobs.
+        if (
+            retention is not None
+            and retention.sweep_interval_s is not None
+            and (self.backend_name == "memory" or blob_store is not None)
+        ):
+            self._sweeper = RetentionSweeper(
+                self.apply_retention, retention.sweep_interval_s, name="trace-store-retention"
+            )
+            self._sweeper.start()
+
+    def close(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.stop()
+            self._sweeper = None
+
+    def apply_retention(self, *, now: float | None = None) -> RetentionReport:
+        """Run one retention sweep, then ``collect_blobs``.
+
+        Cosmos expires documents itself, so only the blob collection runs there.
+        """
+
+        if self._retention is None:
+            return RetentionReport()
+        if isinstance(self._backend, _InMemoryTraceBackend):
+            report = self._backend.apply_retention(self._retention, now=now)
+        else:
+            report = RetentionReport()
+        report.blobs_deleted = self.collect_blobs(now=now)
+        return report
+
+    def collect_blobs(self, *, now: float | None = None) -> int:
+        """Delete payload blobs that no stored trace references; return how many.
+
+        Expired, capped and compacted traces release their blobs here. Blobs written
+        in the last ``orphan_blob_grace_s`` are kept, because a trace puts its blobs
+        before its document is stored. The blob store must not be shared with
+        another trace store.
+        """
+
+        if self._blob_store is None:
+            return 0
+
+        grace_s = (
+            self._retention.orphan_blob_grace_s
+            if self._retention is not None
+            else RetentionPolicy.orphan_blob_grace_s
+        )
+        written_before = (time.time() if now is None else now) - grace_s
+        live = self._backend.blob_refs()
+        return collect_blobs(self._blob_store, live, written_before=written_before)
 
     def store_trace(
         self,
         failure_event: BaseModel | dict[str, Any],
-        trace_record: BaseModel | dict[str, Any],
+        trace_record: BaseModel | CompactTrace | dict[str, Any],
     ) -> None:
         failure_event_payload = _coerce_payload(failure_event)
         trace_record_payload = _coerce_payload(trace_record)
@@ -110,15 +542,140 @@ class TraceStore:
             "id": failure_id,
             "failure_id": failure_id,
             "subject": subject,
+            "status": trace_record_payload.get("status"),
+            "failure_type": failure_event_payload.get("failure_type"),
+            "timestamp": _document_timestamp(
+                failure_event_payload.get("timestamp"),
+                trace_record_payload.get("ended_at"),
+                trace_record_payload.get("started_at"),
+            ),
             "failure_event": failure_event_payload,
             "trace_record": trace_record_payload,
         }
-        self._backend.store(document)
+        if self._payloads is not None:
+            encoded_record, encoded = encode_trace_payloads(
+                trace_record_payload, self._payloads, self._blob_store
+            )
+            if encoded:
+                document["trace_record"] = encoded_record
+                document["encoded_payloads"] = True
+        if self._retention is not None:
+            ttl_s = self._retention.ttl_s(trace_record_payload.get("status"))
+            if ttl_s is not None:
+                document["ttl"] = ttl_s
+        self._backend.store(EncodedDocument(document))
+
+    def get_trace(self, failure_id: str, *, resolve_payloads: bool = True) -> dict[str, Any]:
+        return self._stored_trace(self._backend.get(failure_id), resolve_payloads)
+
+    def get_traces(
+        self, failure_ids: Sequence[str], *, resolve_payloads: bool = True
+    ) -> dict[str, dict[str, Any]]:
+        """Batch variant of ``get_trace``; failure_ids that are not stored are omitted."""
+
+        documents = self._backend.get_many(list(dict.fromkeys(failure_ids)))
+        return {
+            failure_id: self._stored_trace(document, resolve_payloads)
+            for failure_id, document in documents.items()
+        }
 
-    def get_trace(self, failure_id: str) -> dict[str, Any]:
-        document = self._backend.get(failure_id)
+    def resolve_payloads(self, stored_trace: dict[str, Any]) -> dict[str, Any]:
+        """Decode the encoded step payloads of a trace read with ``resolve_payloads=False``."""
 
-        return {
-            "failure_event": deepcopy(document["failure_event"]),
-            "trace_record": deepcopy(document["trace_record"]),
+        if stored_trace.pop("encoded_payloads", False):
+            resolve_trace_payloads(stored_trace["trace_record"], self._blob_store)
+        return stored_trace
+
+    def _stored_trace(self, document: dict[str, Any], resolve_payloads: bool) -> dict[str, Any]:
+        # Backends hand out freshly decoded documents, so no defensive copies are needed.
+        stored_trace = {
+            "failure_event": document["failure_event"],
+            "trace_record": document["trace_record"],
         }
+        if isinstance(document.get("findings_cache"), dict):
+            stored_trace["findings_cache"] = document["findings_cache"]
+        if document.get("compacted"):
+            stored_trace["compacted"] = True
+        if document.get("encoded_payloads"):
+            stored_trace["encoded_payloads"] = True
+            if resolve_payloads:
+                self.resolve_payloads(stored_trace)
+        return stored_trace
+
+    def store_findings(
+        self,
+        failure_id: str,
+        cache_key: str,
+        findings_report: BaseModel | dict[str, Any],
+    ) -> None:
+        """Persist analyzer findings beside the trace, tagged with their input cache key."""
+
+        findings_payload = _coerce_payload(findings_report)
+        self._backend.update(
+            failure_id,
+            {"findings_cache": {"key": cache_key, "findings": findings_payload}},
+        )
+
+    def list_traces(
+        self,
+        *,
+        subject: str | None = None,
+        status: str | None = None,
+        failure_type: str | None = None,
+        since: datetime | str | None = None,
+        until: datetime | str | None = None,
+        limit: int = 100,
+        continuation: str | None = None,
+        resolve_payloads: bool = True,
+    ) -> TracePage:
+        """One page of stored traces matching every given filter, oldest first.
+
+        ``since`` is inclusive and ``until`` exclusive. Pass the returned
+        ``continuation`` to fetch the next page; it is ``None`` on the last one.
+        """
+
+        if limit < 1:
+            raise ValueError("limit must be positive.")
+
+        query = TraceQuery(
+            subject=subject,
+            status=status,
+            failure_type=failure_type,
+            since=canonical_timestamp(since) if since is not None else None,
+            until=canonical_timestamp(until) if until is not None else None,
+        )
+        documents, next_token = self._backend.query(query, limit=limit, continuation=continuation)
+        return TracePage(
+            items=[self._stored_trace(document, resolve_payloads) for document in documents],
+            continuation=next_token,
+        )
+
+    def iter_traces(
+        self,
+        *,
+        subject: str | None = None,
+        status: str | None = None,
+        failure_type: str | None = None,
+        since: datetime | str | None = None,
+        until: datetime | str | None = None,
+        page_size: int = 100,
+        resolve_payloads: bool = True,
+    ) -> Iterator[dict[str, Any]]:
+        """Stream every matching trace, holding at most one page in memory."""
+
+        continuation: str | None = None
+        while True:
+            page = self.list_traces(
+                subject=subject,
+                status=status,
+                failure_type=failure_type,
+                since=since,
+                until=until,
+                limit=page_size,
+                continuation=continuation,
+                resolve_payloads=resolve_payloads,
+            )
+            yield from page.items
+            if page.continuation is None:
+                return
+            continuation = page.continuation
@@ -0,0 +1,428 @@
+from __future__ import annotations
+
+import gzip
+import json
+import random
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Protocol
+
+from src.models.diagnosis import FailureTaxonomy
+from src.subjects.booking_agent import booking_scenario_payload
+from src.subjects.search_agent import search_scenario_payload
+from src.subjects.summary_agent import summary_scenario_payload
+
+
+CorpusTrace = tuple[dict[str, Any], dict[str, Any]]
+
+# Filler words never contain a diagnosis marker, a subject name or a search phrase,
+# so padding cannot change the class a trace was generated for.
+_FILLER_WORDS = (
+    "route",
+    "fare",
+    "carrier",
+    "nonstop",
+    "window",
+    "aisle",
+    "itinerary",
+    "seat",
+    "gate",
+    "terminal",
+    "layover",
+    "baggage",
+    "upgrade",
+    "refund",
+    "schedule",
+    "loyalty",
+    "morning",
+    "evening",
+)
+_AIRPORTS = ("NYC", "LAX", "SFO", "ORD", "SEA", "BOS", "MIA", "DEN", "ATL", "AUS")
+_BAD_DATE_FORMATS = ("%d/%m/%Y", "%b %d %Y", "%Y/%m/%d", "%d.%m.%Y")
+_PROMPT_AMBIGUITY_NOTES = (
+    "missing context",
+    "multiple interpretations",
+    "ambiguous instruction",
+    "ambiguous prompt",
+    "missing required info",
+)
+_CONTEXT_OVERFLOW_ERRORS = (
+    "context_length_exceeded: prompt uses {tokens} tokens",
+    "Request exceeds token limit ({tokens} tokens).",
+    "Model context length exceeded at {tokens} tokens.",
+)
+_FALSE_CLAIMS = (
+    "The provided sources prove every flight from {origin} to {destination} is free.",
+    "The sources confirm a {origin}-{destination} nonstop that departs every ten minutes.",
+    "The sources state that baggage fees were abolished on all {origin} routes.",
+)
+_EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class _TraceSink(Protocol):
+    def store_trace(self, failure_event: dict[str, Any], trace_record: dict[str, Any]) -> None: ...
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    """Shape of a generated corpus. Each trace is a pure function of (seed, index)."""
+
+    count: int
+    seed: int = 0
+    distribution: Mapping[FailureTaxonomy, float] = field(
+        default_factory=lambda: {taxonomy: 1.0 for taxonomy in FailureTaxonomy}
+    )
+    min_steps: int = 1
+    max_steps: int = 6
+    min_payload_bytes: int = 0
+    max_payload_bytes: int = 1024
+    start_index: int = 0
+
+    def __post_init__(self) -> None:
+        if self.count < 0 or self.start_index < 0:
+            raise ValueError("count and start_index must not be negative.")
+        if not 1 <= self.min_steps <= self.max_steps:
+            raise ValueError("Expected 1 <= min_steps <= max_steps.")
+        if not 0 <= self.min_payload_bytes <= self.max_payload_bytes:
+            raise ValueError("Expected 0 <= min_payload_bytes <= max_payload_bytes.")
+        if any(weight < 0 for weight in self.distribution.values()) or not any(
+            weight > 0 for weight in self.distribution.values()
+        ):
+            raise ValueError("distribution weights must be non-negative with a positive total.")
+
+
+def parse_distribution(value: str) -> dict[FailureTaxonomy, float]:
+    """Parse ``"TOOL_MISUSE=3,HALLUCINATION=1"``; unlisted classes get weight 0."""
+
+    distribution: dict[FailureTaxonomy, float] = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        name, _, weight = item.partition("=")
+        try:
+            distribution[FailureTaxonomy(name.strip().upper())] = float(weight or 1)
+        except ValueError as error:
+            raise ValueError(f"Invalid distribution entry '{item.strip()}'.") from error
+    return distribution
+
+
+def _filler(rng: random.Random, size: int) -> str:
+    words: list[str] = []
+    length = 0
+    while length <= size:
+        word = rng.choice(_FILLER_WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:size]
+
+
+def _route(rng: random.Random) -> tuple[str, str]:
+    origin, destination = rng.sample(_AIRPORTS, 2)
+    return origin, destination
+
+
+def _planning_steps(rng: random.Random, depth: int, payload_bytes: int) -> list[dict[str, Any]]:
+    steps: list[dict[str, Any]] = []
+    per_step, remainder = divmod(payload_bytes, depth) if depth else (0, 0)
+    for step_index in range(depth):
+        origin, destination = _route(rng)
+        note_bytes = per_step + (1 if step_index < remainder else 0)
+        steps.append(
+            {
+                "name": f"plan_step_{step_index + 1}",
+                "kind": "reasoning",
+                "input": {"note": _filler(rng, note_bytes)},
+                "output": {
+                    "tool_calls": [
+                        {"tool": "web_search", "args": {"query": f"{origin} {destination} fares"}}
+                    ]
+                },
+                "error": None,
+            }
+        )
+    return steps
+
+
+def _tool_misuse(rng: random.Random, travel_date: datetime) -> dict[str, Any]:
+    if rng.random() < 0.5:
+        payload = search_scenario_payload()
+        payload["input"]["instruction"] = (
+            rng.choice(("Find", "Search for", "Find and compare"))
+            + " cheap options and summarize them."
+        )
+        return {
+            "subject": "search",
+            "status": "failed",
+            "failure_type": "validation_error",
+            "error": "[] should be non-empty",
+            "steps": [
+                {
+                    "name": "subject_validation",
+                    "kind": "validation_error",
+                    "input": payload["input"],
+                    "output": {"tool_calls": payload["tool_calls"]},
+                    "error": "[] should be non-empty",
+                }
+            ],
+        }
+
+    payload = booking_scenario_payload()
+    origin, destination = _route(rng)
+    bad_date = travel_date.strftime(rng.choice(_BAD_DATE_FORMATS))
+    payload["input"].update({"date": bad_date, "from": origin, "to": destination})
+    payload["input"]["request"] = f"Book a flight from {origin} to {destination} on {bad_date}"
+    payload["tool_calls"][0]["args"] = {"date": bad_date, "from": origin, "to": destination}
+    error = f"'{bad_date}' does not match '^\\\\d{{4}}-\\\\d{{2}}-\\\\d{{2}}$'"
+    return {
+        "subject": "booking",
+        "status": "failed",
+        "failure_type": "validation_error",
+        "error": error,
+        "steps": [
+            {
+                "name": "subject_validation",
+                "kind": "validation_error",
+                "input": payload["input"],
+                "output": {"tool_calls": payload["tool_calls"]},
+                "error": error,
+            }
+        ],
+    }
+
+
+def _hallucination(rng: random.Random, travel_date: datetime) -> dict[str, Any]:
+    payload = summary_scenario_payload()
+    origin, destination = _route(rng)
+    claim = rng.choice(_FALSE_CLAIMS).format(origin=origin, destination=destination)
+    error = f"hallucinated=true: {claim}"
+    return {
+        "subject": "summary",
+        "status": "hallucinated",
+        "failure_type": "hallucination_flag",
+        "error": error,
+        "steps": [
+            {
+                "name": "subject_result",
+                "kind": "model_output",
+                "input": payload["input"],
+                "output": {
+                    "status": "hallucinated",
+                    "hallucinated": True,
+                    "false_claim": claim,
+                    "tool_calls": payload["tool_calls"],
+                },
+                "error": error,
+            }
+        ],
+    }
+
+
+def _prompt_ambiguity(rng: random.Random, travel_date: datetime) -> dict[str, Any]:
+    payload = search_scenario_payload()
+    note = rng.choice(_PROMPT_AMBIGUITY_NOTES)
+    error = f"Clarification needed: {note}."
+    return {
+        "subject": "search",
+        "status": "failed",
+        "failure_type": "exception",
+        "error": error,
+        "steps": [
+            {
+                "name": "subject_result",
+                "kind": "model_output",
+                "input": {**payload["input"], "ambiguity": note},
+                "output": {
+                    "tool_calls": [
+                        {"tool": "web_search", "args": {"query": "something useful quickly"}}
+                    ]
+                },
+                "error": error,
+            }
+        ],
+    }
+
+
+def _context_overflow(rng: random.Random, travel_date: datetime) -> dict[str, Any]:
+    payload = summary_scenario_payload()
+    sources = payload["input"]["sources"] * rng.randint(2, 12)
+    tokens = rng.randint(128_001, 400_000)
+    error = rng.choice(_CONTEXT_OVERFLOW_ERRORS).format(tokens=tokens)
+    return {
+        "subject": "summary",
+        "status": "failed",
+        "failure_type": "exception",
+        "error": error,
+        "steps": [
+            {
+                "name": "subject_exception",
+                "kind": "exception",
+                "input": {"sources": sources},
+                "output": {
+                    "tool_calls": [{"tool": "summarize_sources", "args": {"sources": sources}}]
+                },
+                "error": error,
+            }
+        ],
+    }
+
+
+def _coordination_failure(rng: random.Random, travel_date: datetime) -> dict[str, Any]:
+    origin, destination = _route(rng)
+    error = (
+        f"Handoff failed: booking planner never received the {origin}-{destination} "
+        "itinerary from the search worker."
+    )
+    return {
+        "subject": "booking",
+        "status": "failed",
+        "failure_type": "exception",
+        "error": error,
+        "steps": [
+            {
+                "name": "planner_handoff",
+                "kind": "exception",
+                "input": {"from": origin, "to": destination},
+                "output": None,
+                "error": error,
+            }
+        ],
+    }
+
+
+def _reasoning_error(rng: random.Random, travel_date: datetime) -> dict[str, Any]:
+    payload = booking_scenario_payload()
+    origin, destination = _route(rng)
+    requested = travel_date.strftime("%Y-%m-%d")
+    chosen = (travel_date + timedelta(days=rng.randint(1, 5))).strftime("%Y-%m-%d")
+    payload["tool_calls"][0]["args"] = {"date": requested, "from": origin, "to": destination}
+    error = f"Selected itinerary departs {chosen} but the request asked for {requested}."
+    return {
+        "subject": "booking",
+        "status": "failed",
+        "failure_type": "exception",
+        "error": error,
+        "steps": [
+            {
+                "name": "subject_result",
+                "kind": "model_output",
+                "input": {"request": f"Book {origin} to {destination} on {requested}"},
+                "output": {"tool_calls": payload["tool_calls"], "selected_date": chosen},
+                "error": error,
+            }
+        ],
+    }
+
+
+_BUILDERS: dict[FailureTaxonomy, Callable[[random.Random, datetime], dict[str, Any]]] = {
+    FailureTaxonomy.TOOL_MISUSE: _tool_misuse,
+    FailureTaxonomy.HALLUCINATION: _hallucination,
+    FailureTaxonomy.PROMPT_AMBIGUITY: _prompt_ambiguity,
+    FailureTaxonomy.CONTEXT_OVERFLOW: _context_overflow,
+    FailureTaxonomy.COORDINATION_FAILURE: _coordination_failure,
+    FailureTaxonomy.REASONING_ERROR: _reasoning_error,
+}
+
+
+def _timestamp(moment: datetime) -> str:
+    return moment.isoformat().replace("+00:00", "Z")
+
+
+def generate_trace(spec: CorpusSpec, index: int) -> CorpusTrace:
+    """Build the ``(failure_event, trace_record)`` pair for one corpus index."""
+
+    rng = random.Random(f"{spec.seed}:{index}")
+    classes, cumulative = _cumulative_weights(spec)
+    taxonomy = rng.choices(classes, cum_weights=cumulative)[0]
+
+    started = _EPOCH + timedelta(seconds=index, microseconds=rng.randrange(1_000_000))
+    travel_date = started + timedelta(days=rng.randint(7, 120))
+    built = _BUILDERS[taxonomy](rng, travel_date)
+
+    depth = rng.randint(spec.min_steps, spec.max_steps)
+    payload_bytes = rng.randint(spec.min_payload_bytes, spec.max_payload_bytes)
+    steps = _planning_steps(rng, depth - 1, payload_bytes) + built["steps"]
+    if depth == 1 and payload_bytes:
+        steps[0]["input"] = {**(steps[0]["input"] or {}), "note": _filler(rng, payload_bytes)}
+
+    subject = built["subject"]
+    failure_id = f"{subject}-corpus-{spec.seed}-{index:010d}"
+    ended = started + timedelta(milliseconds=rng.randint(5, 5_000))
+    trace_record = {
+        "schema_version": 1,
+        "failure_id": failure_id,
+        "subject": subject,
+        "status": built["status"],
+        "started_at": _timestamp(started),
+        "ended_at": _timestamp(ended),
+        "steps": steps,
+    }
+    failure_event = {
+        "failure_id": failure_id,
+        "subject": subject,
+        "failure_type": built["failure_type"],
+        "timestamp": trace_record["ended_at"],
+        "trace_id": None,
+        "error": built["error"],
+        "metadata": {"corpus_seed": spec.seed, "expected_root_cause": taxonomy.value},
+    }
+    return failure_event, trace_record
+
+
+def _cumulative_weights(
+    spec: CorpusSpec,
+) -> tuple[tuple[FailureTaxonomy, ...], tuple[float, ...]]:
+    classes = tuple(taxonomy for taxonomy in FailureTaxonomy if spec.distribution.get(taxonomy))
+    cumulative: list[float] = []
+    total = 0.0
+    for taxonomy in classes:
+        total += spec.distribution[taxonomy]
+        cumulative.append(total)
+    return classes, tuple(cumulative)
+
+
+def iter_corpus(spec: CorpusSpec) -> Iterator[CorpusTrace]:
+    """Lazily yield ``spec.count`` traces starting at ``spec.start_index``."""
+
+    for index in range(spec.start_index, spec.start_index + spec.count):
+        yield generate_trace(spec, index)
+
+
+def write_ndjson(spec: CorpusSpec, path: str | Path) -> int:
+    """Stream the corpus as ``{"failure_event", "trace_record"}`` lines (gzip for ``.gz``)."""
+
+    output_path = Path(path)
+    opener = gzip.open if output_path.suffix == ".gz" else open
+    written = 0
+    with opener(output_path, "wt", encoding="utf-8") as handle:
+        for failure_event, trace_record in iter_corpus(spec):
+            handle.write(
+                json.dumps(
+                    {"failure_event": failure_event, "trace_record": trace_record},
+                    separators=(",", ":"),
+                )
+            )
+            handle.write("\n")
+            written += 1
+    return written
+
+
+def read_ndjson(path: str | Path) -> Iterator[CorpusTrace]:
+    input_path = Path(path)
+    opener = gzip.open if input_path.suffix == ".gz" else open
+    with opener(input_path, "rt", encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                document = json.loads(line)
+                yield document["failure_event"], document["trace_record"]
+
+
+def load_into_store(spec: CorpusSpec, trace_store: _TraceSink) -> int:
+    """Write the corpus straight into a ``TraceStore`` (or anything with ``store_trace``)."""
+
+    stored = 0
+    for failure_event, trace_record in iter_corpus(spec):
+        trace_store.store_trace(failure_event, trace_record)
+        stored += 1
+    return stored
@@ -0,0 +1,43 @@
+"""Subject agents that can be run and that failures can be attributed to.
+
+Runners are named by import path and resolved on first use, so diagnosis code can
+read the subject names without loading the subject modules or the tool registry.
+"""
+
+from __future__ import annotations
+
+import importlib
+import os
+from typing import Any, Callable
+
+
+SubjectRunner = Callable[[], dict[str, Any]]
+
+SUBJECT_RUNNERS: dict[str, str] = {
+    "booking": "src.subjects.booking_agent:run_booking_scenario",
+    "search": "src.subjects.search_agent:run_search_scenario",
+    "summary": "src.subjects.summary_agent:run_summary_scenario",
+}
+
+SUBJECT_NAMES: tuple[str, ...] = tuple(SUBJECT_RUNNERS)
+
+
+def subject_runner(name: str) -> SubjectRunner:
+    try:
+        target = SUBJECT_RUNNERS[name]
+    except KeyError as exc:
+        raise ValueError(f"Unsupported subject '{name}'.") from exc
+
+    module_name, _, attribute = target.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def subject_runners() -> tuple[tuple[str, SubjectRunner], ...]:
+    return tuple((name, subject_runner(name)) for name in SUBJECT_NAMES)
+
+
+def known_subjects() -> tuple[str, ...]:
+    """``SUBJECT_NAMES`` plus any names listed in ``INDAGINE_SUBJECTS`` (comma separated)."""
+
+    extra = (name.strip().lower() for name in os.getenv("INDAGINE_SUBJECTS", "").split(","))
+    return tuple(dict.fromkeys((*SUBJECT_NAMES, *(name for name in extra if name))))
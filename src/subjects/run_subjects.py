@@ -7,6 +7,7 @@ from typing import Any
 
 from src.subjects.booking_agent import booking_scenario_payload, run_booking_scenario
 from src.subjects.search_agent import run_search_scenario, search_scenario_payload
+from src.subjects.registry import SUBJECT_NAMES
 from src.subjects.summary_agent import run_summary_scenario
 from src.tools.registry import ToolValidationError
 
@@ -49,7 +50,7 @@ def run_subject_scenario(subject: str) -> dict[str, Any]:
 
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Run deterministic subject scenarios.")
-    parser.add_argument("subject", choices=["booking", "search", "summary"])
+    parser.add_argument("subject", choices=SUBJECT_NAMES)
     args = parser.parse_args(argv)
 
     result = run_subject_scenario(args.subject)
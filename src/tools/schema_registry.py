@@ -1,77 +1,492 @@
 from __future__ import annotations
 
+import bisect
+import hashlib
 import json
+import os
+import tempfile
+import threading
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from jsonschema import Draft202012Validator
+if TYPE_CHECKING:
+    from jsonschema import Draft202012Validator
 
 
 SchemaMismatch = dict[str, Any]
+ToolCallInput = tuple[str, Any, datetime | str | None]
+_DirectorySignature = tuple[tuple[str, int, int], ...]
+_HISTORY_FORMAT = 1
+_PayloadKey = tuple[str, int, str]
+
+
+@dataclass(frozen=True)
+class SchemaVersion:
+    tool_name: str
+    version: int
+    digest: str
+    activated_at: datetime
+    schema: dict[str, Any]
+    validator: Draft202012Validator
+
+
+def _schema_digest(schema: dict[str, Any]) -> str:
+    canonical = json.dumps(schema, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _payload_digest(args: Any) -> str:
+    canonical = json.dumps(args, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _collect_mismatches(validator: Draft202012Validator, args: Any) -> list[SchemaMismatch]:
+    if not isinstance(args, dict):
+        return [
+            {
+                "code": "invalid_payload",
+                "message": "Tool args must be an object.",
+                "path": "<root>",
+            }
+        ]
+
+    errors = sorted(
+        validator.iter_errors(args),
+        key=lambda err: tuple(str(piece) for piece in err.absolute_path),
+    )
+    mismatches: list[SchemaMismatch] = []
+    for error in errors:
+        path = ".".join(str(piece) for piece in error.absolute_path) or "<root>"
+        mismatches.append(
+            {
+                "code": "schema_validation_failed",
+                "message": error.message,
+                "path": path,
+            }
+        )
+
+    return mismatches
+
+
+def _validate_chunk(schema: dict[str, Any], payloads: list[Any]) -> list[list[SchemaMismatch]]:
+    """Worker-process entry point: validate many payloads against one schema."""
+
+    from jsonschema import Draft202012Validator
+
+    validator = Draft202012Validator(schema)
+    return [_collect_mismatches(validator, args) for args in payloads]
+
+
+def _unknown_tool_mismatch(tool_name: str, available_tools: list[str]) -> list[SchemaMismatch]:
+    return [
+        {
+            "code": "unknown_tool",
+            "message": f"Unknown tool '{tool_name}'.",
+            "details": {"available_tools": available_tools},
+        }
+    ]
+
+
+def _parse_as_of(value: datetime | str | None) -> datetime | None:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+    candidate = value.strip()
+    if candidate.endswith("Z"):
+        candidate = candidate[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(candidate)
+    except ValueError:
+        return None
+
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _live_count(history: tuple[SchemaVersion, ...], moment: datetime) -> int:
+    """How many versions of ``history`` (in activation order) were activated by ``moment``."""
+
+    return bisect.bisect_right(history, moment, key=lambda item: item.activated_at)
 
 
 class SchemaRegistry:
-    def __init__(self, schemas_dir: Path | None = None) -> None:
+    """Tool schema registry with versioned, atomically swappable validators.
+
+    Every tool keeps up to ``max_versions`` schema versions, ordered by activation time.
+    Readers take a snapshot of the version table, so reloads and pushed updates never
+    block in-flight validations.
+
+    A schema file's version is activated at the file's modification time. With a
+    ``history_path``, every retained version is also written there and read back on
+    startup, so ``resolve(as_of=...)`` keeps serving older versions across restarts.
+    Tools whose schema file is deleted are dropped on reload.
+    """
+
+    def __init__(
+        self,
+        schemas_dir: Path | None = None,
+        *,
+        max_versions: int = 5,
+        history_path: Path | None = None,
+    ) -> None:
+        if max_versions < 1:
+            raise ValueError("max_versions must be at least 1.")
+
         self._schemas_dir = schemas_dir or Path(__file__).resolve().parent / "schemas"
-        self._schemas, self._validators = self._load_schemas()
+        self._max_versions = max_versions
+        self._history_path = history_path
+        self._write_lock = threading.Lock()
+        self._versions: dict[str, tuple[SchemaVersion, ...]] = {}
+        self._file_tools: frozenset[str] = frozenset()
+        self._signature: _DirectorySignature = ()
+        self._watch_stop: threading.Event | None = None
+        self._watch_thread: threading.Thread | None = None
+
+        self._load_history()
+        self._load_schemas(strict=True)
+
+    def _load_history(self) -> None:
+        from jsonschema import Draft202012Validator
+
+        if self._history_path is None or not self._history_path.exists():
+            return
+        try:
+            history = json.loads(self._history_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as error:
+            raise ValueError(f"Invalid schema history {self._history_path}: {error}") from error
+
+        versions: dict[str, tuple[SchemaVersion, ...]] = {}
+        for tool_name, entries in history.get("tools", {}).items():
+            loaded = [
+                SchemaVersion(
+                    tool_name=tool_name,
+                    version=int(entry["version"]),
+                    digest=_schema_digest(entry["schema"]),
+                    activated_at=_parse_as_of(entry["activated_at"]) or datetime.now(timezone.utc),
+                    schema=entry["schema"],
+                    validator=Draft202012Validator(entry["schema"]),
+                )
+                for entry in entries
+            ]
+            loaded.sort(key=lambda item: item.activated_at)
+            versions[tool_name] = tuple(loaded[-self._max_versions :])
+        self._versions = versions
+        # Lets the first load drop tools whose files were deleted while stopped.
+        self._file_tools = frozenset(history.get("file_tools", ()))
 
-    def _load_schemas(self) -> tuple[dict[str, dict[str, Any]], dict[str, Draft202012Validator]]:
-        schemas: dict[str, dict[str, Any]] = {}
-        validators: dict[str, Draft202012Validator] = {}
+    def _save_history(self) -> None:
+        """Write every retained version to ``history_path``; callers hold ``_write_lock``."""
 
+        if self._history_path is None:
+            return
+
+        history = {
+            "format": _HISTORY_FORMAT,
+            "file_tools": sorted(self._file_tools),
+            "tools": {
+                tool_name: [
+                    {
+                        "version": item.version,
+                        "activated_at": item.activated_at.isoformat(),
+                        "schema": item.schema,
+                    }
+                    for item in history
+                ]
+                for tool_name, history in sorted(self._versions.items())
+            },
+        }
+        self._history_path.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(
+            dir=self._history_path.parent, prefix=f".{self._history_path.name}-"
+        )
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as handle:
+                json.dump(history, handle, sort_keys=True)
+            os.replace(temporary, self._history_path)
+        except BaseException:
+            Path(temporary).unlink(missing_ok=True)
+            raise
+
+    def _directory_signature(self) -> _DirectorySignature:
+        signature: list[tuple[str, int, int]] = []
         for schema_path in sorted(self._schemas_dir.glob("*.json")):
-            schema = json.loads(schema_path.read_text(encoding="utf-8"))
-            tool_name = schema_path.stem
-            schemas[tool_name] = schema
-            validators[tool_name] = Draft202012Validator(schema)
+            try:
+                stat = schema_path.stat()
+            except FileNotFoundError:
+                continue
+            signature.append((schema_path.name, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
 
-        if not validators:
+    def _load_schemas(self, *, strict: bool) -> list[str]:
+        from jsonschema import Draft202012Validator
+        from jsonschema.exceptions import SchemaError
+
+        signature = self._directory_signature()
+        loaded: dict[str, tuple[dict[str, Any], datetime]] = {}
+        present: set[str] = set()
+
+        for schema_path in sorted(self._schemas_dir.glob("*.json")):
+            present.add(schema_path.stem)
+            try:
+                modified_at = datetime.fromtimestamp(schema_path.stat().st_mtime, timezone.utc)
+                schema = json.loads(schema_path.read_text(encoding="utf-8"))
+                Draft202012Validator.check_schema(schema)
+            except (OSError, ValueError, SchemaError) as error:
+                if strict:
+                    raise ValueError(f"Invalid tool schema {schema_path}: {error}") from error
+                # Half-written or invalid files keep the previous version live.
+                continue
+            loaded[schema_path.stem] = (schema, modified_at)
+
+        if strict and not loaded:
             raise ValueError(f"No tool schemas found in {self._schemas_dir}")
 
-        return schemas, validators
+        with self._write_lock:
+            changed = [
+                tool_name
+                for tool_name, (schema, modified_at) in loaded.items()
+                if self._install(tool_name, schema, activated_at=modified_at) is not None
+            ]
+            removed = sorted(self._file_tools - present)
+            if removed:
+                self._versions = {
+                    tool_name: history
+                    for tool_name, history in self._versions.items()
+                    if tool_name not in removed
+                }
+                changed.extend(removed)
+            self._file_tools = frozenset(present)
+            self._signature = signature
+            if changed:
+                self._save_history()
+
+        return changed
+
+    def _install(
+        self, tool_name: str, schema: dict[str, Any], *, activated_at: datetime
+    ) -> SchemaVersion | None:
+        """Publish a version in activation order; ``None`` if it is already live then.
+
+        Callers must hold ``_write_lock``.
+        """
+
+        from jsonschema import Draft202012Validator
+
+        history = self._versions.get(tool_name, ())
+        position = _live_count(history, activated_at)
+        digest = _schema_digest(schema)
+        if position and history[position - 1].digest == digest:
+            return None
+
+        schema_version = SchemaVersion(
+            tool_name=tool_name,
+            version=max((item.version for item in history), default=0) + 1,
+            digest=digest,
+            activated_at=activated_at,
+            schema=schema,
+            validator=Draft202012Validator(schema),
+        )
+        updated = (*history[:position], schema_version, *history[position:])
+        self._versions = {**self._versions, tool_name: updated[-self._max_versions :]}
+        return schema_version
+
+    def reload(self) -> list[str]:
+        """Re-read the schema directory and return the tools whose schema changed."""
+
+        return self._load_schemas(strict=False)
+
+    def register_schema(
+        self,
+        tool_name: str,
+        schema: dict[str, Any],
+        *,
+        activated_at: datetime | str | None = None,
+    ) -> SchemaVersion:
+        """Push a schema update without touching the schema directory.
+
+        A past ``activated_at`` inserts the version at that point in the tool's history.
+        """
+
+        from jsonschema import Draft202012Validator
+        from jsonschema.exceptions import SchemaError
+
+        if not isinstance(tool_name, str) or not tool_name.strip():
+            raise ValueError("tool_name must be a non-empty string.")
+        try:
+            Draft202012Validator.check_schema(schema)
+        except SchemaError as error:
+            raise ValueError(f"Invalid schema for tool '{tool_name}': {error.message}") from error
+
+        name = tool_name.strip()
+        activated = _parse_as_of(activated_at) or datetime.now(timezone.utc)
+        with self._write_lock:
+            installed = self._install(name, json.loads(json.dumps(schema)), activated_at=activated)
+            if installed is None:
+                history = self._versions[name]
+                return history[_live_count(history, activated) - 1]
+            self._save_history()
+            return installed
+
+    def watch(self, interval_s: float = 1.0) -> None:
+        """Poll the schema directory in a daemon thread and reload on change."""
+
+        if interval_s <= 0:
+            raise ValueError("interval_s must be positive.")
+        if self._watch_thread is not None and self._watch_thread.is_alive():
+            return
+
+        stop_event = threading.Event()
+
+        def _poll() -> None:
+            while not stop_event.wait(interval_s):
+                if self._directory_signature() != self._signature:
+                    self.reload()
+
+        self._watch_stop = stop_event
+        self._watch_thread = threading.Thread(
+            target=_poll, name="schema-registry-watch", daemon=True
+        )
+        self._watch_thread.start()
+
+    def stop_watching(self) -> None:
+        if self._watch_stop is not None:
+            self._watch_stop.set()
+        if self._watch_thread is not None:
+            self._watch_thread.join()
+        self._watch_stop = None
+        self._watch_thread = None
+
+    def fingerprint(self) -> str:
+        """Stable digest of every retained schema version, used as a cache key component."""
+
+        snapshot = self._versions
+        digests = [
+            f"{tool_name}:{schema_version.version}:{schema_version.digest}"
+            for tool_name in sorted(snapshot)
+            for schema_version in snapshot[tool_name]
+        ]
+        return hashlib.sha256("|".join(digests).encode("utf-8")).hexdigest()
 
     def list_tools(self) -> tuple[str, ...]:
-        return tuple(sorted(self._validators))
+        return tuple(sorted(self._versions))
+
+    def versions(self, tool_name: str) -> tuple[SchemaVersion, ...]:
+        return self._versions.get(tool_name, ())
 
-    def get_schema(self, tool_name: str) -> dict[str, Any]:
-        schema = self._schemas.get(tool_name)
-        if schema is None:
+    def resolve(
+        self, tool_name: str, *, as_of: datetime | str | None = None
+    ) -> SchemaVersion | None:
+        """Return the schema version that was live at ``as_of`` (latest when omitted).
+
+        Timestamps older than every retained version resolve to the oldest one.
+        """
+
+        history = self._versions.get(tool_name)
+        if not history:
+            return None
+
+        moment = _parse_as_of(as_of)
+        if moment is None:
+            return history[-1]
+
+        return history[max(_live_count(history, moment), 1) - 1]
+
+    def get_schema(self, tool_name: str, *, version: int | None = None) -> dict[str, Any]:
+        history = self._versions.get(tool_name)
+        if not history:
             raise KeyError(f"Unknown tool '{tool_name}'.")
-        return json.loads(json.dumps(schema))
-
-    def validate(self, tool_name: str, args: dict[str, Any]) -> list[SchemaMismatch]:
-        validator = self._validators.get(tool_name)
-        if validator is None:
-            return [
-                {
-                    "code": "unknown_tool",
-                    "message": f"Unknown tool '{tool_name}'.",
-                    "details": {"available_tools": list(self.list_tools())},
-                }
-            ]
 
-        if not isinstance(args, dict):
-            return [
-                {
-                    "code": "invalid_payload",
-                    "message": "Tool args must be an object.",
-                    "path": "<root>",
-                }
+        if version is None:
+            selected: SchemaVersion | None = history[-1]
+        else:
+            selected = next((item for item in history if item.version == version), None)
+        if selected is None:
+            raise KeyError(f"Unknown version {version} for tool '{tool_name}'.")
+
+        return json.loads(json.dumps(selected.schema))
+
+    def validate(
+        self,
+        tool_name: str,
+        args: dict[str, Any],
+        *,
+        as_of: datetime | str | None = None,
+    ) -> list[SchemaMismatch]:
+        schema_version = self.resolve(tool_name, as_of=as_of)
+        if schema_version is None:
+            return _unknown_tool_mismatch(tool_name, list(self.list_tools()))
+
+        return _collect_mismatches(schema_version.validator, args)
+
+    def validate_many(
+        self,
+        tool_calls: Iterable[ToolCallInput],
+        *,
+        max_workers: int = 1,
+        chunk_size: int = 2048,
+    ) -> list[list[SchemaMismatch]]:
+        """Validate ``(tool_name, args, as_of)`` triples, returning mismatches in input order.
+
+        Calls are grouped by resolved schema version and deduplicated by a hash of their
+        args, so each unique payload is validated once. With ``max_workers > 1`` the unique
+        payloads are validated in worker processes in chunks of ``chunk_size``.
+        """
+
+        available_tools = list(self.list_tools())
+        call_keys: list[_PayloadKey] = []
+        groups: dict[tuple[str, int], dict[str, Any]] = {}
+        versions_by_group: dict[tuple[str, int], SchemaVersion] = {}
+
+        for tool_name, args, as_of in tool_calls:
+            schema_version = self.resolve(tool_name, as_of=as_of)
+            version_number = schema_version.version if schema_version else 0
+            key = (tool_name, version_number, _payload_digest(args))
+            call_keys.append(key)
+
+            group = groups.setdefault((tool_name, version_number), {})
+            group.setdefault(key[2], args)
+            if schema_version is not None:
+                versions_by_group[(tool_name, version_number)] = schema_version
+
+        results: dict[_PayloadKey, list[SchemaMismatch]] = {}
+        pending: list[tuple[tuple[str, int], list[str], list[Any]]] = []
+        for group_key, payloads in groups.items():
+            schema_version = versions_by_group.get(group_key)
+            if schema_version is None:
+                for digest in payloads:
+                    results[(*group_key, digest)] = _unknown_tool_mismatch(
+                        group_key[0], available_tools
+                    )
+                continue
+
+            digests = list(payloads)
+            for start in range(0, len(digests), chunk_size):
+                chunk = digests[start : start + chunk_size]
+                pending.append((group_key, chunk, [payloads[digest] for digest in chunk]))
+
+        if max_workers > 1 and len(pending) > 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                futures = [
+                    pool.submit(_validate_chunk, versions_by_group[group_key].schema, chunk_args)
+                    for group_key, _, chunk_args in pending
+                ]
+                chunk_results = [future.result() for future in futures]
+        else:
+            chunk_results = [
+                [
+                    _collect_mismatches(versions_by_group[group_key].validator, args)
+                    for args in chunk_args
+                ]
+                for group_key, _, chunk_args in pending
             ]
 
-        errors = sorted(
-            validator.iter_errors(args),
-            key=lambda err: tuple(str(piece) for piece in err.absolute_path),
-        )
-        mismatches: list[SchemaMismatch] = []
-        for error in errors:
-            path = ".".join(str(piece) for piece in error.absolute_path) or "<root>"
-            mismatches.append(
-                {
-                    "code": "schema_validation_failed",
-                    "message": error.message,
-                    "path": path,
-                }
-            )
+        for (group_key, digests, _), mismatches in zip(pending, chunk_results):
+            for digest, payload_mismatches in zip(digests, mismatches):
+                results[(*group_key, digest)] = payload_mismatches
 
-        return mismatches
+        return [[dict(mismatch) for mismatch in results[key]] for key in call_keys]
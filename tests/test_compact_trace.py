@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src.core.indagine_controller import IndagineController
+from src.core.indagine_pipeline import IndaginePipeline
+from src.models.compact_trace import CompactTrace
+from src.models.trace import TraceRecord
+from src.storage.trace_store import TraceStore
+
+
+_FIXTURE_DIR = Path(__file__).parent / "fixtures" / "traces"
+
+
+def _load_trace_fixture(name: str) -> dict[str, object]:
+    fixture_path = _FIXTURE_DIR / f"{name}.json"
+    return json.loads(fixture_path.read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize("fixture_name", ["booking", "search", "summary", "tool_calls_search"])
+def test_compact_trace_round_trips_and_analyzes_like_the_wire_document(
+    fixture_name: str,
+) -> None:
+    wire = _load_trace_fixture(fixture_name)
+    compact = CompactTrace.from_wire(wire)
+
+    assert TraceRecord.model_validate(compact.to_wire()) == TraceRecord.model_validate(wire)
+    assert CompactTrace.from_model(TraceRecord.model_validate(wire)) == compact
+
+    controller = IndagineController()
+    assert controller.run_indagine(compact) == controller.run_indagine(wire)
+
+
+def test_compact_trace_interns_repeated_names() -> None:
+    wire = _load_trace_fixture("tool_calls_search")
+    first = CompactTrace.from_wire(json.loads(json.dumps(wire)))
+    second = CompactTrace.from_wire(json.loads(json.dumps(wire)))
+
+    assert first.steps[0].name is second.steps[0].name
+    assert first.steps[1].kind is second.steps[1].kind
+    assert not hasattr(first.steps[0], "__dict__")
+
+
+def test_compact_trace_rejects_fields_trace_record_forbids() -> None:
+    wire = _load_trace_fixture("booking")
+
+    with pytest.raises(ValueError, match="metadata"):
+        CompactTrace.from_wire({**wire, "metadata": {}})
+    with pytest.raises(ValueError, match="retries"):
+        CompactTrace.from_wire({**wire, "steps": [{**wire["steps"][0], "retries": 1}]})
+    with pytest.raises(ValueError):
+        CompactTrace.from_wire({key: value for key, value in wire.items() if key != "subject"})
+
+
+def test_pipeline_analyzes_stored_traces_in_compact_form(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    wire = _load_trace_fixture("booking")
+    store = TraceStore(backend="memory")
+    compact = CompactTrace.from_wire(wire)
+    store.store_trace({"failure_id": compact.failure_id, "subject": compact.subject}, compact)
+    controller = IndagineController()
+    analyzed: list[object] = []
+    run_indagine = controller.run_indagine
+    monkeypatch.setattr(
+        controller,
+        "run_indagine",
+        lambda trace_record: analyzed.append(trace_record) or run_indagine(trace_record),
+    )
+
+    report = IndaginePipeline(store, controller).run(compact.failure_id)
+
+    assert analyzed == [compact]
+    assert isinstance(analyzed[0], CompactTrace)
+    assert report == IndagineController().run_indagine(wire)
+    assert store.get_trace(compact.failure_id)["trace_record"] == compact.to_wire()
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from collections import Counter
+from pathlib import Path
+
+from src.core.diagnosis_engine import DiagnosisEngine
+from src.core.indagine_controller import IndagineController
+from src.models.diagnosis import FailureTaxonomy
+from src.models.failure import FailureEvent
+from src.models.trace_record import TraceRecord
+from src.storage.trace_store import TraceStore
+from src.subjects.corpus import (
+    CorpusSpec,
+    iter_corpus,
+    load_into_store,
+    parse_distribution,
+    read_ndjson,
+    write_ndjson,
+)
+
+
+def test_corpus_traces_are_valid_and_diagnosed_as_their_labelled_class() -> None:
+    controller = IndagineController()
+    engine = DiagnosisEngine()
+    spec = CorpusSpec(count=120, seed=3, max_steps=5, max_payload_bytes=2048)
+
+    labels: Counter[str] = Counter()
+    for failure_event, trace_record in iter_corpus(spec):
+        FailureEvent.model_validate(failure_event)
+        TraceRecord.model_validate(trace_record)
+
+        expected = failure_event["metadata"]["expected_root_cause"]
+        diagnosis = engine.diagnose(controller.run_indagine(trace_record))
+        assert diagnosis.root_cause.value == expected
+        labels[expected] += 1
+
+    assert set(labels) == {taxonomy.value for taxonomy in FailureTaxonomy}
+
+
+def test_corpus_is_deterministic_per_seed_and_shardable() -> None:
+    whole = list(iter_corpus(CorpusSpec(count=10, seed=11)))
+    first = list(iter_corpus(CorpusSpec(count=4, seed=11)))
+    rest = list(iter_corpus(CorpusSpec(count=6, seed=11, start_index=4)))
+
+    assert whole == first + rest
+    assert whole != list(iter_corpus(CorpusSpec(count=10, seed=12)))
+
+
+def test_distribution_and_shape_controls() -> None:
+    spec = CorpusSpec(
+        count=50,
+        distribution=parse_distribution("hallucination=1"),
+        min_steps=4,
+        max_steps=4,
+        min_payload_bytes=512,
+        max_payload_bytes=512,
+    )
+
+    for failure_event, trace_record in iter_corpus(spec):
+        assert failure_event["metadata"]["expected_root_cause"] == "HALLUCINATION"
+        assert len(trace_record["steps"]) == 4
+        notes = [step["input"].get("note", "") for step in trace_record["steps"]]
+        assert sum(len(note) for note in notes) == 512
+
+
+def test_corpus_streams_to_ndjson_and_trace_store(tmp_path: Path) -> None:
+    spec = CorpusSpec(count=25, seed=5)
+    output_path = tmp_path / "corpus.ndjson.gz"
+
+    assert write_ndjson(spec, output_path) == 25
+    assert list(read_ndjson(output_path)) == list(iter_corpus(spec))
+
+    trace_store = TraceStore(backend="memory")
+    assert load_into_store(spec, trace_store) == 25
+    failure_event, trace_record = next(iter_corpus(spec))
+    assert trace_store.get_trace(failure_event["failure_id"])["trace_record"] == trace_record
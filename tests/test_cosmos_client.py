@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import pytest
+
+exceptions = pytest.importorskip("azure.cosmos.exceptions")
+
+from src.storage.cosmos_client import call_with_throttle_retry, create_container_with_ttl  # noqa: E402
+
+
+def _throttled() -> Exception:
+    error = exceptions.CosmosHttpResponseError(status_code=429, message="throttled")
+    error.headers = {"x-ms-retry-after-ms": "1"}
+    return error
+
+
+def test_call_with_throttle_retry_retries_429_until_success() -> None:
+    attempts: list[int] = []
+
+    def _operation() -> str:
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise _throttled()
+        return "ok"
+
+    assert call_with_throttle_retry(_operation, max_attempts=3) == "ok"
+    assert len(attempts) == 3
+
+
+def test_call_with_throttle_retry_does_not_retry_other_errors() -> None:
+    attempts: list[int] = []
+
+    def _operation() -> str:
+        attempts.append(1)
+        raise exceptions.CosmosHttpResponseError(status_code=500, message="boom")
+
+    with pytest.raises(exceptions.CosmosHttpResponseError):
+        call_with_throttle_retry(_operation, max_attempts=3)
+    assert len(attempts) == 1
+
+
+class _FakePager:
+    def __init__(self, pages: list[list[dict[str, object]]], continuation: str | None) -> None:
+        self._pages = iter(pages)
+        self.continuation_token: str | None = None
+        self._next_token = continuation
+
+    def __iter__(self) -> _FakePager:
+        return self
+
+    def __next__(self) -> list[dict[str, object]]:
+        page = next(self._pages)
+        self.continuation_token = self._next_token
+        return page
+
+
+class _FakeContainer:
+    def __init__(self) -> None:
+        self.calls: list[dict[str, object]] = []
+
+    def query_items(self, **kwargs: object) -> _FakeContainer:
+        self.calls.append(kwargs)
+        return self
+
+    def by_page(self, continuation: str | None) -> _FakePager:
+        self.calls[-1]["continuation"] = continuation
+        return _FakePager([[{"failure_id": "f-1"}]], "token-2")
+
+
+def test_query_trace_documents_returns_one_page_and_its_continuation() -> None:
+    from src.storage.cosmos_client import CosmosTraceClient
+
+    container = _FakeContainer()
+    client = object.__new__(CosmosTraceClient)
+    client._container_client = container
+    client._max_attempts = 1
+
+    items, token = client.query_trace_documents(
+        "SELECT * FROM c", [], max_item_count=10, continuation="token-1"
+    )
+
+    assert (items, token) == ([{"failure_id": "f-1"}], "token-2")
+    assert container.calls[0]["enable_cross_partition_query"] is True
+    assert container.calls[0]["max_item_count"] == 10
+    assert container.calls[0]["continuation"] == "token-1"
+
+
+def test_cosmos_trace_backend_builds_parameterized_queries() -> None:
+    from src.storage.trace_store import TraceQuery, _CosmosTraceBackend
+
+    class _Client:
+        def query_trace_documents(self, *args: object, **kwargs: object) -> tuple[list, None]:
+            self.args, self.kwargs = args, kwargs
+            return [], None
+
+    client = _Client()
+    _CosmosTraceBackend(client).query(
+        TraceQuery(subject="booking", failure_type="timeout", since="2026-02-11T00:00:00.000000Z"),
+        limit=50,
+        continuation=None,
+    )
+
+    query, parameters = client.args
+    assert query == (
+        "SELECT * FROM c WHERE c.subject = @subject AND c.failure_type = @failure_type "
+        "AND c.timestamp >= @since ORDER BY c.timestamp"
+    )
+    assert {parameter["name"]: parameter["value"] for parameter in parameters} == {
+        "@subject": "booking",
+        "@failure_type": "timeout",
+        "@since": "2026-02-11T00:00:00.000000Z",
+    }
+    assert client.kwargs == {"max_item_count": 50, "continuation": None}
+
+
+def test_cosmos_trace_backend_collects_blob_refs_across_pages() -> None:
+    from src.storage.trace_store import _CosmosTraceBackend
+
+    class _Client:
+        pages = {
+            None: ([{"output_blob": "a"}, {"input_blob": "b", "output_blob": "a"}], "next"),
+            "next": ([{}, {"output_blob": "c"}], None),
+        }
+
+        def query_trace_documents(
+            self, query: str, parameters: list, *, max_item_count: int, continuation: str | None
+        ) -> tuple[list, str | None]:
+            return self.pages[continuation]
+
+    assert _CosmosTraceBackend(_Client()).blob_refs() == {"a", "b", "c"}
+
+
+class _FakeTtlContainer:
+    def __init__(self, properties: dict[str, object]) -> None:
+        self.properties = properties
+
+    def read(self) -> dict[str, object]:
+        return self.properties
+
+
+class _FakeDatabase:
+    def __init__(self, properties: dict[str, object]) -> None:
+        self.container = _FakeTtlContainer(properties)
+        self.replaced: dict[str, object] | None = None
+
+    def create_container_if_not_exists(self, **kwargs: object) -> _FakeTtlContainer:
+        return self.container
+
+    def replace_container(self, container: object, **kwargs: object) -> _FakeTtlContainer:
+        self.replaced = kwargs
+        return self.container
+
+
+def test_create_container_with_ttl_enables_ttl_on_existing_containers() -> None:
+    indexing_policy = {"indexingMode": "consistent", "excludedPaths": [{"path": "/steps/*"}]}
+    legacy = _FakeDatabase({"id": "traces", "indexingPolicy": indexing_policy})
+    current = _FakeDatabase({"id": "traces", "defaultTtl": -1})
+
+    create_container_with_ttl(legacy, "traces")
+    create_container_with_ttl(current, "traces")
+
+    assert legacy.replaced is not None
+    assert legacy.replaced["default_ttl"] == -1
+    assert legacy.replaced["indexing_policy"] == indexing_policy
+    assert current.replaced is None
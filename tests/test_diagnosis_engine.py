@@ -61,3 +61,87 @@ def test_diagnosis_engine_keeps_similar_failure_links_consistent(fixture_name: s
     assert "similar_past_failure_ids" in payload
     assert "similar_past_failures" in payload
     assert diagnosis.similar_past_failures == len(diagnosis.similar_past_failure_ids)
+
+
+def test_diagnosis_engine_reuses_classification_for_identical_findings() -> None:
+    engine = DiagnosisEngine()
+    findings_report = _load_findings_fixture("booking_findings")
+    rerun = json.loads(json.dumps(findings_report))
+    rerun["findings"]["tool_analyzer"][0]["actual"]["captured_at"] = "2026-02-11T02:20:00Z"
+
+    first = engine.diagnose(findings_report)
+    second = engine.diagnose(rerun)
+
+    assert second == first
+    assert (engine.cache_stats.hits, engine.cache_stats.misses) == (1, 1)
+    assert engine.cache_stats.hit_rate == pytest.approx(0.5)
+
+
+def test_diagnosis_engine_cache_key_covers_everything_classification_reads() -> None:
+    engine = DiagnosisEngine()
+    findings_report = _load_findings_fixture("reasoning_error_findings")
+    flagged = json.loads(json.dumps(findings_report))
+    for report in (findings_report, flagged):
+        report["findings"]["tool_analyzer"] = [
+            {"tool": "summarize", "issue": "unexpected output", "actual": {"created_at": "ok"}}
+        ]
+    flagged["findings"]["tool_analyzer"][0]["actual"]["created_at"] = "hallucinated=true"
+
+    engine.diagnose(findings_report)
+    cached = engine.diagnose(flagged)
+
+    assert cached == DiagnosisEngine(cache_size=0).diagnose(flagged)
+
+
+def test_diagnosis_engine_cache_evicts_least_recent_and_expired_entries(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    clock = [100.0]
+    monkeypatch.setattr("src.core.diagnosis_engine.time.monotonic", lambda: clock[0])
+    engine = DiagnosisEngine(cache_size=2, cache_ttl_s=60.0)
+    booking, search, summary = (
+        _load_findings_fixture(name)
+        for name in ("booking_findings", "search_findings", "summary_findings")
+    )
+
+    for findings_report in (booking, search, booking, summary, booking, search):
+        engine.diagnose(findings_report)
+    # search was evicted when summary arrived; booking stayed warm.
+    assert (engine.cache_stats.hits, engine.cache_stats.misses) == (2, 4)
+
+    clock[0] += 61.0
+    engine.diagnose(booking)
+    assert engine.cache_stats.misses == 5
+    assert engine.cache_stats.evictions == 3
+
+
+def test_diagnosis_engine_keeps_declared_subjects_in_first_seen_order() -> None:
+    reasoning_chain = [f"subject=Agent_{index % 50} called search" for index in range(2000)]
+    findings_report = {
+        "findings": {
+            "trace_analyzer": [{"total_steps": 2000, "reasoning_chain": reasoning_chain}],
+            "tool_analyzer": [{"tool": "search_flights", "issue": "subject: booking"}],
+        }
+    }
+
+    diagnosis = DiagnosisEngine(cache_size=0).diagnose(findings_report)
+
+    assert diagnosis.affected_subjects == [f"agent_{index}" for index in range(50)] + ["booking"]
+
+
+def test_diagnosis_engine_falls_back_to_registered_subject_names(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("INDAGINE_SUBJECTS", "checkout, Search")
+    findings_report = {
+        "findings": {
+            "trace_analyzer": [
+                {"total_steps": 1, "error": "Checkout failed after the SEARCH step returned"}
+            ]
+        }
+    }
+
+    assert DiagnosisEngine().diagnose(findings_report).affected_subjects == ["search", "checkout"]
+    assert DiagnosisEngine(subjects=["checkout"]).diagnose(findings_report).affected_subjects == [
+        "checkout"
+    ]
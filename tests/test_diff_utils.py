@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import difflib
+import random
+
+import pytest
+
+from src.core.diff_utils import (
+    PatchApplyError,
+    apply_fix_change,
+    apply_patch,
+    diff_opcodes,
+    unified_diff,
+)
+
+
+def _random_edit(rng: random.Random, lines: list[str], alphabet: str) -> list[str]:
+    edited = list(lines)
+    for _ in range(rng.randint(1, 6)):
+        choice = rng.random()
+        if choice < 0.33 and edited:
+            del edited[rng.randrange(len(edited))]
+        elif choice < 0.66:
+            edited.insert(rng.randint(0, len(edited)), rng.choice(alphabet))
+        elif edited:
+            edited[rng.randrange(len(edited))] = rng.choice(alphabet)
+    return edited
+
+
+def test_unified_diff_matches_difflib_format_for_a_simple_edit() -> None:
+    before = "\n".join(f"line {index}" for index in range(20))
+    after = before.replace("line 10", "line ten")
+
+    expected = "\n".join(
+        difflib.unified_diff(
+            before.splitlines(),
+            after.splitlines(),
+            fromfile="a/prompt.txt",
+            tofile="b/prompt.txt",
+            lineterm="",
+        )
+    )
+
+    assert unified_diff(before, after, file_path="prompt.txt") == expected + "\n"
+
+
+def test_opcodes_rebuild_target_and_patches_round_trip() -> None:
+    rng = random.Random(11)
+    for _ in range(500):
+        alphabet = rng.choice(["ab", "abcdefgh", "abcdefghijklmnopqrstuvwxyz"])
+        before_lines = [rng.choice(alphabet) for _ in range(rng.randint(1, 30))]
+        after_lines = _random_edit(rng, before_lines, alphabet)
+        if not after_lines or after_lines == before_lines:
+            continue
+
+        rebuilt: list[str] = []
+        for tag, i1, i2, j1, j2 in diff_opcodes(before_lines, after_lines):
+            if tag == "equal":
+                assert before_lines[i1:i2] == after_lines[j1:j2]
+            rebuilt.extend(after_lines[j1:j2])
+        assert rebuilt == after_lines
+
+        before = "\n".join(before_lines) + "\n"
+        after = "\n".join(after_lines) + "\n"
+        assert apply_patch(before, unified_diff(before, after, file_path="f")) == after
+
+
+def test_apply_fix_change_anchors_hunks_at_the_snippet() -> None:
+    snippet = "s1\ns2\ns3\nc\nd\ne\nf"
+    changed = snippet.replace("\nf", "\ng")
+    # The hunk's context (c, d, e, f) also appears, closer to its stated line, above.
+    source = "x\nc\nd\ne\nf\ny\n" + snippet + "\nz\n"
+
+    patched = apply_fix_change(source, snippet, unified_diff(snippet, changed, file_path="f"))
+
+    assert patched == "x\nc\nd\ne\nf\ny\n" + changed + "\nz\n"
+
+
+def test_apply_patch_rejects_diffs_that_do_not_match() -> None:
+    diff = unified_diff("a\nb\nc", "a\nB\nc", file_path="f")
+
+    with pytest.raises(PatchApplyError):
+        apply_patch("a\nx\nc\n", diff)
+    with pytest.raises(PatchApplyError):
+        apply_patch("a\nb\nc\n", "not a diff")
+
+
+@pytest.mark.parametrize(
+    ("before", "after"),
+    [
+        ("a\n-- note\nc\n", "a\nc\n"),
+        ("a\nc\n", "a\n++ x\nc\n"),
+        ("-- old\n++ old\n", "++ new\n-- new\n"),
+    ],
+)
+def test_content_lines_that_look_like_file_headers_are_applied(before: str, after: str) -> None:
+    diff = unified_diff(before, after, file_path="f")
+
+    assert apply_patch(before, diff) == after
+
+
+def test_apply_patch_rejects_truncated_hunks() -> None:
+    diff = unified_diff("a\nb\nc\n", "a\nB\nc\n", file_path="f")
+
+    with pytest.raises(PatchApplyError, match="inside a hunk"):
+        apply_patch("a\nb\nc\n", diff.rsplit("\n", 2)[0] + "\n")
+
+
+def test_large_file_diff_round_trips() -> None:
+    before_lines = [f"rule {index}: keep answers short" for index in range(10_000)]
+    after_lines = list(before_lines)
+    after_lines[5_000] = "rule 5000: cite every source"
+    del after_lines[9_000]
+    before = "\n".join(before_lines) + "\n"
+    after = "\n".join(after_lines) + "\n"
+
+    diff = unified_diff(before, after, file_path="prompt.txt")
+
+    assert diff.count("\n@@ ") == 2
+    assert apply_patch(before, diff) == after
+
+
+def test_unrelated_duplicate_heavy_files_fall_back_to_a_replace_block() -> None:
+    rng = random.Random(5)
+    before = "\n".join(rng.choice("abcd") for _ in range(10_000)) + "\n"
+    after = "\n".join(rng.choice("abcd") for _ in range(10_000)) + "\n"
+
+    diff = unified_diff(before, after, file_path="prompt.txt")
+
+    assert apply_patch(before, diff) == after
+    assert diff.count("\n@@ ") <= 2
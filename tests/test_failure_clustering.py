@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+from src.core.diagnosis_engine import DiagnosisEngine
+from src.core.failure_clustering import FailureClusterIndex, failure_signature, normalize_error
+from src.core.investigation_pipeline import InvestigationPipeline
+from src.models.diagnosis import Diagnosis
+from src.models.findings import FindingsReport
+from src.storage.fix_history_memory import InMemoryFixHistory
+from src.storage.trace_store import TraceStore
+
+
+_FIXTURE_DIR = Path(__file__).parent / "fixtures" / "traces"
+
+
+def _booking_failure(failure_id: str, date: str, timestamp: str) -> dict[str, Any]:
+    error = f"Tool 'flight_search' argument 'date' = '{date}' does not match '^\\d{{4}}-\\d{{2}}'"
+    return {
+        "failure_event": {
+            "failure_id": failure_id,
+            "subject": "booking",
+            "timestamp": timestamp,
+            "error": error,
+        },
+        "trace_record": {
+            "subject": "booking",
+            "steps": [
+                {
+                    "name": "tool_call",
+                    "input": {"tool": "flight_search", "details": {"path": "date"}},
+                    "error": error,
+                }
+            ],
+        },
+    }
+
+
+class _CountingDiagnosisEngine(DiagnosisEngine):
+    def __init__(self, fix_history: InMemoryFixHistory | None = None) -> None:
+        super().__init__(fix_history)
+        self.calls = 0
+
+    def diagnose(
+        self, findings_report: FindingsReport | dict[str, Any], *, failure_id: str | None = None
+    ) -> Diagnosis:
+        self.calls += 1
+        return super().diagnose(findings_report, failure_id=failure_id)
+
+
+class _StubTraceStore:
+    def __init__(self, traces: dict[str, dict[str, Any]]) -> None:
+        self._traces = traces
+
+    def get_trace(self, failure_id: str) -> dict[str, Any]:
+        return self._traces[failure_id]
+
+
+def test_normalize_error_replaces_literal_values() -> None:
+    message = "Timeout after 5.0s on request 3f2a9c1e-0b1d-4c7e-9a55-1e2f3a4b5c6d"
+
+    assert normalize_error(message) == "timeout after <num>s on request <id>"
+    assert normalize_error("Bad  value 'x'\n") == normalize_error('bad value "yy"')
+    assert normalize_error(None) == ""
+
+
+def test_failures_differing_only_in_data_share_a_cluster() -> None:
+    index = FailureClusterIndex()
+
+    first = index.assign("f-1", _booking_failure("f-1", "15/02/2026", "2026-02-11T02:20:00Z"))
+    second = index.assign("f-2", _booking_failure("f-2", "03/04/2026", "2026-02-10T08:00:00Z"))
+    other = index.assign(
+        "f-3",
+        {"failure_event": {"subject": "search", "error": "no sources"}, "trace_record": {}},
+    )
+
+    assert first is second
+    assert other is not first
+    assert len(index) == 2
+    assert first.count == 2
+    assert first.representative_failure_id == "f-1"
+    assert (first.first_seen, first.last_seen) == ("2026-02-10T08:00:00Z", "2026-02-11T02:20:00Z")
+    assert first.signature.tool == "flight_search"
+    assert first.signature.path == "date"
+    assert [cluster.count for cluster in index.clusters()] == [2, 1]
+
+
+def test_failure_signature_distinguishes_argument_paths() -> None:
+    failure = _booking_failure("f-1", "15/02/2026", "2026-02-11T02:20:00Z")
+    moved = json.loads(json.dumps(failure))
+    moved["trace_record"]["steps"][0]["input"]["details"]["path"] = "return_date"
+
+    original = failure_signature(failure["failure_event"], failure["trace_record"])
+    changed = failure_signature(moved["failure_event"], moved["trace_record"])
+
+    assert original.fingerprint != changed.fingerprint
+
+
+def test_investigation_pipeline_diagnoses_each_cluster_once() -> None:
+    trace_record = json.loads((_FIXTURE_DIR / "tool_calls_search.json").read_text(encoding="utf-8"))
+    traces = {
+        f"search-{index}": {
+            "failure_event": {"failure_id": f"search-{index}", "subject": "search"},
+            "trace_record": trace_record,
+        }
+        for index in range(5)
+    }
+    engine = _CountingDiagnosisEngine()
+    clusters = FailureClusterIndex()
+    fix_history = InMemoryFixHistory()
+    pipeline = InvestigationPipeline(
+        _StubTraceStore(traces),
+        diagnosis_engine=engine,
+        fix_history=fix_history,
+        failure_clusters=clusters,
+    )
+
+    results = list(pipeline.run(traces))
+
+    assert engine.calls == 1
+    assert len(clusters) == 1
+    assert {id(result.cluster) for result in results} == {id(clusters.clusters()[0])}
+    assert clusters.clusters()[0].count == 5
+    assert all(result.fixes == results[0].fixes for result in results)
+    diagnosis = results[0].diagnosis
+    assert diagnosis is not None
+    assert len(fix_history.find_similar(diagnosis, results[0].findings, limit=10)) == 5
+
+
+def test_cluster_members_link_fresh_similar_failures_and_follow_catalog_version() -> None:
+    trace_record = json.loads((_FIXTURE_DIR / "tool_calls_search.json").read_text(encoding="utf-8"))
+    traces = {
+        f"search-{index}": {
+            "failure_event": {"failure_id": f"search-{index}", "subject": "search"},
+            "trace_record": trace_record,
+        }
+        for index in range(3)
+    }
+
+    class _Catalog:
+        version = "v1"
+
+    class _CountingFixGenerator:
+        catalog = _Catalog()
+
+        def __init__(self) -> None:
+            self.calls = 0
+
+        def generate_fixes(self, diagnosis: Diagnosis, findings: FindingsReport) -> list[Any]:
+            self.calls += 1
+            return []
+
+    fix_history = InMemoryFixHistory()
+    engine = _CountingDiagnosisEngine(fix_history)
+    fix_generator = _CountingFixGenerator()
+    clusters = FailureClusterIndex()
+    pipeline = InvestigationPipeline(
+        _StubTraceStore(traces),
+        diagnosis_engine=engine,
+        fix_history=fix_history,
+        fix_generator=fix_generator,  # type: ignore[arg-type]
+        failure_clusters=clusters,
+    )
+
+    (first,) = pipeline.run(["search-0"])
+    (second,) = pipeline.run(["search-1"])
+    _Catalog.version = "v2"
+    (third,) = pipeline.run(["search-2"])
+
+    assert engine.calls == 1
+    assert first.diagnosis is not None and first.diagnosis.similar_past_failure_ids == []
+    assert second.diagnosis is not None
+    assert second.diagnosis.similar_past_failure_ids == ["search-0"]
+    assert third.diagnosis is not None
+    assert set(third.diagnosis.similar_past_failure_ids) == {"search-0", "search-1"}
+    assert clusters.clusters()[0].diagnosis is not None
+    assert clusters.clusters()[0].diagnosis.similar_past_failure_ids == []
+    assert fix_generator.calls == 2
+
+
+def test_cluster_members_are_analyzed_on_their_own() -> None:
+    store = TraceStore(backend="memory")
+    queries = {"search-0": "direct flights NYC to LAX", "search-1": "direct flights BOS to SFO"}
+    for failure_id, query in queries.items():
+        trace_record = json.loads(
+            (_FIXTURE_DIR / "tool_calls_search.json").read_text(encoding="utf-8")
+        )
+        trace_record["failure_id"] = failure_id
+        trace_record["steps"][1]["output"]["tool_calls"][0]["args"]["query"] = query
+        store.store_trace({"failure_id": failure_id, "subject": "search"}, trace_record)
+    engine = _CountingDiagnosisEngine()
+    clusters = FailureClusterIndex()
+    pipeline = InvestigationPipeline(
+        store, diagnosis_engine=engine, failure_clusters=clusters, fix_history=InMemoryFixHistory()
+    )
+
+    results = list(pipeline.run(list(queries)))
+
+    assert len(clusters) == 1
+    for result in results:
+        (tool_finding,) = result.findings.findings["tool_analyzer"]
+        assert tool_finding.actual is not None
+        assert tool_finding.actual["tool_calls"][1]["args"]["query"] == queries[result.failure_id]
+        assert "findings_cache" in store.get_trace(result.failure_id)
+    # The findings differ, so the members do not share a classification.
+    assert engine.calls == 2
+
+
+def test_cluster_index_evicts_least_recently_assigned_cluster() -> None:
+    index = FailureClusterIndex(max_clusters=2)
+    booking = _booking_failure("f-1", "15/02/2026", "2026-02-11T02:20:00Z")
+
+    index.assign("f-1", booking)
+    index.assign("f-2", {"failure_event": {"subject": "search", "error": "a"}})
+    index.assign("f-3", _booking_failure("f-3", "03/04/2026", "2026-02-11T02:21:00Z"))
+    index.assign("f-4", {"failure_event": {"subject": "summary", "error": "b"}})
+
+    assert len(index) == 2
+    assert sorted(cluster.signature.subject for cluster in index.clusters()) == [
+        "booking",
+        "summary",
+    ]
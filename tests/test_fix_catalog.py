@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import pytest
+
+from src.core.fix_catalog import FixCatalog, FixParameters
+from src.models.diagnosis import Diagnosis, FailureTaxonomy
+from src.models.findings import FindingsReport
+
+
+def _template(template_id: str, **overrides: object) -> dict[str, object]:
+    template: dict[str, object] = {
+        "id": template_id,
+        "root_cause": "TOOL_MISUSE",
+        "fix_type": "TOOL_CONFIG_FIX",
+        "title": f"Fix {template_id}",
+        "rationale": "Because.",
+        "changes": [
+            {
+                "file": "src/subjects/booking_agent.py",
+                "change_type": "edit",
+                "before": "old()",
+                "after": "new()",
+            }
+        ],
+    }
+    template.update(overrides)
+    return template
+
+
+def _write_catalog(directory: Path, templates: list[dict[str, object]]) -> Path:
+    path = directory / "catalog.json"
+    path.write_text(json.dumps({"templates": templates}), encoding="utf-8")
+    return path
+
+
+def test_default_catalog_covers_every_taxonomy() -> None:
+    catalog = FixCatalog()
+
+    for taxonomy in FailureTaxonomy:
+        assert catalog.proposals(FixParameters(root_cause=taxonomy)), taxonomy
+
+
+def test_lookup_ranks_specific_templates_before_priority() -> None:
+    catalog = FixCatalog.from_templates(
+        [
+            _template("generic-low"),
+            _template("generic-high", priority=10),
+            _template("tool-scoped", tool="search_flights"),
+            _template("other-tool", tool="web_search"),
+            _template("subject-and-tool", subject="booking", tool="search_flights"),
+        ]
+    )
+
+    ranked = catalog.lookup(
+        FixParameters(
+            root_cause=FailureTaxonomy.TOOL_MISUSE, subject="booking", tool="search_flights"
+        )
+    )
+
+    assert [template.id for template in ranked] == [
+        "subject-and-tool",
+        "tool-scoped",
+        "generic-high",
+        "generic-low",
+    ]
+
+
+def test_parameters_are_substituted_from_findings() -> None:
+    catalog = FixCatalog.from_templates(
+        [
+            _template(
+                "validate-arg",
+                title="Validate ${tool}.${arg_path} for ${subject}",
+                changes=[
+                    {
+                        "file": "src/subjects/${subject}_agent.py",
+                        "change_type": "edit",
+                        "before": "call(${tool})",
+                        "after": "validate('${arg_path}')\ncall(${tool})",
+                    }
+                ],
+            )
+        ]
+    )
+    diagnosis = Diagnosis(
+        root_cause=FailureTaxonomy.TOOL_MISUSE,
+        confidence=0.9,
+        explanation="fixture",
+        affected_subjects=["booking"],
+    )
+    findings = FindingsReport.model_validate(
+        {
+            "findings": {
+                "tool_analyzer": [
+                    {
+                        "tool": "search_flights",
+                        "issue": "tool_misuse_detected",
+                        "actual": {"schema_mismatches": [{"path": "date", "message": "bad"}]},
+                    }
+                ]
+            }
+        }
+    )
+
+    (proposal,) = catalog.proposals(FixParameters.from_diagnosis(diagnosis, findings))
+
+    assert proposal.title == "Validate search_flights.date for booking"
+    assert proposal.changes[0].file == "src/subjects/booking_agent.py"
+    assert "+validate('date')" in proposal.changes[0].diff
+
+
+def test_defaults_fill_parameters_missing_from_the_diagnosis() -> None:
+    catalog = FixCatalog.from_templates(
+        [_template("defaults", rationale="Call ${tool} carefully.", defaults={"tool": "the tool"})]
+    )
+
+    (proposal,) = catalog.proposals(FixParameters(root_cause=FailureTaxonomy.TOOL_MISUSE))
+
+    assert proposal.rationale == "Call the tool carefully."
+
+
+def test_unknown_parameters_and_duplicate_ids_are_rejected() -> None:
+    with pytest.raises(ValueError, match="unknown parameters"):
+        FixCatalog.from_templates([_template("bad", title="${secret}")])
+    with pytest.raises(ValueError, match="Duplicate"):
+        FixCatalog.from_templates([_template("same"), _template("same")])
+
+
+def test_reload_swaps_catalog_and_keeps_previous_on_invalid_file(tmp_path: Path) -> None:
+    path = _write_catalog(tmp_path, [_template("first")])
+    catalog = FixCatalog(tmp_path)
+    original_version = catalog.version
+
+    _write_catalog(tmp_path, [_template("first"), _template("second", priority=1)])
+    assert catalog.reload() is True
+    assert catalog.version != original_version
+    assert [template.id for template in catalog.templates()] == ["first", "second"]
+
+    path.write_text("{not json", encoding="utf-8")
+    assert catalog.reload() is False
+    assert [template.id for template in catalog.templates()] == ["first", "second"]
+
+
+def test_invalid_catalog_fails_on_initial_load(tmp_path: Path) -> None:
+    _write_catalog(tmp_path, [{"id": "incomplete"}])
+
+    with pytest.raises(ValueError, match="Invalid fix template file"):
+        FixCatalog(tmp_path)
+
+
+def test_watch_picks_up_template_changes(tmp_path: Path) -> None:
+    path = _write_catalog(tmp_path, [_template("first")])
+    catalog = FixCatalog(tmp_path)
+    catalog.watch(interval_s=0.01)
+    try:
+        _write_catalog(tmp_path, [_template("replaced")])
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+        deadline = time.monotonic() + 2.0
+        while time.monotonic() < deadline:
+            if [template.id for template in catalog.templates()] == ["replaced"]:
+                break
+            time.sleep(0.01)
+    finally:
+        catalog.stop_watching()
+
+    assert [template.id for template in catalog.templates()] == ["replaced"]
+
+
+def test_missing_directory_keeps_the_catalog_and_watch_keeps_polling(tmp_path: Path) -> None:
+    directory = tmp_path / "templates"
+    directory.mkdir()
+    _write_catalog(directory, [_template("first")])
+    catalog = FixCatalog(directory)
+    catalog.watch(interval_s=0.01)
+    try:
+        shutil.rmtree(directory)
+        assert catalog.reload() is False
+        time.sleep(0.05)
+        assert [template.id for template in catalog.templates()] == ["first"]
+
+        directory.mkdir()
+        _write_catalog(directory, [_template("restored")])
+        deadline = time.monotonic() + 2.0
+        while time.monotonic() < deadline:
+            if [template.id for template in catalog.templates()] == ["restored"]:
+                break
+            time.sleep(0.01)
+    finally:
+        catalog.stop_watching()
+
+    assert [template.id for template in catalog.templates()] == ["restored"]
@@ -4,8 +4,10 @@ import json
 from pathlib import Path
 
 import pytest
+from pydantic import ValidationError
 
-from src.core.fix_generator import generate_fixes
+from src.core.fix_catalog import FixCatalog, default_catalog
+from src.core.fix_generator import FixGenerator, generate_fixes, generate_fixes_batch
 from src.models.diagnosis import Diagnosis, FailureTaxonomy
 from src.models.findings import FindingsReport
 from src.models.fixes import FixType
@@ -87,3 +89,91 @@ def test_generate_fixes_spans_all_fix_type_categories_across_taxonomy_suite() ->
         FixType.TOOL_CONFIG_FIX,
         FixType.GUARDRAIL_FIX,
     }
+
+
+def test_generate_fixes_reuses_cached_proposals_per_taxonomy() -> None:
+    generator = FixGenerator()
+    findings_report = _load_findings_fixture("booking_findings")
+
+    first = generator.generate_fixes(_diagnosis(FailureTaxonomy.TOOL_MISUSE), findings_report)
+    second = generator.generate_fixes(_diagnosis(FailureTaxonomy.TOOL_MISUSE), findings_report)
+
+    assert first == second
+    assert first[0] is second[0]
+    assert first is not second
+    assert generate_fixes(_diagnosis(FailureTaxonomy.TOOL_MISUSE), findings_report) == first
+
+
+def test_proposal_cache_is_bounded_per_generator() -> None:
+    generator = FixGenerator(cache_size=1)
+    booking = _load_findings_fixture("booking_findings")
+    summary = _load_findings_fixture("summary_findings")
+
+    first = generator.generate_fixes(_diagnosis(FailureTaxonomy.TOOL_MISUSE), booking)[0]
+    generator.generate_fixes(_diagnosis(FailureTaxonomy.HALLUCINATION), summary)
+    again = generator.generate_fixes(_diagnosis(FailureTaxonomy.TOOL_MISUSE), booking)[0]
+
+    assert again is not first
+    assert again == first
+    assert len(generator._proposal_cache) == 1
+    assert (
+        FixGenerator().generate_fixes(_diagnosis(FailureTaxonomy.TOOL_MISUSE), booking)[0]
+        is not again
+    )
+
+
+def test_catalog_reload_drops_proposals_of_the_previous_version(tmp_path: Path) -> None:
+    templates = [template.model_dump(mode="json") for template in default_catalog().templates()]
+    catalog_path = tmp_path / "catalog.json"
+    catalog_path.write_text(json.dumps({"templates": templates}), encoding="utf-8")
+    generator = FixGenerator(FixCatalog(tmp_path))
+    diagnosis = _diagnosis(FailureTaxonomy.TOOL_MISUSE)
+    findings_report = _load_findings_fixture("booking_findings")
+    generator.generate_fixes(diagnosis, findings_report)
+    generator.generate_fixes(_diagnosis(FailureTaxonomy.HALLUCINATION), findings_report)
+
+    templates[0]["priority"] = int(templates[0].get("priority") or 0) + 1
+    catalog_path.write_text(json.dumps({"templates": templates}), encoding="utf-8")
+    assert generator.catalog.reload() is True
+    generator.generate_fixes(diagnosis, findings_report)
+
+    assert [version for version, _ in generator._proposal_cache] == [generator.catalog.version]
+
+
+def test_catalog_version_is_part_of_the_cache_key() -> None:
+    findings_report = _load_findings_fixture("booking_findings")
+    diagnosis = _diagnosis(FailureTaxonomy.TOOL_MISUSE)
+    cached = generate_fixes(diagnosis, findings_report)[0]
+
+    template = default_catalog().templates()[0].model_copy(update={"priority": 5})
+    rebuilt = FixGenerator(FixCatalog.from_templates([template])).generate_fixes(
+        diagnosis, findings_report
+    )[0]
+
+    assert rebuilt is not cached
+    assert rebuilt == cached
+
+
+def test_cached_proposals_are_immutable() -> None:
+    proposal = generate_fixes(
+        _diagnosis(FailureTaxonomy.HALLUCINATION), _load_findings_fixture("summary_findings")
+    )[0]
+
+    with pytest.raises(ValidationError):
+        proposal.title = "changed"
+    with pytest.raises(ValidationError):
+        proposal.changes[0].diff = ""
+
+
+def test_generate_fixes_batch_shares_proposals_across_diagnoses() -> None:
+    items = [
+        (_diagnosis(taxonomy), _load_findings_fixture(fixture_name))
+        for fixture_name, taxonomy in _FIXTURE_TAXONOMY.items()
+    ] * 3
+
+    batches = generate_fixes_batch(items)
+
+    assert len(batches) == len(items)
+    per_taxonomy = len(_FIXTURE_TAXONOMY)
+    for index, proposals in enumerate(batches[per_taxonomy:], start=per_taxonomy):
+        assert proposals[0] is batches[index % per_taxonomy][0]
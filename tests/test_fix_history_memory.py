@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import time
+
 from src.models.diagnosis import Diagnosis, FailureTaxonomy
 from src.models.failure import FailureEvent
 from src.models.findings import FindingsReport
 from src.storage.fix_history_memory import InMemoryFixHistory
+from src.storage.retention import RetentionPolicy
 
 
 def _failure_event(failure_id: str) -> FailureEvent:
@@ -73,3 +76,26 @@ def test_find_similar_respects_limit() -> None:
 
     assert len(similar_ids) == 2
     assert set(similar_ids).issubset({"failure-1", "failure-2", "failure-3"})
+
+
+def test_retention_expires_failures_and_caps_passed_runs() -> None:
+    retention = RetentionPolicy(
+        ttl_s_by_status={"failed": 60}, max_passed_runs=1, sweep_interval_s=None
+    )
+    store = InMemoryFixHistory(retention=retention)
+    diagnosis = _diagnosis(FailureTaxonomy.TOOL_MISUSE, "schema_mismatch")
+    store.record_failure(_failure_event("failure-1"), diagnosis)
+    for failure_id in ("passed-1", "passed-2"):
+        passed_event = _failure_event(failure_id).model_copy(update={"failure_type": "none"})
+        store.record_batch([(passed_event, diagnosis, [])])
+    started = time.time()
+
+    report = store.apply_retention(now=started + 1)
+    assert (report.expired, report.capped) == (0, 1)
+    assert store.find_similar(diagnosis, FindingsReport(findings={})) == [
+        "failure-1",
+        "passed-2",
+    ]
+
+    assert store.apply_retention(now=started + 61).expired == 1
+    assert store.find_similar(diagnosis, FindingsReport(findings={})) == ["passed-2"]
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import sys
+
+import pytest
+
+from src.core.diff_utils import unified_diff
+from src.core.fix_validator import FixApplyError, FixValidator, apply_change
+from src.models.fixes import FixChange, FixProposal, FixType
+
+
+_BOOKING_FILE = "src/subjects/booking_agent.py"
+_BOOKING_ARGS_BEFORE = '                "args": {\n                    "date": "15/02/2026",'
+_BOOKING_FROM = '                    "from": "NYC",'
+_BOOKING_ARGS_AFTER = '                "args": {\n                    "date": "2026-02-15",'
+
+
+def _proposal(before: str, after: str, *, file: str = _BOOKING_FILE) -> FixProposal:
+    return FixProposal(
+        fix_type=FixType.TOOL_CONFIG_FIX,
+        title="test fix",
+        rationale="test",
+        changes=(
+            FixChange(
+                file=file,
+                change_type="edit",
+                before=before,
+                after=after,
+                diff=unified_diff(before, after, file_path=file),
+            ),
+        ),
+    )
+
+
+def test_apply_change_patches_the_snippet_or_raises() -> None:
+    (change,) = _proposal("a\nb", "a\nc", file="x.py").changes
+
+    assert apply_change("b\na\nb\nz\n", change) == "b\na\nc\nz\n"
+    with pytest.raises(FixApplyError):
+        apply_change("a\nd\n", change)
+
+
+def test_fix_that_resolves_the_failure_passes_and_restores_modules() -> None:
+    import src.subjects.booking_agent as booking_agent
+    import src.subjects.run_subjects as run_subjects
+
+    with FixValidator(max_workers=1) as validator:
+        result = validator.validate("booking", _proposal(_BOOKING_ARGS_BEFORE, _BOOKING_ARGS_AFTER))
+
+    assert result.passed and result.applied
+    assert result.status == "passed"
+    assert result.failure_type == "none"
+    assert sys.modules["src.subjects.booking_agent"] is booking_agent
+    assert sys.modules["src.subjects.run_subjects"] is run_subjects
+    assert booking_agent.booking_scenario_payload()["tool_calls"][0]["args"]["date"] == (
+        "15/02/2026"
+    )
+
+
+def test_fix_that_does_not_apply_or_breaks_the_module_fails() -> None:
+    with FixValidator(max_workers=1) as validator:
+        stale, broken, unchanged = validator.validate_many(
+            [
+                ("booking", _proposal("not in the file", "anything")),
+                (
+                    "booking",
+                    _proposal(_BOOKING_ARGS_BEFORE, _BOOKING_ARGS_BEFORE + "\n    )(syntax"),
+                ),
+                ("booking", _proposal(_BOOKING_FROM, _BOOKING_FROM.replace("NYC", "JFK"))),
+            ]
+        )
+
+    assert not stale.applied and not stale.passed
+    assert "does not apply" in (stale.error or "")
+    assert broken.applied and not broken.passed
+    assert broken.failure_type == "exception"
+    assert unchanged.applied and not unchanged.passed
+    assert unchanged.failure_type == "validation_error"
+
+
+def test_worker_pool_validates_in_input_order() -> None:
+    fixed = _proposal(_BOOKING_ARGS_BEFORE, _BOOKING_ARGS_AFTER)
+    unfixed = _proposal(_BOOKING_FROM, _BOOKING_FROM.replace("NYC", "JFK"))
+
+    with FixValidator(max_workers=2) as validator:
+        results = validator.validate_many([("booking", fixed), ("booking", unfixed)] * 3)
+
+    assert [result.passed for result in results] == [True, False] * 3
+
+
+def test_single_validation_with_workers_stays_out_of_the_calling_process(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def fail_in_caller(*args: object, **kwargs: object) -> None:
+        raise AssertionError("patched modules were loaded in the calling process")
+
+    monkeypatch.setattr("src.core.fix_validator._swapped_modules", fail_in_caller)
+
+    with FixValidator(max_workers=2) as validator:
+        result = validator.validate("booking", _proposal(_BOOKING_ARGS_BEFORE, _BOOKING_ARGS_AFTER))
+
+    assert result.passed
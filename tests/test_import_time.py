@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+_HEAVY_PREFIXES = ("azure", "jsonschema", "opentelemetry")
+# Generous enough for a cold, loaded CI runner; pydantic alone is ~150ms locally.
+_IMPORT_BUDGET_US = 1_500_000
+
+
+def _import_times(module_name: str) -> dict[str, int]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        cwd=_REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    cumulative_us: dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, imported = line.split("|")
+        cumulative_us[imported.strip()] = int(cumulative)
+    return cumulative_us
+
+
+@pytest.mark.parametrize(
+    "module_name",
+    [
+        "src.storage.fix_history",
+        "src.storage.cosmos_client",
+        "src.core.diagnosis_engine",
+        "src.core.investigation_pipeline",
+        "src.scripts.run_and_capture",
+    ],
+)
+def test_module_import_skips_heavy_dependencies(module_name: str) -> None:
+    cumulative_us = _import_times(module_name)
+
+    heavy = sorted(name for name in cumulative_us if name.startswith(_HEAVY_PREFIXES))
+    assert heavy == []
+    assert cumulative_us[module_name] < _IMPORT_BUDGET_US
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
 import json
+import time
 from pathlib import Path
 
+import pytest
+
 from src.core.indagine_controller import run_indagine
 from src.core.indagine_pipeline import IndaginePipeline
+from src.models.failure import FailureEvent
+from src.storage.retention import RetentionPolicy
+from src.storage.trace_store import TraceStore
 
 
 _FIXTURE_DIR = Path(__file__).parent / "fixtures" / "traces"
@@ -59,3 +65,80 @@ def test_indagine_pipeline_uses_injected_trace_store() -> None:
 
     assert requested_failure_ids == ["booking-failure"]
     assert set(report.findings.keys()) == {"trace_analyzer", "tool_analyzer"}
+
+
+def test_indagine_pipeline_reuses_cached_findings_until_trace_changes() -> None:
+    trace_record = _load_trace_fixture("booking")
+    failure_id = str(trace_record["failure_id"])
+    failure_event = FailureEvent(
+        failure_id=failure_id,
+        subject="booking",
+        failure_type="validation_error",
+        timestamp=str(trace_record["ended_at"]),
+        error="date must match format",
+    )
+    trace_store = TraceStore(backend="memory")
+    trace_store.store_trace(failure_event, trace_record)
+    pipeline = IndaginePipeline(trace_store=trace_store)
+
+    first = pipeline.run_many([failure_id])[failure_id]
+    second = pipeline.run(failure_id)
+
+    assert second == first
+    assert (pipeline.cache_stats.hits, pipeline.cache_stats.misses) == (1, 1)
+
+    trace_record["status"] = "hallucinated"
+    trace_store.store_trace(failure_event, trace_record)
+    pipeline.run(failure_id)
+
+    assert (pipeline.cache_stats.hits, pipeline.cache_stats.misses) == (1, 2)
+
+
+def test_indagine_pipeline_keeps_cached_findings_of_compacted_traces() -> None:
+    trace_record = _load_trace_fixture("booking")
+    failure_id = str(trace_record["failure_id"])
+    failure_event = FailureEvent(
+        failure_id=failure_id,
+        subject="booking",
+        failure_type="validation_error",
+        timestamp=str(trace_record["ended_at"]),
+        error="date must match format",
+    )
+    retention = RetentionPolicy(compact_after_s=60, sweep_interval_s=None)
+    trace_store = TraceStore(backend="memory", retention=retention)
+    trace_store.store_trace(failure_event, trace_record)
+    pipeline = IndaginePipeline(trace_store=trace_store)
+    first = pipeline.run(failure_id)
+
+    assert trace_store.apply_retention(now=time.time() + 61).compacted == 1
+    assert pipeline.run(failure_id) == first
+    assert (pipeline.cache_stats.hits, pipeline.cache_stats.misses) == (1, 1)
+
+
+def test_indagine_pipeline_prefetches_batches_in_input_order() -> None:
+    trace_record = _load_trace_fixture("booking")
+    batches: list[list[str]] = []
+
+    class BatchTraceStore:
+        def get_trace(self, failure_id: str) -> dict[str, object]:
+            raise AssertionError("batched stores should not be point-read")
+
+        def get_traces(self, failure_ids: list[str]) -> dict[str, dict[str, object]]:
+            batches.append(list(failure_ids))
+            return {
+                failure_id: {"trace_record": trace_record}
+                for failure_id in failure_ids
+                if failure_id != "missing"
+            }
+
+    pipeline = IndaginePipeline(
+        trace_store=BatchTraceStore(), read_batch_size=2, read_ahead=2, max_concurrency=2
+    )
+    failure_ids = [f"booking-{index}" for index in range(5)]
+
+    reports = pipeline.run_many(failure_ids)
+
+    assert list(reports) == failure_ids
+    assert sorted(batches) == [failure_ids[0:2], failure_ids[2:4], failure_ids[4:5]]
+    with pytest.raises(KeyError):
+        pipeline.run_many(["booking-0", "missing"])
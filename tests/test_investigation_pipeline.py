@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src.core.investigation_pipeline import InvestigationPipeline
+from src.models.diagnosis import FailureTaxonomy
+from src.storage.fix_history_memory import InMemoryFixHistory
+
+
+_FIXTURE_DIR = Path(__file__).parent / "fixtures" / "traces"
+
+
+def _load_trace_fixture(name: str) -> dict[str, object]:
+    fixture_path = _FIXTURE_DIR / f"{name}.json"
+    return json.loads(fixture_path.read_text(encoding="utf-8"))
+
+
+class _StubTraceStore:
+    def __init__(self, traces: dict[str, dict[str, object]]) -> None:
+        self._traces = traces
+        self.requested: list[str] = []
+
+    def get_trace(self, failure_id: str) -> dict[str, object]:
+        self.requested.append(failure_id)
+        if failure_id not in self._traces:
+            raise KeyError(f"Trace '{failure_id}' not found.")
+        return {
+            "failure_event": {"failure_id": failure_id, "subject": "booking"},
+            "trace_record": self._traces[failure_id],
+        }
+
+
+def test_investigation_pipeline_runs_every_stage_and_persists_in_batches() -> None:
+    trace_record = _load_trace_fixture("tool_calls_search")
+    traces = {f"search-{index}": trace_record for index in range(7)}
+    fix_history = InMemoryFixHistory()
+    pipeline = InvestigationPipeline(
+        _StubTraceStore(traces),
+        fix_history=fix_history,
+        fetch_concurrency=3,
+        queue_size=2,
+        persist_batch_size=3,
+    )
+
+    results = list(pipeline.run(traces))
+
+    assert [result.failure_id for result in results] == list(traces)
+    for result in results:
+        assert result.diagnosis is not None
+        assert result.diagnosis.root_cause == FailureTaxonomy.TOOL_MISUSE
+        assert result.fixes
+
+    diagnosis = results[0].diagnosis
+    assert diagnosis is not None
+    assert len(fix_history.find_similar(diagnosis, results[0].findings, limit=10)) == 7
+
+    report = {row["stage"]: row for row in pipeline.metrics_report()}
+    assert set(report) == {"fetch", "analyze", "diagnose", "fix", "persist"}
+    assert all(row["items"] == 7 for row in report.values())
+
+
+def test_investigation_pipeline_reraises_stage_errors() -> None:
+    pipeline = InvestigationPipeline(_StubTraceStore({}), fetch_concurrency=2)
+
+    with pytest.raises(KeyError):
+        list(pipeline.run(["missing-1", "missing-2"]))
+
+
+def test_investigation_pipeline_attaches_fix_validations() -> None:
+    from src.core.fix_validator import FixValidator
+
+    trace_record = _load_trace_fixture("tool_calls_search")
+    traces = {f"search-{index}": trace_record for index in range(2)}
+    with FixValidator(max_workers=2) as validator:
+        pipeline = InvestigationPipeline(_StubTraceStore(traces), fix_validator=validator)
+        results = list(pipeline.run(traces))
+
+    for result in results:
+        assert len(result.fix_validations) == len(result.fixes)
+        assert all(validation.subject == "booking" for validation in result.fix_validations)
+    report = {row["stage"]: row for row in pipeline.metrics_report()}
+    assert report["validate"]["items"] == 2
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from src.core.diagnosis_engine import DiagnosisEngine
+from src.core.fix_generator import FixGenerator
+from src.core.metrics import MetricsRegistry, format_percentile_table, metrics, percentile_rows
+
+
+_FINDINGS_FIXTURE = Path(__file__).parent / "fixtures" / "findings" / "booking_findings.json"
+
+
+@pytest.fixture
+def enabled_metrics(monkeypatch: pytest.MonkeyPatch) -> Iterator[MetricsRegistry]:
+    monkeypatch.setattr(metrics, "enabled", True)
+    metrics.reset()
+    yield metrics
+    metrics.reset()
+
+
+def test_disabled_registry_records_nothing() -> None:
+    registry = MetricsRegistry(enabled=False)
+
+    with registry.timer("stage"):
+        pass
+    registry.increment("counter")
+
+    assert registry.snapshot() == {"histograms": {}, "counters": {}}
+
+
+def test_percentiles_use_nearest_rank() -> None:
+    registry = MetricsRegistry(enabled=True)
+    for millis in range(1, 101):
+        registry.observe("stage", millis / 1000)
+
+    (row,) = percentile_rows(registry.snapshot())
+
+    assert row["count"] == 100
+    assert row["p50_ms"] == pytest.approx(50.0)
+    assert row["p99_ms"] == pytest.approx(99.0)
+    assert row["max_ms"] == pytest.approx(100.0)
+
+
+def test_reservoir_bounds_samples_but_keeps_exact_count() -> None:
+    registry = MetricsRegistry(enabled=True, max_samples=16)
+    for _ in range(1000):
+        registry.observe("stage", 0.001)
+
+    histogram = registry.snapshot()["histograms"]["stage"]
+
+    assert histogram["count"] == 1000
+    assert len(histogram["samples"]) == 16
+
+
+def test_diagnosis_and_fix_stages_are_timed(enabled_metrics: MetricsRegistry) -> None:
+    findings_report = json.loads(_FINDINGS_FIXTURE.read_text(encoding="utf-8"))
+    diagnosis = DiagnosisEngine().diagnose(findings_report)
+    # Diffs are only computed when a proposal template is first built, so use a fresh cache.
+    FixGenerator().generate_fixes(diagnosis, findings_report)
+
+    snapshot = enabled_metrics.snapshot()
+    for stage in (
+        "diagnosis.validate",
+        "diagnosis.classify",
+        "diagnosis.affected_subjects",
+        "diagnosis.find_similar",
+        "fix.validate",
+        "fix.diff",
+    ):
+        assert snapshot["histograms"][stage]["count"] == 1
+
+    table = format_percentile_table(snapshot)
+    assert table.splitlines()[0].split() == [
+        "stage",
+        "count",
+        "mean_ms",
+        "p50_ms",
+        "p90_ms",
+        "p99_ms",
+        "max_ms",
+    ]
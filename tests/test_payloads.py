@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import random
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from src.storage.blob_store import LocalBlobStore
+from src.storage.payloads import PAYLOAD_MARKER, PayloadPolicy, decompress
+from src.storage.retention import RetentionPolicy
+from src.storage.trace_store import TraceStore
+
+
+_POLICY = PayloadPolicy(compress_threshold_bytes=1024, offload_threshold_bytes=4096, codec="gzip")
+
+
+class _CountingBlobStore(LocalBlobStore):
+    def __init__(self, root: Path) -> None:
+        super().__init__(root)
+        self.reads = 0
+
+    def get(self, digest: str) -> bytes:
+        self.reads += 1
+        return super().get(digest)
+
+
+def _noise(size: int, seed: int) -> str:
+    rng = random.Random(seed)
+    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz0123456789") for _ in range(size))
+
+
+def _store(store: TraceStore, failure_id: str, outputs: list[dict[str, object]]) -> None:
+    failure_event = {
+        "failure_id": failure_id,
+        "subject": "search",
+        "failure_type": "validation_error",
+        "timestamp": "2026-02-11T00:00:00Z",
+        "error": "sources is empty",
+    }
+    trace_record = {
+        "failure_id": failure_id,
+        "subject": "search",
+        "status": "failed",
+        "started_at": "2026-02-11T00:00:00Z",
+        "ended_at": "2026-02-11T00:00:01Z",
+        "steps": [
+            {"name": f"step_{index}", "kind": "tool_call", "input": {"q": "x"}, "output": output}
+            for index, output in enumerate(outputs)
+        ],
+    }
+    store.store_trace(failure_event, trace_record)
+
+
+def test_step_payloads_round_trip_through_compression_and_blobs(tmp_path: Path) -> None:
+    blob_store = LocalBlobStore(tmp_path)
+    store = TraceStore(backend="memory", payloads=_POLICY, blob_store=blob_store)
+    outputs = [
+        {"text": "short"},
+        {"text": "repeated words " * 500},
+        {"text": _noise(20_000, seed=1)},
+    ]
+
+    _store(store, "failure-1", outputs)
+    raw = store.get_trace("failure-1", resolve_payloads=False)
+
+    steps = raw["trace_record"]["steps"]
+    assert steps[0]["output"] == {"text": "short"}
+    assert set(steps[1]["output"][PAYLOAD_MARKER]) == {"codec", "size", "data"}
+    assert set(steps[2]["output"][PAYLOAD_MARKER]) == {"codec", "size", "blob"}
+    resolved = store.get_trace("failure-1")["trace_record"]["steps"]
+    assert [step["output"] for step in resolved] == outputs
+    lazily_resolved = store.resolve_payloads(raw)["trace_record"]["steps"]
+    assert [step["output"] for step in lazily_resolved] == outputs
+
+
+def test_identical_payloads_share_one_blob_and_are_fetched_lazily(tmp_path: Path) -> None:
+    blob_store = _CountingBlobStore(tmp_path)
+    store = TraceStore(backend="memory", payloads=_POLICY, blob_store=blob_store)
+    large = {"text": _noise(20_000, seed=2)}
+
+    for failure_id in ("failure-1", "failure-2"):
+        _store(store, failure_id, [large])
+
+    assert len([path for path in tmp_path.rglob("*") if path.is_file()]) == 1
+    listed = store.list_traces(resolve_payloads=False).items
+    assert blob_store.reads == 0
+    assert store.resolve_payloads(listed[1])["trace_record"]["steps"][0]["output"] == large
+    assert blob_store.reads == 1
+
+
+def test_offloaded_payloads_need_a_blob_store(tmp_path: Path) -> None:
+    store = TraceStore(backend="memory", payloads=_POLICY, blob_store=LocalBlobStore(tmp_path))
+    _store(store, "failure-1", [{"text": _noise(20_000, seed=3)}])
+    raw = store.get_trace("failure-1", resolve_payloads=False)
+
+    with pytest.raises(ValueError):
+        TraceStore(backend="memory").resolve_payloads(raw)
+    with pytest.raises(KeyError):
+        LocalBlobStore(tmp_path / "empty").get("0" * 64)
+
+
+def test_retention_deletes_blobs_no_trace_references_after_the_grace_period(
+    tmp_path: Path,
+) -> None:
+    blob_store = LocalBlobStore(tmp_path)
+    retention = RetentionPolicy(compact_after_s=60, sweep_interval_s=None)
+    store = TraceStore(
+        backend="memory", retention=retention, payloads=_POLICY, blob_store=blob_store
+    )
+    shared = {"text": _noise(20_000, seed=4)}
+    _store(store, "failure-1", [shared, {"text": _noise(20_000, seed=5)}])
+    _store(store, "failure-2", [shared])
+    store.store_findings("failure-1", "key-1", {"findings": {}})
+    assert len(list(blob_store.digests())) == 2
+
+    # Compaction releases failure-1's own blob, but it is still within the grace period.
+    report = store.apply_retention(now=time.time() + 120)
+    assert (report.compacted, report.blobs_deleted) == (1, 0)
+
+    report = store.apply_retention(now=time.time() + 2 * retention.orphan_blob_grace_s)
+    assert report.blobs_deleted == 1
+    assert len(list(blob_store.digests())) == 1
+    assert store.get_trace("failure-2")["trace_record"]["steps"][0]["output"] == shared
+
+
+def test_zstd_payloads_without_zstandard_name_the_extra(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(sys.modules, "zstandard", None)
+
+    with pytest.raises(RuntimeError, match="'zstd' extra"):
+        decompress(b"", "zstd")
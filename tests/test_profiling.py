@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+import pstats
+import threading
+import time
+from pathlib import Path
+
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from src.core.diagnosis_engine import DiagnosisEngine
+from src.core.profiling import InvestigationProfiler, ProfilingOptions
+from src.core.tracing import TracingOptions, build_tracer_provider
+
+
+_FINDINGS_FIXTURE = Path(__file__).parent / "fixtures" / "findings" / "booking_findings.json"
+
+
+def _profiler(
+    tmp_path: Path, **options: object
+) -> tuple[InvestigationProfiler, InMemorySpanExporter]:
+    exporter = InMemorySpanExporter()
+    provider = build_tracer_provider(TracingOptions(span_processor="simple"), exporter)
+    profiler = InvestigationProfiler(
+        ProfilingOptions(directory=str(tmp_path), **options),  # type: ignore[arg-type]
+        tracer=provider.get_tracer(__name__),
+    )
+    return profiler, exporter
+
+
+def test_slow_diagnosis_saves_cprofile_and_links_it_from_the_span(tmp_path: Path) -> None:
+    profiler, exporter = _profiler(tmp_path, threshold_ms=0.0)
+    findings_report = json.loads(_FINDINGS_FIXTURE.read_text(encoding="utf-8"))
+
+    DiagnosisEngine(profiler=profiler).diagnose(findings_report, failure_id="booking/123")
+
+    (span,) = exporter.get_finished_spans()
+    assert span.name == "indagine.diagnose"
+    profile_path = Path(str(span.attributes["indagine.profile.path"]))
+    assert profile_path == tmp_path / "booking_123.diagnose.prof"
+    assert pstats.Stats(str(profile_path)).total_calls > 0
+
+
+def test_fast_runs_keep_no_profile(tmp_path: Path) -> None:
+    profiler, exporter = _profiler(tmp_path, threshold_ms=60_000.0)
+
+    with profiler.profile("analyze", "search-1"):
+        pass
+
+    (span,) = exporter.get_finished_spans()
+    assert "indagine.profile.path" not in (span.attributes or {})
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_sampling_mode_writes_folded_stacks_and_nested_stages_share_one_profile(
+    tmp_path: Path,
+) -> None:
+    profiler, exporter = _profiler(
+        tmp_path, threshold_ms=0.0, mode="sampling", sample_interval_ms=1.0
+    )
+
+    with profiler.profile("analyze", "summary-1"):
+        with profiler.profile("diagnose", "summary-1"):
+            time.sleep(0.05)
+
+    assert [span.name for span in exporter.get_finished_spans()] == ["indagine.analyze"]
+    folded = (tmp_path / "summary-1.analyze.folded").read_text(encoding="utf-8")
+    assert "test_profiling.py:test_sampling_mode" in folded
+
+
+def test_concurrent_cprofile_stages_fall_back_to_sampling(tmp_path: Path) -> None:
+    profiler, exporter = _profiler(tmp_path, threshold_ms=0.0, sample_interval_ms=1.0)
+    both_inside = threading.Barrier(2, timeout=5)
+    errors: list[BaseException] = []
+
+    def run_stage(stage: str) -> None:
+        try:
+            with profiler.profile(stage, "booking-1"):
+                both_inside.wait()
+                time.sleep(0.02)
+        except BaseException as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=run_stage, args=(stage,)) for stage in ("a", "b")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(exporter.get_finished_spans()) == 2
+    assert sorted(path.suffix for path in tmp_path.iterdir()) == [".folded", ".prof"]
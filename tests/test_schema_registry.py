@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+
+from src.tools.schema_registry import SchemaRegistry
+
+
+_DATE_STRING_SCHEMA = {
+    "type": "object",
+    "properties": {"date": {"type": "string"}},
+    "required": ["date"],
+}
+_DATE_PATTERN_SCHEMA = {
+    "type": "object",
+    "properties": {"date": {"type": "string", "pattern": "^\\d{4}-\\d{2}-\\d{2}$"}},
+    "required": ["date"],
+}
+
+
+def _write_schema(schemas_dir: Path, tool_name: str, schema: dict[str, object]) -> None:
+    (schemas_dir / f"{tool_name}.json").write_text(json.dumps(schema), encoding="utf-8")
+
+
+def test_register_schema_keeps_versions_for_historical_validation(tmp_path: Path) -> None:
+    _write_schema(tmp_path, "search_flights", _DATE_STRING_SCHEMA)
+    registry = SchemaRegistry(schemas_dir=tmp_path)
+
+    pushed = registry.register_schema(
+        "search_flights", _DATE_PATTERN_SCHEMA, activated_at="2099-01-01T00:00:00Z"
+    )
+
+    assert pushed.version == 2
+    assert [item.version for item in registry.versions("search_flights")] == [1, 2]
+    assert registry.validate("search_flights", {"date": "15/02/2026"})
+    assert (
+        registry.validate("search_flights", {"date": "15/02/2026"}, as_of="2026-02-11T00:00:00Z")
+        == []
+    )
+
+
+def test_reload_swaps_changed_schema_and_ignores_unchanged(tmp_path: Path) -> None:
+    _write_schema(tmp_path, "search_flights", _DATE_STRING_SCHEMA)
+    registry = SchemaRegistry(schemas_dir=tmp_path)
+
+    assert registry.reload() == []
+
+    _write_schema(tmp_path, "search_flights", _DATE_PATTERN_SCHEMA)
+    (tmp_path / "web_search.json").write_text("{not json", encoding="utf-8")
+
+    assert registry.reload() == ["search_flights"]
+    assert registry.list_tools() == ("search_flights",)
+    assert registry.validate("search_flights", {"date": "15/02/2026"})
+    assert registry.get_schema("search_flights", version=1) == _DATE_STRING_SCHEMA
+
+
+def test_max_versions_evicts_oldest_version(tmp_path: Path) -> None:
+    _write_schema(tmp_path, "search_flights", _DATE_STRING_SCHEMA)
+    registry = SchemaRegistry(schemas_dir=tmp_path, max_versions=2)
+
+    registry.register_schema("search_flights", _DATE_PATTERN_SCHEMA)
+    registry.register_schema("search_flights", {"type": "object"})
+
+    assert [item.version for item in registry.versions("search_flights")] == [2, 3]
+
+
+def test_watch_reloads_on_directory_change(tmp_path: Path) -> None:
+    _write_schema(tmp_path, "search_flights", _DATE_STRING_SCHEMA)
+    registry = SchemaRegistry(schemas_dir=tmp_path)
+    registry.watch(interval_s=0.01)
+    try:
+        _write_schema(tmp_path, "web_search", {"type": "object"})
+        deadline = time.monotonic() + 2.0
+        while "web_search" not in registry.list_tools() and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        registry.stop_watching()
+
+    assert registry.list_tools() == ("search_flights", "web_search")
+
+
+def test_validate_many_deduplicates_payloads_and_preserves_order(tmp_path: Path) -> None:
+    _write_schema(tmp_path, "search_flights", _DATE_PATTERN_SCHEMA)
+    registry = SchemaRegistry(schemas_dir=tmp_path)
+    calls = [
+        ("search_flights", {"date": "15/02/2026"}, None),
+        ("search_flights", {"date": "2026-02-15"}, None),
+        ("search_flights", {"date": "15/02/2026"}, None),
+        ("missing_tool", {}, None),
+    ]
+
+    results = registry.validate_many(calls)
+    parallel_results = registry.validate_many(calls, max_workers=2, chunk_size=1)
+
+    assert results == [registry.validate(tool, args) for tool, args, _ in calls]
+    assert parallel_results == results
+    assert results[0] is not results[2]
+
+
+def test_history_survives_restart_and_activation_follows_file_mtime(tmp_path: Path) -> None:
+    schemas_dir = tmp_path / "schemas"
+    schemas_dir.mkdir()
+    history_path = tmp_path / "schema_history.json"
+    _write_schema(schemas_dir, "search_flights", _DATE_STRING_SCHEMA)
+    os.utime(schemas_dir / "search_flights.json", (1_767_225_600, 1_767_225_600))  # 2026-01-01
+    SchemaRegistry(schemas_dir=schemas_dir, history_path=history_path)
+
+    _write_schema(schemas_dir, "search_flights", _DATE_PATTERN_SCHEMA)
+    os.utime(schemas_dir / "search_flights.json", (1_772_323_200, 1_772_323_200))  # 2026-03-01
+    restarted = SchemaRegistry(schemas_dir=schemas_dir, history_path=history_path)
+
+    assert [item.version for item in restarted.versions("search_flights")] == [1, 2]
+    assert restarted.validate("search_flights", {"date": "15/02/2026"}, as_of="2026-02-11") == []
+    assert restarted.validate("search_flights", {"date": "15/02/2026"}, as_of="2026-03-02")
+
+
+def test_register_schema_inserts_past_versions_in_activation_order(tmp_path: Path) -> None:
+    _write_schema(tmp_path, "search_flights", _DATE_STRING_SCHEMA)
+    os.utime(tmp_path / "search_flights.json", (1_772_323_200, 1_772_323_200))  # 2026-03-01
+    registry = SchemaRegistry(schemas_dir=tmp_path)
+
+    backfilled = registry.register_schema(
+        "search_flights", _DATE_PATTERN_SCHEMA, activated_at="2026-02-01T00:00:00Z"
+    )
+
+    assert backfilled.version == 2
+    assert [item.version for item in registry.versions("search_flights")] == [2, 1]
+    assert registry.resolve("search_flights", as_of="2026-02-11T00:00:00Z") == backfilled
+    assert registry.resolve("search_flights").version == 1
+
+
+def test_reload_drops_tools_whose_schema_file_was_deleted(tmp_path: Path) -> None:
+    _write_schema(tmp_path, "search_flights", _DATE_STRING_SCHEMA)
+    _write_schema(tmp_path, "web_search", {"type": "object"})
+    registry = SchemaRegistry(schemas_dir=tmp_path)
+    registry.register_schema("summarize_sources", {"type": "object"})
+
+    (tmp_path / "web_search.json").unlink()
+
+    assert registry.reload() == ["web_search"]
+    assert registry.list_tools() == ("search_flights", "summarize_sources")
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from src.storage import serialization
+from src.storage.serialization import EncodedDocument, canonical_dumps, dumps, loads
+from src.storage.trace_store import TraceStore
+
+
+def _document() -> dict[str, object]:
+    return {
+        "failure_id": "failure-1",
+        "subject": "bookíng",
+        "nested": {"b": [1, 2.5, None, True], "a": "x"},
+    }
+
+
+def test_dumps_matches_compact_stdlib_encoding() -> None:
+    document = _document()
+
+    expected = json.dumps(
+        document, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+
+    assert dumps(document, sort_keys=True) == expected
+    assert loads(dumps(document)) == document
+
+
+def test_stdlib_fallback_emits_identical_bytes(monkeypatch: pytest.MonkeyPatch) -> None:
+    document = _document()
+    fast = dumps(document, sort_keys=True)
+
+    monkeypatch.setattr(serialization, "orjson", None)
+
+    assert dumps(document, sort_keys=True) == fast
+    assert loads(fast) == document
+
+
+def test_canonical_dumps_does_not_depend_on_orjson(monkeypatch: pytest.MonkeyPatch) -> None:
+    document = {**_document(), "large": 1e16, "small": 1.5e-7}
+    fast = canonical_dumps(document)
+
+    monkeypatch.setattr(serialization, "orjson", None)
+
+    assert canonical_dumps(document) == fast
+    assert loads(fast) == document
+
+
+def test_encoded_document_serializes_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[object] = []
+    real_dumps = serialization.dumps
+
+    def counting_dumps(value: object, *, sort_keys: bool = False) -> bytes:
+        calls.append(value)
+        return real_dumps(value, sort_keys=sort_keys)
+
+    monkeypatch.setattr(serialization, "dumps", counting_dumps)
+    document = EncodedDocument(_document())
+
+    assert document.encoded is document.encoded
+    assert len(calls) == 1
+    assert document.decode() == _document()
+    assert document.decode() is not document.decode()
+
+
+def test_memory_backend_reads_do_not_alias_stored_documents() -> None:
+    store = TraceStore(backend="memory")
+    trace_record = {"failure_id": "failure-1", "steps": [{"name": "a"}]}
+    store.store_trace({"failure_id": "failure-1", "subject": "booking"}, trace_record)
+
+    trace_record["steps"].append({"name": "mutated"})
+    first = store.get_trace("failure-1")
+    first["trace_record"]["steps"].clear()
+
+    assert store.get_trace("failure-1")["trace_record"]["steps"] == [{"name": "a"}]
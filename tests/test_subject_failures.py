@@ -1,6 +1,7 @@
 import pytest
 
 from src.subjects.booking_agent import run_booking_scenario
+from src.subjects.registry import SUBJECT_NAMES, subject_runner, subject_runners
 from src.subjects.search_agent import run_search_scenario
 from src.subjects.summary_agent import run_summary_scenario
 from src.tools.registry import ToolValidationError
@@ -22,3 +23,10 @@ def test_summary_scenario_contains_known_false_claim() -> None:
     assert result["status"] == "hallucinated"
     assert result["hallucinated"] is True
     assert "every flight from NYC to LAX is free in 2026" in result["false_claim"]
+
+
+def test_subject_registry_resolves_runners_by_name() -> None:
+    assert tuple(name for name, _ in subject_runners()) == SUBJECT_NAMES
+    assert subject_runner("search") is run_search_scenario
+    with pytest.raises(ValueError):
+        subject_runner("unknown")
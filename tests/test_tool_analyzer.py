@@ -36,3 +36,15 @@ def test_tool_analyzer_uses_intended_tool_metadata_when_present() -> None:
     assert finding.actual is not None
     assert finding.actual["wrong_tool_selection"] is True
     assert "Expected first tool 'web_search'" in finding.actual["wrong_tool_reason"]
+
+
+def test_tool_analyzer_analyze_many_matches_per_trace_analysis() -> None:
+    analyzer = ToolAnalyzer()
+    traces = [_load_trace_fixture() for _ in range(3)]
+    traces[1]["metadata"] = {"intended_tool": "web_search"}
+
+    findings = analyzer.analyze_many(traces)
+
+    assert findings == [analyzer.analyze(trace) for trace in traces]
+    assert findings[1].actual is not None
+    assert "Expected first tool 'web_search'" in findings[1].actual["wrong_tool_reason"]
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import time
+
 import pytest
 
 from src.models.failure import FailureEvent
 from src.models.trace_record import TraceRecord, TraceStep
+from src.storage.retention import RetentionPolicy
 from src.storage.trace_store import TraceStore
 
 
@@ -48,6 +51,33 @@ def test_trace_store_memory_roundtrip() -> None:
     assert recovered["trace_record"]["steps"][0]["kind"] == "validation_error"
 
 
+def test_trace_store_memory_returns_stored_findings_cache() -> None:
+    store = TraceStore(backend="memory")
+    failure_event, trace_record = _sample_payload()
+    store.store_trace(failure_event, trace_record)
+
+    assert "findings_cache" not in store.get_trace("failure-123")
+
+    store.store_findings("failure-123", "key-1", {"findings": {}})
+    recovered = store.get_trace("failure-123")
+
+    assert recovered["findings_cache"] == {"key": "key-1", "findings": {"findings": {}}}
+
+    with pytest.raises(KeyError):
+        store.store_findings("missing", "key-1", {"findings": {}})
+
+
+def test_trace_store_memory_get_traces_omits_missing_ids() -> None:
+    store = TraceStore(backend="memory")
+    for failure_id in ("failure-1", "failure-2"):
+        store.store_trace(*_sample_payload(failure_id))
+
+    recovered = store.get_traces(["failure-2", "missing", "failure-1"])
+
+    assert set(recovered) == {"failure-1", "failure-2"}
+    assert recovered["failure-2"]["trace_record"]["failure_id"] == "failure-2"
+
+
 def test_trace_store_memory_missing_failure_raises_key_error() -> None:
     store = TraceStore(backend="memory")
 
@@ -62,3 +92,167 @@ def test_trace_store_auto_uses_memory_without_cosmos_env(monkeypatch: pytest.Mon
     store = TraceStore()
 
     assert store.backend_name == "memory"
+
+
+def _store_query_corpus(store: TraceStore, count: int) -> list[dict[str, str]]:
+    rows: list[dict[str, str]] = []
+    for index in range(count):
+        failure_id = f"failure-{index:03d}"
+        failure_event, trace_record = _sample_payload(failure_id)
+        subject = ("booking", "search", "summary")[index % 3]
+        failure_type = ("timeout", "validation_error")[index % 2]
+        # Stored out of order, with mixed timestamp precision and offsets.
+        minute = (index * 7) % count
+        timestamp = (
+            f"2026-02-11T01:{minute:02d}:00+01:00"
+            if index % 4
+            else (f"2026-02-11T00:{minute:02d}:00.5Z")
+        )
+        failure_event = failure_event.model_copy(
+            update={"subject": subject, "failure_type": failure_type, "timestamp": timestamp}
+        )
+        trace_record["subject"] = subject
+        store.store_trace(failure_event, trace_record)
+        rows.append(
+            {
+                "failure_id": failure_id,
+                "subject": subject,
+                "failure_type": failure_type,
+                "minute": f"{minute:02d}",
+            }
+        )
+    return rows
+
+
+def test_trace_store_memory_list_traces_filters_and_paginates() -> None:
+    store = TraceStore(backend="memory")
+    rows = _store_query_corpus(store, 60)
+
+    collected: list[str] = []
+    continuation = None
+    while True:
+        page = store.list_traces(
+            subject="booking",
+            failure_type="timeout",
+            since="2026-02-11T00:10:00Z",
+            until="2026-02-11T00:50:00Z",
+            limit=3,
+            continuation=continuation,
+        )
+        assert len(page.items) <= 3
+        collected.extend(item["failure_event"]["failure_id"] for item in page.items)
+        if page.continuation is None:
+            break
+        continuation = page.continuation
+
+    expected = sorted(
+        (row for row in rows if row["subject"] == "booking" and row["failure_type"] == "timeout"),
+        key=lambda row: (row["minute"], row["failure_id"]),
+    )
+    expected_ids = [row["failure_id"] for row in expected if "10" <= row["minute"] < "50"]
+    assert collected == expected_ids
+    assert [
+        trace["failure_event"]["failure_id"]
+        for trace in store.iter_traces(subject="booking", failure_type="timeout", page_size=2)
+    ] == [row["failure_id"] for row in expected]
+    assert len(list(store.iter_traces(page_size=7))) == 60
+
+    rare_event, rare_record = _sample_payload("failure-rare")
+    store.store_trace(rare_event.model_copy(update={"subject": "checkout"}), rare_record)
+    (rare,) = store.list_traces(subject="checkout", until="2026-02-11T00:00:01Z").items
+    assert rare["failure_event"]["failure_id"] == "failure-rare"
+
+
+def test_trace_store_memory_list_traces_reindexes_replaced_traces() -> None:
+    store = TraceStore(backend="memory")
+    failure_event, trace_record = _sample_payload()
+    store.store_trace(failure_event, trace_record)
+    store.store_trace(failure_event.model_copy(update={"subject": "search"}), trace_record)
+
+    assert store.list_traces(subject="booking").items == []
+    (item,) = store.list_traces(subject="search", status="failed").items
+    assert item["failure_event"]["subject"] == "search"
+    assert store.list_traces(since="2026-02-11T00:00:01Z").items == []
+
+    with pytest.raises(ValueError):
+        store.list_traces(limit=0)
+
+
+def test_trace_store_memory_time_ranges_skip_traces_without_a_timestamp() -> None:
+    store = TraceStore(backend="memory")
+    failure_event, trace_record = _sample_payload("failure-dated")
+    store.store_trace(failure_event, trace_record)
+    undated_event = failure_event.model_dump(mode="json", exclude={"timestamp"})
+    undated_event["failure_id"] = "failure-undated"
+    undated_record = {
+        key: value for key, value in trace_record.items() if key not in ("started_at", "ended_at")
+    }
+    undated_record["failure_id"] = "failure-undated"
+    store.store_trace(undated_event, undated_record)
+
+    def listed(**filters: str) -> list[str]:
+        return [item["failure_event"]["failure_id"] for item in store.list_traces(**filters).items]
+
+    assert listed() == ["failure-undated", "failure-dated"]
+    assert listed(until="2100-01-01T00:00:00Z") == ["failure-dated"]
+    assert listed(since="2000-01-01T00:00:00Z") == ["failure-dated"]
+
+
+def _store_with_status(store: TraceStore, failure_id: str, status: str, timestamp: str) -> None:
+    failure_event, trace_record = _sample_payload(failure_id)
+    trace_record["status"] = status
+    trace_record["steps"][0]["output"] = {"tool_calls": [{"tool": "search_flights"}] * 50}
+    store.store_trace(failure_event.model_copy(update={"timestamp": timestamp}), trace_record)
+
+
+def test_trace_store_memory_retention_expires_caps_and_compacts() -> None:
+    retention = RetentionPolicy(
+        ttl_s_by_status={"passed": 60},
+        default_ttl_s=3600,
+        max_passed_runs=2,
+        compact_after_s=600,
+        sweep_interval_s=None,
+    )
+    store = TraceStore(backend="memory", retention=retention)
+    for index in range(3):
+        _store_with_status(store, f"passed-{index}", "passed", f"2026-02-11T00:0{index}:00Z")
+    _store_with_status(store, "failed-1", "failed", "2026-02-11T00:00:00Z")
+    store.store_findings("failed-1", "key-1", {"findings": {}})
+    # Never analyzed, so it has no findings to keep and is not compacted.
+    _store_with_status(store, "failed-2", "failed", "2026-02-11T00:00:00Z")
+    started = time.time()
+
+    report = store.apply_retention(now=started + 1)
+    assert (report.expired, report.capped, report.compacted) == (0, 1, 0)
+    assert [
+        trace["failure_event"]["failure_id"] for trace in store.iter_traces(status="passed")
+    ] == ["passed-1", "passed-2"]
+
+    report = store.apply_retention(now=started + 700)
+    assert (report.expired, report.capped, report.compacted) == (2, 0, 1)
+    compacted = store.get_trace("failed-1")
+    assert compacted["compacted"] is True
+    assert compacted["trace_record"]["steps"][0]["output"] is None
+    assert compacted["trace_record"]["steps"][0]["error"] == "date must match format"
+    assert compacted["failure_event"]["failure_id"] == "failed-1"
+    assert compacted["findings_cache"]["key"] == "key-1"
+    unanalyzed = store.get_trace("failed-2")
+    assert "compacted" not in unanalyzed
+    assert unanalyzed["trace_record"]["steps"][0]["output"] is not None
+
+    assert store.apply_retention(now=started + 3601).expired == 2
+    assert store.list_traces().items == []
+
+
+def test_trace_store_memory_retention_sweeps_in_the_background() -> None:
+    retention = RetentionPolicy(max_passed_runs=0, sweep_interval_s=0.01)
+    store = TraceStore(backend="memory", retention=retention)
+    try:
+        _store_with_status(store, "passed-1", "passed", "2026-02-11T00:00:00Z")
+        deadline = time.monotonic() + 5.0
+        while store.get_traces(["passed-1"]) and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert store.get_traces(["passed-1"]) == {}
+    finally:
+        store.close()
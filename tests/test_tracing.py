@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from opentelemetry.sdk.trace.export import SpanExportResult
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace.status import Status, StatusCode
+
+from src.core import tracing
+from src.core.tracing import (
+    FileSpanExporter,
+    SwitchableSpanExporter,
+    TracingOptions,
+    build_tracer_provider,
+    discover_connection_string,
+    join_spans_to_traces,
+    load_spans,
+)
+
+
+def _finished_span_names(options: TracingOptions) -> list[str]:
+    exporter = InMemorySpanExporter()
+    provider = build_tracer_provider(options, exporter)
+    tracer = provider.get_tracer(__name__)
+
+    with tracer.start_as_current_span("run_subject:passed") as span:
+        span.set_attribute("faultatlas.status", "passed")
+        with tracer.start_as_current_span("child"):
+            pass
+    with tracer.start_as_current_span("run_subject:hallucinated") as span:
+        span.set_attribute("faultatlas.status", "hallucinated")
+    with tracer.start_as_current_span("run_subject:failed"):
+        with tracer.start_as_current_span("failing_child") as child:
+            child.set_status(Status(StatusCode.ERROR, "boom"))
+
+    provider.force_flush()
+    return sorted(span.name for span in exporter.get_finished_spans())
+
+
+def test_tail_sampling_keeps_failed_runs_and_drops_passed_runs() -> None:
+    names = _finished_span_names(
+        TracingOptions(span_processor="simple", sampling="tail", sample_ratio=0.0)
+    )
+
+    assert names == ["failing_child", "run_subject:failed", "run_subject:hallucinated"]
+
+
+def test_tail_sampling_with_full_ratio_keeps_everything() -> None:
+    names = _finished_span_names(TracingOptions(sampling="tail", sample_ratio=1.0))
+
+    assert len(names) == 5
+
+
+def test_head_sampling_with_zero_ratio_records_nothing() -> None:
+    names = _finished_span_names(
+        TracingOptions(span_processor="simple", sampling="head", sample_ratio=0.0)
+    )
+
+    assert names == []
+
+
+def test_file_span_exporter_rotates_segments_and_joins_spans(tmp_path: Path) -> None:
+    exporter = FileSpanExporter(tmp_path, max_segment_bytes=1, max_segments=2, buffer_spans=1)
+    provider = build_tracer_provider(TracingOptions(span_processor="simple"), exporter)
+    tracer = provider.get_tracer(__name__)
+
+    trace_ids: list[str] = []
+    for index in range(3):
+        with tracer.start_as_current_span(f"run_subject:{index}") as span:
+            span.set_attribute("faultatlas.failure_id", f"failure-{index}")
+            trace_ids.append(f"{span.get_span_context().trace_id:032x}")
+    provider.shutdown()
+
+    assert len(list(tmp_path.glob("spans-*.ndjson.gz"))) == 2
+    assert [span["name"] for span in load_spans(tmp_path)] == ["run_subject:1", "run_subject:2"]
+
+    joined = join_spans_to_traces(
+        [
+            {"failure_event": {"trace_id": trace_ids[2]}, "trace_record": {}},
+            {"failure_event": {"trace_id": None}, "trace_record": {}},
+        ],
+        tmp_path,
+    )
+
+    assert [span["attributes"]["faultatlas.failure_id"] for span in joined[0]["spans"]] == [
+        "failure-2"
+    ]
+    assert joined[1]["spans"] == []
+
+
+def test_file_span_exporter_drops_the_buffer_when_a_write_fails(tmp_path: Path) -> None:
+    recorded = InMemorySpanExporter()
+    tracer = build_tracer_provider(TracingOptions(span_processor="simple"), recorded).get_tracer(
+        __name__
+    )
+    for name in ("lost:0", "lost:1", "kept"):
+        with tracer.start_as_current_span(name):
+            pass
+    lost_0, lost_1, kept = recorded.get_finished_spans()
+    directory = tmp_path / "spans"
+    exporter = FileSpanExporter(directory, buffer_spans=2)
+    directory.rmdir()
+    directory.write_text("not a directory", encoding="utf-8")
+
+    assert exporter.export([lost_0]) is SpanExportResult.SUCCESS
+    assert exporter.export([lost_1]) is SpanExportResult.FAILURE
+    assert exporter._buffer == []
+
+    directory.unlink()
+    directory.mkdir()
+    assert exporter.export([kept]) is SpanExportResult.SUCCESS
+    assert exporter.force_flush() is True
+    assert [span["name"] for span in load_spans(directory)] == ["kept"]
+
+
+def test_discovery_is_cached_on_disk_including_negative_results(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delenv("APPLICATIONINSIGHTS_CONNECTION_STRING", raising=False)
+    monkeypatch.setenv("FOUNDRY_PROJECT_ENDPOINT", "https://example.test/project")
+    calls: list[int] = []
+
+    def fake_foundry() -> str | None:
+        calls.append(1)
+        return "InstrumentationKey=abc" if len(calls) == 1 else None
+
+    monkeypatch.setattr(tracing, "_connection_string_from_foundry", fake_foundry)
+    options = TracingOptions(discovery_cache_path=str(tmp_path / "discovery.json"))
+
+    assert discover_connection_string(options) == "InstrumentationKey=abc"
+    assert discover_connection_string(options) == "InstrumentationKey=abc"
+    assert len(calls) == 1
+    assert (tmp_path / "discovery.json").stat().st_mode & 0o777 == 0o600
+    assert [path.name for path in tmp_path.iterdir()] == ["discovery.json"]
+
+    expired = TracingOptions(
+        discovery_cache_path=str(tmp_path / "discovery.json"), discovery_cache_ttl_s=-1
+    )
+    assert discover_connection_string(expired) is None
+    assert discover_connection_string(options) is None
+    assert len(calls) == 2
+
+
+def test_discovery_gives_up_at_the_deadline(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delenv("APPLICATIONINSIGHTS_CONNECTION_STRING", raising=False)
+    release = threading.Event()
+
+    def slow_foundry() -> str | None:
+        release.wait(5)
+        return "InstrumentationKey=late"
+
+    monkeypatch.setattr(tracing, "_connection_string_from_foundry", slow_foundry)
+    cache_path = tmp_path / "discovery.json"
+    options = TracingOptions(discovery_timeout_s=0.05, discovery_cache_path=str(cache_path))
+
+    try:
+        assert discover_connection_string(options) is None
+        assert not cache_path.exists()
+    finally:
+        release.set()
+
+
+def test_switchable_exporter_routes_spans_to_the_new_delegate() -> None:
+    first, second = InMemorySpanExporter(), InMemorySpanExporter()
+    switchable = SwitchableSpanExporter(first)
+    provider = build_tracer_provider(TracingOptions(span_processor="simple"), switchable)
+    tracer = provider.get_tracer(__name__)
+
+    with tracer.start_as_current_span("before"):
+        pass
+    switchable.switch(second)
+    with tracer.start_as_current_span("after"):
+        pass
+
+    assert [span.name for span in first.get_finished_spans()] == ["before"]
+    assert [span.name for span in second.get_finished_spans()] == ["after"]